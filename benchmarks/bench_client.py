@@ -0,0 +1,72 @@
+"""
+Measures APIClient throughput and latency against the local `FakeStonfi`
+stand-in served over HTTP on localhost.
+
+    python benchmarks/bench_client.py [--requests N] [--concurrency N] [--latency S] [--error-rate P]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from stonfi import APIClient, RateLimiter
+from stonfi.offline import FakeStonfi
+
+
+async def run(args: argparse.Namespace) -> None:
+    api = FakeStonfi(pools=args.pools, latency=args.latency, error_rate=args.error_rate)
+    server = await api.serve(port=0)
+    port = server.sockets[0].getsockname()[1]
+    limiter = RateLimiter(limits={"default": (1e9, 10 ** 9)}, backoff_base=0.01)
+    addresses = [pool["address"] for pool in api.pools]
+    latencies = []
+
+    async with APIClient(base_url=f"http://127.0.0.1:{port}", rate_limiter=limiter, metrics=True) as client:
+        queue = iter(range(args.requests))
+
+        async def worker() -> None:
+            for i in queue:
+                start = time.perf_counter()
+                await client.get_pool(addresses[i % len(addresses)])
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+        list_start = time.perf_counter()
+        await client.get_pools()
+        list_elapsed = time.perf_counter() - list_start
+        snapshot = client.metrics.snapshot()
+
+    server.close()
+    await server.wait_closed()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"get_pool   {args.requests} requests, concurrency {args.concurrency}: {args.requests / elapsed:8.0f} req/s")
+    print(f"           p50 {quantiles[49] * 1e3:7.2f} ms  p90 {quantiles[89] * 1e3:7.2f} ms  p99 {quantiles[98] * 1e3:7.2f} ms")
+    print(f"get_pools  {len(addresses)} pools: {list_elapsed * 1e3:8.1f} ms")
+    print(f"server     {api.requests} requests handled, throttled {limiter.throttled}")
+    for endpoint, metrics in snapshot.items():
+        latency = metrics["latency"]
+        print(
+            f"{endpoint:<10} network {latency['sum'] * 1e3:8.1f} ms  parse {metrics['parse_time'] * 1e3:8.1f} ms"
+            f"  decode {metrics['decode_time'] * 1e3:8.1f} ms  {metrics['bytes'] / 1e6:7.2f} MB  p95 <= {latency['p95'] * 1e3:g} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--pools", type=int, default=18_000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compares the generated decoders of `stonfi.types.decoder` with the
+dataclasses_json `from_dict` path on synthetic API payloads.
+
+    python benchmarks/bench_decode.py [--pools N] [--operations N] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from stonfi.types import Farm, Operation, Pool, SwapStatus, decoder
+
+
+def make_pool(i: int) -> dict:
+    return {
+        "address": f"EQpool{i:06d}",
+        "apy_1d": "0.0123",
+        "apy_30d": "0.0456",
+        "apy_7d": None,
+        "collected_token0_protocol_fee": str(1000 + i),
+        "collected_token1_protocol_fee": str(2000 + i),
+        "deprecated": False,
+        "lp_fee": "20",
+        "lp_total_supply": str(10 ** 12 + i),
+        "lp_total_supply_usd": "1234.5",
+        "protocol_fee": "10",
+        "protocol_fee_address": "EQfee",
+        "ref_fee": "10",
+        "reserve0": str(10 ** 15 + i),
+        "reserve1": str(3 * 10 ** 12 + i),
+        "router_address": "EQrouter",
+        "token0_address": f"EQtoken{i % 500:04d}",
+        "token1_address": "EQton",
+    }
+
+
+def make_asset(i: int) -> dict:
+    return {
+        "blacklisted": False,
+        "community": i % 3 == 0,
+        "contract_address": f"EQtoken{i:04d}",
+        "default_symbol": True,
+        "deprecated": False,
+        "dex_price_usd": "0.51",
+        "display_name": f"Token {i}",
+        "kind": "Jetton",
+        "symbol": f"T{i}",
+        "tags": ["default_symbol"],
+        "taxable": False,
+        "decimals": 9,
+        "priority": i,
+    }
+
+
+def make_operation(i: int) -> dict:
+    stat = {
+        "asset0_address": "EQtoken0001", "asset0_amount": "100", "asset0_delta": "-100", "asset0_reserve": "10000",
+        "asset1_address": "EQton", "asset1_amount": "50", "asset1_delta": "50", "asset1_reserve": "5000",
+        "destination_wallet_address": "EQdest", "exit_code": "swap_ok", "fee_asset_address": None,
+        "lp_fee_amount": "1", "lp_token_delta": "0", "lp_token_supply": "7000", "operation_type": "swap",
+        "pool_address": "EQpool000001", "pool_tx_hash": f"hash{i}", "pool_tx_lt": 40_000_000 + i,
+        "pool_tx_timestamp": "2024-05-01T12:00:00", "protocol_fee_amount": "1", "referral_address": None,
+        "referral_fee_amount": "0", "router_address": "EQrouter", "success": True, "wallet_address": "EQwallet",
+        "wallet_tx_hash": f"wallet{i}", "wallet_tx_lt": 40_000_001 + i, "wallet_tx_timestamp": "2024-05-01T12:00:00",
+    }
+    return {"asset0_info": make_asset(1), "asset1_info": make_asset(2), "operation": stat}
+
+
+def make_farm(i: int) -> dict:
+    reward = {"address": "EQreward", "amount": "10"}
+    nft = {
+        "address": f"EQnft{i}", "create_timestamp": "1", "min_unstake_timestamp": "2", "nonclaimed_rewards": "3",
+        "rewards": [reward, reward], "staked_tokens": "4", "status": "active",
+    }
+    minter = {"address": "EQminter", "remaining_rewards": "5", "reward_rate_24h": "6", "status": "active"}
+    return {
+        "locked_total_lp": "100", "min_stake_duration_s": "0", "minter_address": "EQminter", "nft_infos": [nft],
+        "pool_address": f"EQpool{i:06d}", "reward_token_address": "EQreward", "rewards": [minter], "status": "active",
+        "apy": "0.1",
+    }
+
+
+def bench(name: str, cls: type, payloads: list[dict], repeat: int) -> None:
+    fast = decoder(cls)
+    assert [fast(p) for p in payloads] == [cls.from_dict(p) for p in payloads], f"{name}: decoders disagree"
+    slow_time = min(timeit.repeat(lambda: [cls.from_dict(p) for p in payloads], number=1, repeat=repeat))
+    fast_time = min(timeit.repeat(lambda: [fast(p) for p in payloads], number=1, repeat=repeat))
+    print(
+        f"{name:<12} {len(payloads):>7} objects  from_dict {slow_time * 1e3:9.1f} ms"
+        f"  generated {fast_time * 1e3:8.1f} ms  x{slow_time / fast_time:5.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pools", type=int, default=18_000)
+    parser.add_argument("--operations", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bench("Pool", Pool, [make_pool(i) for i in range(args.pools)], args.repeat)
+    bench("Operation", Operation, [make_operation(i) for i in range(args.operations)], args.repeat)
+    bench("Farm", Farm, [make_farm(i) for i in range(args.operations)], args.repeat)
+    bench("SwapStatus", SwapStatus, [{"@type": "Found", "exit_code": "0"}] * args.operations, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Reports the memory taken per instance by the slotted `stonfi.types`
+dataclasses compared with equivalent dict-backed dataclasses.
+
+    python benchmarks/bench_memory.py [--count N]
+"""
+import argparse
+import dataclasses
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_decode import make_asset, make_operation, make_pool
+from stonfi.types import Asset, OperationStat, Pool, PoolStats, decoder
+
+
+def make_pool_stats(i: int) -> dict:
+    return {
+        "apy": "0.1", "base_id": f"EQtoken{i}", "base_liquidity": "100", "base_name": "Token", "base_symbol": "T",
+        "base_volume": "10", "last_price": "0.5", "lp_price": None, "lp_price_usd": "1.2",
+        "pool_address": f"EQpool{i:06d}", "quote_id": "EQton", "quote_liquidity": "50", "quote_name": "Toncoin",
+        "quote_symbol": "TON", "quote_volume": "5", "router_address": "EQrouter", "url": "https://app.ston.fi",
+    }
+
+
+def dict_backed(cls: type) -> type:
+    """
+    Rebuilds `cls` as a frozen dataclass without `__slots__`.
+    """
+    fields = []
+    for field in dataclasses.fields(cls):
+        if field.default is dataclasses.MISSING:
+            fields.append((field.name, field.type))
+        else:
+            fields.append((field.name, field.type, dataclasses.field(default=field.default)))
+    return dataclasses.make_dataclass(cls.__name__, fields, frozen=True, kw_only=True)
+
+
+def bytes_per_instance(cls: type, kwargs: list[dict]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls(**values) for values in kwargs]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(instances)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=18_000)
+    args = parser.parse_args()
+
+    payloads = {
+        Pool: [make_pool(i) for i in range(args.count)],
+        Asset: [make_asset(i) for i in range(args.count)],
+        OperationStat: [make_operation(i)["operation"] for i in range(args.count)],
+        PoolStats: [make_pool_stats(i) for i in range(args.count)],
+    }
+    print(f"{'class':<14} {'dict-backed':>12} {'slotted':>10} {'saved':>8}")
+    for cls, objects in payloads.items():
+        # Decode once so both variants share the same field values and only the
+        # per-instance overhead is measured.
+        kwargs = [dataclasses.asdict(decoder(cls)(payload)) for payload in objects]
+        before = bytes_per_instance(dict_backed(cls), kwargs)
+        after = bytes_per_instance(cls, kwargs)
+        print(f"{cls.__name__:<14} {before:>10.0f} B {after:>8.0f} B {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
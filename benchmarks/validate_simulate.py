@@ -0,0 +1,124 @@
+"""
+Validates the local swap simulator against recorded `swap_simulate` and
+`reverse_swap_simulate` responses and measures its throughput.
+
+Record a pool snapshot and quotes for random pools and trade sizes (against
+the live API, or with --fake the local stand-in, which quotes with its own
+implementation of the router math), then compare:
+
+    python benchmarks/validate_simulate.py --record recordings/simulate [--quotes N] [--fake]
+    python benchmarks/validate_simulate.py recordings/simulate
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from stonfi import APIClient, simulate_reverse_swap, simulate_swap
+from stonfi.offline import FakeStonfi, RecordingTransport
+from stonfi.types import Pool, SwapResponse, SwapSimulateData, decoder
+
+FIELDS = ("offer_units", "ask_units", "min_ask_units", "fee_units")
+
+
+async def record(directory: Path, quotes: int, fake: bool, seed: int) -> None:
+    if fake:
+        transport = RecordingTransport(directory, FakeStonfi(pools=500, assets=100, seed=seed).transport())
+        base_url = "http://fake"
+    else:
+        transport = RecordingTransport(directory)
+        base_url = "https://api.ston.fi"
+    rng = random.Random(seed)
+    async with APIClient(transport=transport, base_url=base_url, conditional=False) as client:
+        pools = [pool for pool in await client.get_pools() if not pool.deprecated and pool.reserve0_units and pool.reserve1_units]
+        for pool in rng.sample(pools, min(quotes, len(pools))):
+            offer, ask = pool.token0_address, pool.token1_address
+            if rng.random() < 0.5:
+                offer, ask = ask, offer
+            reserves = (pool.reserve0_units, pool.reserve1_units)
+            if offer != pool.token0_address:
+                reserves = reserves[::-1]
+            for reserve, simulate in zip(reserves, (client.swap_simulate, client.reverse_swap_simulate)):
+                units = str(max(1, int(reserve * 10 ** rng.uniform(-5, -1))))
+                try:
+                    await simulate(SwapSimulateData(offer_address=offer, ask_address=ask, units=units, slippage_tolerance="0.01"))
+                except httpx.HTTPStatusError:
+                    # The API may route the pair through another, shallower pool.
+                    pass
+    print(f"recorded {min(quotes, len(pools))} pools into {directory}")
+
+
+def validate(directory: Path) -> None:
+    decode_pool = decoder(Pool)
+    decode_response = decoder(SwapResponse)
+    decode_data = decoder(SwapSimulateData)
+    pools: dict[str, Pool] = {}
+    cases = []
+    for path in directory.glob("*.json"):
+        record = json.loads(path.read_text(encoding="utf-8"))
+        if record["status"] != 200 or "text" not in record:
+            continue
+        url = urlsplit(record["target"])
+        if url.path == "/v1/pools":
+            pools.update((pool["address"], decode_pool(pool)) for pool in json.loads(record["text"])["pool_list"])
+        elif url.path in ("/v1/swap/simulate", "/v1/reverse_swap/simulate"):
+            data = decode_data(dict(parse_qsl(url.query)))
+            cases.append((url.path.startswith("/v1/reverse"), data, decode_response(json.loads(record["text"]))))
+
+    exact = {field: 0 for field in FIELDS}
+    worst = {field: 0.0 for field in FIELDS}
+    impact_error = 0.0
+    checked = []
+    for reverse, data, expected in cases:
+        pool = pools.get(expected.pool_address)
+        if pool is None:
+            continue
+        simulate = simulate_reverse_swap if reverse else simulate_swap
+        actual = simulate(pool, data)
+        checked.append((simulate, pool, data))
+        for field in FIELDS:
+            want, got = int(getattr(expected, field)), int(getattr(actual, field))
+            exact[field] += want == got
+            worst[field] = max(worst[field], abs(got - want) / max(abs(want), 1))
+        impact_error = max(impact_error, abs(float(actual.price_impact) - float(expected.price_impact)))
+
+    print(f"{len(checked)} of {len(cases)} recorded quotes have their pool in the snapshot")
+    if not checked:
+        return
+    for field in FIELDS:
+        print(f"{field:<14} exact {exact[field] / len(checked):7.2%}  max relative error {worst[field]:.2e}")
+    print(f"price_impact   max absolute error {impact_error:.2e}")
+
+    rounds = max(1, 100_000 // len(checked))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for simulate, pool, data in checked:
+            simulate(pool, data)
+    elapsed = time.perf_counter() - start
+    print(f"local quotes   {rounds * len(checked) / elapsed:,.0f} per second")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--record", action="store_true", help="record a snapshot and quotes before validating")
+    parser.add_argument("--fake", action="store_true", help="record against the local stand-in instead of the live API")
+    parser.add_argument("--quotes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.record:
+        asyncio.run(record(args.directory, args.quotes, args.fake, args.seed))
+    validate(args.directory)
+
+
+if __name__ == "__main__":
+    main()
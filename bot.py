@@ -1,47 +1,26 @@
 from pyrogram import Client, filters
 from pyromod import listen
-from stonfi import APIClient
+from stonfi import APIClient, ResponseCache
 import asyncio
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, func, ForeignKey, Float, Boolean
-from sqlalchemy.orm import relationship
-from sqlalchemy.orm import sessionmaker, declarative_base
-from datetime import datetime
-from os import path
+from datetime import datetime, timedelta
+from math import isqrt
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
 
 
-from stonfi.types import Pool
+from db import add_watchlist_entry, count_pools, get_watchlist, migrate, run_db
 
 
 from config import *
 
-stonfi_client = APIClient()
+stonfi_client = APIClient.shared(
+    # Stale pools are served for at most a few TTLs, while a refresh runs or the API is failing.
+    cache=ResponseCache(ttl={"pool": 30.0, "pools": 60.0}, stale_ttl=120.0),
+    rate_limiter=True,
+    circuit_breaker=True,
+)
 app = Client(name='nikitos',api_hash=api_hash, api_id=api_id, bot_token=bot_token)
 
-engine = create_engine('sqlite:///pools.db')
-Session = sessionmaker(bind=engine)
 
-Base = declarative_base()
-
-class Pool(Base):
-    __tablename__ = 'pools'
-    id = Column(Integer, primary_key=True)
-    name = Column(String)
-    address = Column(String)
-    token_lqd = Column(String)
-    token_base = Column(String)
-        
-    
-class Watchlist(Base):
-    __tablename__ = 'watchlists'
-    id = Column(Integer, primary_key=True)
-    user_id = Column(Integer)
-    name_pool = Column(String)
-
-    pool = relationship("Pool")
-
-
-    
 class Pager:
     def __init__(self, total_items, page_size):
         self.total_items = total_items
@@ -63,8 +42,7 @@ class Pager:
         self.current_page = max(0, self.current_page - 1)
 
 
-if not path.exists('pools.db'):
-    Base.metadata.create_all(engine)
+migrate()
 
 @app.on_message(filters.command("start"))
 async def start(client, message):
@@ -78,28 +56,38 @@ async def about(client, message):
     
 @app.on_message(filters.command("get_quantity_pools"))
 async def quantity(client, message):
-    engine = create_engine('sqlite:///pools.db')
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    result = session.query(func.count(Pool.id)).scalar()
-    session.close()
+    result = await run_db(count_pools)
     await message.reply(f"Количество пулов в базе данных: {result}")
 
 
 
 @app.on_message(filters.command("get_info_by_pool"))
 async def get_info_by_pool(client, message):
-    s_client = APIClient()
     response = await client.ask(message.chat.id, 'Введите адрес пула')
     pool_addr = response.text
 
-    pool = await s_client.get_pool(pool_addr)
+    pool = await stonfi_client.get_pool(pool_addr)
+    info = stonfi_client.response_info
+    fetched_at = datetime.now() - timedelta(seconds=info.age) if info is not None and info.stale else datetime.now()
 
     name_asset = pool.token0_address
     main_asset = pool.token1_address
 
-    asset_from_pool = await s_client.get_asset(name_asset)
-    main_asset_from_pool = await s_client.get_asset(main_asset)
+    assets = await stonfi_client.get_assets_many([name_asset, main_asset])
+    asset_from_pool = assets.get(name_asset)
+    main_asset_from_pool = assets.get(main_asset)
+    if asset_from_pool is None or main_asset_from_pool is None:
+        missing = name_asset if asset_from_pool is None else main_asset
+        await message.reply(f"Token not found: {missing}")
+        return
+
+    price = main_asset_from_pool.to_human(pool.reserve1_units) / asset_from_pool.to_human(pool.reserve0_units) if pool.reserve0_units else 'n/a'
+    reserve0_usd = asset_from_pool.usd_value(pool.reserve0_units)
+    reserve1_usd = main_asset_from_pool.usd_value(pool.reserve1_units)
+    fee0_usd = asset_from_pool.usd_value(pool.collected_token0_protocol_fee_units)
+    fee1_usd = main_asset_from_pool.usd_value(pool.collected_token1_protocol_fee_units)
+    tvl = reserve0_usd + reserve1_usd if reserve0_usd is not None and reserve1_usd is not None else 'n/a'
+    fees = fee0_usd + fee1_usd if fee0_usd is not None and fee1_usd is not None else 'n/a'
 
     info_pool = await client.send_message(
     message.chat.id,
@@ -114,12 +102,10 @@ async def get_info_by_pool(client, message):
     f'Sub-contract for fees: **{main_asset_from_pool.display_name}**\n'
     f'Collected Token 0 Protocol Fee: **{pool.collected_token0_protocol_fee}**\n'
     f'Collected Token 1 Protocol Fee: **{pool.collected_token1_protocol_fee}**\n'
-    f'Estimated Price: **{int(pool.reserve1) / int(pool.reserve0)}$ at {datetime.datetime.now()}**\n'
-    f'TVL: **{pool.reserve0 * asset_from_pool.price + pool.reserve1 * main_asset_from_pool.price}$**\n'
-    f'Total Fees Earned: **{pool.collected_token0_protocol_fee + pool.collected_token1_protocol_fee}**\n'
-    f'Percentage of TVL: {(pool_liquidity / dex_liquidity) * 100}\n'
-    f'CPMM: {(actual_price - expected_price) / expected_price * 100}\n'
-    f'LPs Holding: {2 * sqrt(pool.reserve0 * pool.reserve1) - pool.reserve0 - pool.reserve1}'
+    f'Estimated Price: **{price} at {fetched_at}**\n'
+    f'TVL: **{tvl}$**\n'
+    f'Total Fees Earned: **{fees}$**\n'
+    f'LPs Holding: {2 * isqrt(pool.reserve0_units * pool.reserve1_units) - pool.reserve0_units - pool.reserve1_units}',
     
     reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("Add to Watchlist", callback_data=f"add_watchlist_{pool.address}")]])
     )
@@ -128,48 +114,45 @@ async def get_info_by_pool(client, message):
 @app.on_callback_query(filters.regex("^add_watchlist_"))
 async def add_to_watchlist(client, callback_query):
     user_id = callback_query.from_user.id
-    pool_address = callback_query.data.split("_")[2]
+    pool_address = callback_query.data.removeprefix("add_watchlist_")
 
-    session = Session()
-    pool = session.query(Pool).filter_by(address=pool_address).first()
-    watchlist_entry = Watchlist(user_id=user_id, name_pool=pool_address)
-    session.add(watchlist_entry)
-    session.commit()
-    session.close()
+    if not await run_db(add_watchlist_entry, user_id, pool_address):
+        await callback_query.answer("Unknown pool, it was not added to the watchlist.", show_alert=True)
+        return
 
     await callback_query.answer("Pool added to watchlist.")
 
 
 @app.on_message(filters.command("top10_pools"))
 async def top10_TVL_pools(client, message):
-    s_client = APIClient()
-    
-    pools = await s_client.get_pool()
-    
+    from stonfi import PoolTable  # needs numpy
+
+    pools, assets = await asyncio.gather(stonfi_client.get_pools(), stonfi_client.get_assets())
+
+    table = PoolTable(pools)
+    tvl = table.tvl(table.token_prices(assets))
+    symbols = {asset.contract_address: asset.symbol for asset in assets}
+
     top10_pools = []
-    
-    for pool in pools:
-        if 
-    
-    
+    for rank, row in enumerate(table.top(tvl, 10), start=1):
+        pool = table.pools[row]
+        pair = f"{symbols.get(pool.token0_address, '?')}/{symbols.get(pool.token1_address, '?')}"
+        top10_pools.append(f"{rank}. **{pair}** `{pool.address}` TVL: **{tvl[row]:,.0f}$**")
+
+    await message.reply("\n".join(top10_pools) or "No pools found.")
 
 
 @app.on_message(filters.command("show_watchlist"))
 async def show_watchlist(client, message):
     user_id = message.from_user.id
 
-    session = Session()
-    watchlist_entries = session.query(Watchlist).filter_by(user_id=user_id).all()
-    session.close()
+    pools = await run_db(get_watchlist, user_id)
 
-    if not watchlist_entries:
+    if not pools:
         await message.reply("Your watchlist is empty.")
         return
 
-    keyboard = []
-    for entry in watchlist_entries:
-        pool = entry.pool
-        keyboard.append([InlineKeyboardButton(pool.name, callback_data=f"get_info_{pool.address}")])
+    keyboard = [[InlineKeyboardButton(pool.name, callback_data=f"get_info_{pool.address}")] for pool in pools]
 
     reply_markup = InlineKeyboardMarkup(keyboard)
     await message.reply("Here's your watchlist:", reply_markup=reply_markup)
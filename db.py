@@ -0,0 +1,248 @@
+"""
+The bot's SQLite database: models, schema migration and pool sync.
+
+    python db.py    # sync the pools table with the STON.fi API
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Iterable, ParamSpec, TypeVar
+
+from sqlalchemy import Column, ForeignKey, Integer, String, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+
+from stonfi import APIClient
+from stonfi.sqlite import create_sqlite_engine
+from stonfi.types import Pool as StonfiPool
+
+
+DATABASE_URL = "sqlite:///pools.db"
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def create_database(url: str = DATABASE_URL) -> Engine:
+    """
+    Creates an engine for the bot's database, see `stonfi.sqlite.create_sqlite_engine`.
+
+    Args:
+        url (str, optional): The database URL. Defaults to "sqlite:///pools.db".
+
+    Returns:
+        Engine: The engine.
+    """
+    return create_sqlite_engine(url)
+
+
+engine = create_database()
+Session = sessionmaker(bind=engine)
+
+# Database calls of the bot run here, off the event loop; SQLite serializes writers anyway.
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="db")
+
+Base = declarative_base()
+
+
+class Pool(Base):
+    __tablename__ = "pools"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    address = Column(String, unique=True, index=True)
+    token_lqd = Column(String)
+    token_base = Column(String)
+
+
+class Watchlist(Base):
+    __tablename__ = "watchlists"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, index=True)
+    name_pool = Column(String, ForeignKey("pools.address"))
+
+    pool = relationship("Pool", lazy="joined")
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    """
+    The outcome of `sync_pools`.
+
+    Attributes:
+        inserted (int): Pools that were new.
+        updated (int): Pools whose name or tokens changed.
+        deleted (int): Pools that no longer exist.
+        seconds (float): The duration of the sync.
+    """
+
+    inserted: int
+    updated: int
+    deleted: int
+    seconds: float
+
+
+def pool_name(address: str) -> str:
+    return f"Pool {address[:6]}..."
+
+
+def migrate(bind: Engine = engine) -> None:
+    """
+    Brings an existing database up to the current schema.
+
+    Creates missing tables, adds the token columns to old `pools` tables and
+    replaces duplicate addresses by their oldest row before adding the unique
+    address index.
+
+    Args:
+        bind (Engine, optional): The database. Defaults to the bot's database.
+    """
+    Base.metadata.create_all(bind)
+    with bind.begin() as connection:
+        columns = {column["name"] for column in inspect(connection).get_columns("pools")}
+        for column in ("token_lqd", "token_base"):
+            if column not in columns:
+                connection.exec_driver_sql(f"ALTER TABLE pools ADD COLUMN {column} VARCHAR")
+        connection.exec_driver_sql("DELETE FROM pools WHERE id NOT IN (SELECT MIN(id) FROM pools GROUP BY address)")
+        connection.exec_driver_sql("CREATE UNIQUE INDEX IF NOT EXISTS ix_pools_address ON pools (address)")
+
+
+def sync_pools(pools: Iterable[StonfiPool], bind: Engine = engine) -> SyncResult:
+    """
+    Makes the pools table match a pool list in one transaction.
+
+    The table is diffed against the list in memory first, so only new and
+    changed rows are written (one `executemany` upsert keyed on the unique
+    address) and pools missing from the list are deleted.
+
+    Args:
+        pools (Iterable[StonfiPool]): The current pools, e.g. from `APIClient.get_pools`.
+        bind (Engine, optional): The database. Defaults to the bot's database.
+
+    Returns:
+        SyncResult: The number of inserted, updated and deleted pools.
+    """
+    start = time.perf_counter()
+    rows = {
+        pool.address: {
+            "name": pool_name(pool.address),
+            "address": pool.address,
+            "token_lqd": pool.token0_address,
+            "token_base": pool.token1_address,
+        }
+        for pool in pools
+    }
+    with bind.begin() as connection:
+        existing = {
+            address: (name, token_lqd, token_base)
+            for address, name, token_lqd, token_base in connection.exec_driver_sql(
+                "SELECT address, name, token_lqd, token_base FROM pools"
+            )
+        }
+        inserted = [row for address, row in rows.items() if address not in existing]
+        updated = [
+            row
+            for address, row in rows.items()
+            if address in existing and existing[address] != (row["name"], row["token_lqd"], row["token_base"])
+        ]
+        deleted = [{"address": address} for address in existing.keys() - rows.keys()]
+        if inserted or updated:
+            connection.execute(
+                text(
+                    "INSERT INTO pools (name, address, token_lqd, token_base)"
+                    " VALUES (:name, :address, :token_lqd, :token_base)"
+                    " ON CONFLICT (address) DO UPDATE SET"
+                    " name = excluded.name, token_lqd = excluded.token_lqd, token_base = excluded.token_base"
+                ),
+                inserted + updated,
+            )
+        if deleted:
+            connection.execute(text("DELETE FROM pools WHERE address = :address"), deleted)
+    return SyncResult(len(inserted), len(updated), len(deleted), time.perf_counter() - start)
+
+
+async def run_db(function: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """
+    Runs a blocking database function in `executor`, so the event loop keeps serving.
+
+    Args:
+        function (Callable): The function, e.g. `count_pools`.
+        *args, **kwargs: Its arguments.
+
+    Returns:
+        The function's result.
+    """
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(function, *args, **kwargs))
+
+
+def count_pools(bind: Engine = engine) -> int:
+    """
+    Returns the number of pools in the pools table.
+
+    Args:
+        bind (Engine, optional): The database. Defaults to the bot's database.
+    """
+    with bind.connect() as connection:
+        return connection.scalar(select(func.count()).select_from(Pool))
+
+
+def add_watchlist_entry(user_id: int, address: str, bind: Engine = engine) -> bool:
+    """
+    Adds a pool to a user's watchlist.
+
+    Args:
+        user_id (int): The Telegram user.
+        address (str): The pool address.
+        bind (Engine, optional): The database. Defaults to the bot's database.
+
+    Returns:
+        bool: False if the pool is not in the pools table, in which case nothing is added.
+    """
+    with Session(bind=bind) as session, session.begin():
+        if session.scalar(select(Pool.id).where(Pool.address == address)) is None:
+            return False
+        session.add(Watchlist(user_id=user_id, name_pool=address))
+        return True
+
+
+def get_watchlist(user_id: int, bind: Engine = engine) -> list[Pool]:
+    """
+    Returns the pools on a user's watchlist, skipping pools that no longer exist.
+
+    Args:
+        user_id (int): The Telegram user.
+        bind (Engine, optional): The database. Defaults to the bot's database.
+
+    Returns:
+        list[Pool]: The pools in the order they were added.
+    """
+    with Session(bind=bind) as session:
+        return list(session.scalars(
+            select(Pool).join(Watchlist, Watchlist.name_pool == Pool.address).where(Watchlist.user_id == user_id).order_by(Watchlist.id)
+        ))
+
+
+async def refresh_pools(client: APIClient, bind: Engine = engine) -> SyncResult:
+    """
+    Fetches all pools and syncs the pools table with them in `executor`.
+
+    Args:
+        client (APIClient): The STON.fi client.
+        bind (Engine, optional): The database. Defaults to the bot's database.
+
+    Returns:
+        SyncResult: The number of inserted, updated and deleted pools.
+    """
+    return await run_db(sync_pools, await client.get_pools(), bind)
+
+
+async def main() -> None:
+    migrate()
+    async with APIClient() as client:
+        result = await refresh_pools(client)
+    print(f"inserted {result.inserted}, updated {result.updated}, deleted {result.deleted} in {result.seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,47 @@
+from stonfi._cache import ResponseCache, ResponseInfo
+from stonfi._circuit import CircuitBreaker, CircuitOpenError
 from stonfi._client import APIClient
+from stonfi._diff import PoolChange, PoolDiff, PoolEvent
+from stonfi._fanout import FanOutResult
+from stonfi._history import PoolHistory, PoolSnapshot
+from stonfi._metrics import Metrics, RequestEvent
+from stonfi._ratelimit import RateLimiter
+from stonfi._router import Route, Router
+from stonfi._simulate import simulate_reverse_swap, simulate_swap
+from stonfi._stats_cache import StatsCache
+from stonfi._time import format_time, parse_time
 
 __all__ = (
     "APIClient",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FanOutResult",
+    "Metrics",
+    "PoolChange",
+    "PoolDiff",
+    "PoolEvent",
+    "PoolHistory",
+    "PoolSnapshot",
+    "PoolTable",
+    "Quotes",
+    "RateLimiter",
+    "RequestEvent",
+    "ResponseCache",
+    "ResponseInfo",
+    "Route",
+    "Router",
+    "StatsCache",
+    "format_time",
+    "parse_time",
+    "simulate_reverse_swap",
+    "simulate_swap",
 )
+
+
+def __getattr__(name: str):
+    # PoolTable needs numpy, which only its users have to install.
+    if name in ("PoolTable", "Quotes"):
+        from stonfi import _table
+
+        return getattr(_table, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,175 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+
+DEFAULT_TTL: dict[str, float] = {
+    "asset": 300.0,
+    "assets": 300.0,
+    "farm": 60.0,
+    "farms": 60.0,
+    "farms_by_pool": 60.0,
+    "markets": 300.0,
+}
+
+
+@dataclass(frozen=True)
+class ResponseInfo:
+    """
+    Describes where the value returned by an `APIClient` call came from.
+
+    Attributes:
+        endpoint (str): The endpoint name.
+        stale (bool): True if an expired value was served, because the circuit
+            of the endpoint is open or a refresh is still running.
+        age (float): Seconds since a stale value was fetched; 0 for fresh values.
+    """
+
+    endpoint: str
+    stale: bool = False
+    age: float = 0.0
+
+
+class ResponseCache:
+    """
+    A bounded in-memory cache of decoded API responses.
+
+    Every entry expires after the TTL configured for its endpoint, and once
+    `maxsize` entries are stored the least recently used one is evicted.
+    Expired entries are kept for another `stale_ttl` seconds, so they can be
+    served as stale values while the API is unavailable or being revalidated.
+    Keys are tuples whose first element is the endpoint name.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept in memory.
+        ttl (dict[str, float]): Time to live in seconds per endpoint name.
+        stale_ttl (float): Seconds an expired entry is still available through `get_stale`.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that were not found or had expired.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: dict[str, float] | None = None, stale_ttl: float = 0.0):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int, optional): The maximum number of entries. Defaults to 1024.
+            ttl (dict[str, float], optional): Per-endpoint TTL overrides merged over
+                `DEFAULT_TTL`. A TTL of 0 disables caching for that endpoint.
+            stale_ttl (float, optional): Seconds expired entries are retained for
+                stale serving. Defaults to 0.
+        """
+        self.maxsize = maxsize
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[float, float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cacheable(self, endpoint: str) -> bool:
+        """
+        Returns whether responses of an endpoint are cached at all.
+
+        Args:
+            endpoint (str): The endpoint name.
+
+        Returns:
+            bool: True if the endpoint has a positive TTL.
+        """
+        return self.ttl.get(endpoint, 0) > 0
+
+    def get(self, key: tuple[Hashable, ...], default: Any = None) -> Any:
+        """
+        Looks up a fresh entry and marks it as most recently used.
+
+        Lists are returned as shallow copies so callers cannot alter the cached value.
+
+        Args:
+            key (tuple): The cache key.
+            default (Any, optional): Returned when there is no fresh entry. Defaults to None.
+
+        Returns:
+            Any: The cached value or `default`.
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry[0] <= now:
+            if entry is not None and entry[0] + self.stale_ttl <= now:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        value = entry[2]
+        return list(value) if isinstance(value, list) else value
+
+    def get_stale(self, key: tuple[Hashable, ...], default: Any = None) -> Any:
+        """
+        Looks up an entry that may have expired less than `stale_ttl` seconds ago.
+
+        Args:
+            key (tuple): The cache key.
+            default (Any, optional): Returned when there is no such entry. Defaults to None.
+
+        Returns:
+            Any: A `(value, age)` tuple, where `age` is the number of seconds since
+            the value was stored, or `default`.
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry[0] + self.stale_ttl <= now:
+            return default
+        value = entry[2]
+        return (list(value) if isinstance(value, list) else value), now - entry[1]
+
+    def set(self, key: tuple[Hashable, ...], value: Any) -> None:
+        """
+        Stores a value using the TTL of the endpoint named by `key[0]`.
+
+        Args:
+            key (tuple): The cache key.
+            value (Any): The decoded response to store.
+        """
+        ttl = self.ttl.get(key[0], 0)
+        if ttl <= 0:
+            return
+        if isinstance(value, list):
+            value = list(value)
+        now = time.monotonic()
+        self._entries[key] = (now + ttl, now, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: str | None = None) -> int:
+        """
+        Drops cached entries.
+
+        Args:
+            endpoint (str, optional): Only drop entries of this endpoint. Drops
+                everything when omitted.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        if endpoint is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        keys = [key for key in self._entries if key[0] == endpoint]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict[str, int]: The number of hits, misses and stored entries.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -0,0 +1,175 @@
+import time
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the circuit of its endpoint is open.
+
+    Attributes:
+        endpoint (str): The endpoint name.
+        retry_after (float): Seconds until the circuit lets a probe request through.
+    """
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"circuit for {endpoint!r} is open, retry in {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class _Circuit:
+    __slots__ = ("state", "calls", "opened_at", "probing", "opened")
+
+    def __init__(self):
+        self.state = "closed"
+        self.calls: deque[tuple[float, bool]] = deque()
+        self.opened_at = 0.0
+        self.probing = False
+        self.opened = 0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breakers driven by error rate and latency.
+
+    A circuit opens once at least `min_calls` calls were made within the last
+    `window` seconds and `error_rate` of them failed. Error statuses (5xx and
+    429), transport errors and calls slower than `slow_call` seconds count as
+    failures. An open circuit rejects calls for `open_for` seconds, then lets a
+    single probe through (half-open): its success closes the circuit again, its
+    failure reopens it.
+
+    Attributes:
+        error_rate (float): The failure fraction that opens a circuit.
+        slow_call (float): Calls slower than this many seconds count as failures.
+        min_calls (int): The number of calls within the window needed to judge the error rate.
+        window (float): The length of the sliding window in seconds.
+        open_for (float): Seconds an open circuit rejects calls before probing.
+    """
+
+    def __init__(
+        self,
+        error_rate: float = 0.5,
+        slow_call: float = 5.0,
+        min_calls: int = 20,
+        window: float = 30.0,
+        open_for: float = 30.0,
+    ):
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.min_calls = min_calls
+        self.window = window
+        self.open_for = open_for
+        self._circuits: dict[str, _Circuit] = {}
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit()
+        return circuit
+
+    def is_open(self, endpoint: str) -> bool:
+        """
+        Returns whether calls to an endpoint are currently rejected.
+
+        Args:
+            endpoint (str): The endpoint name.
+
+        Returns:
+            bool: True while the circuit is open or its probe is in flight.
+        """
+        circuit = self._circuits.get(endpoint)
+        if circuit is None or circuit.state == "closed":
+            return False
+        if circuit.state == "half_open":
+            return circuit.probing
+        return time.monotonic() < circuit.opened_at + self.open_for
+
+    def check(self, endpoint: str) -> None:
+        """
+        Admits a call to an endpoint, turning an open circuit half-open once
+        `open_for` has passed.
+
+        Args:
+            endpoint (str): The endpoint name.
+
+        Raises:
+            CircuitOpenError: If the call is rejected.
+        """
+        circuit = self._circuit(endpoint)
+        if circuit.state == "closed":
+            return
+        now = time.monotonic()
+        if circuit.state == "open":
+            if now < circuit.opened_at + self.open_for:
+                raise CircuitOpenError(endpoint, circuit.opened_at + self.open_for - now)
+            circuit.state = "half_open"
+        if circuit.probing:
+            raise CircuitOpenError(endpoint, 0.0)
+        circuit.probing = True
+
+    def release(self, endpoint: str) -> None:
+        """
+        Gives back an admission of `check` whose call ended without an outcome,
+        e.g. because it was cancelled, so that the next call can probe instead.
+
+        Args:
+            endpoint (str): The endpoint name.
+        """
+        circuit = self._circuits.get(endpoint)
+        if circuit is not None and circuit.state == "half_open":
+            circuit.probing = False
+
+    def record(self, endpoint: str, latency: float, failed: bool) -> None:
+        """
+        Records the outcome of a call admitted by `check`.
+
+        Args:
+            endpoint (str): The endpoint name.
+            latency (float): The duration of the call in seconds.
+            failed (bool): Whether the call failed.
+        """
+        circuit = self._circuit(endpoint)
+        failed = failed or latency > self.slow_call
+        now = time.monotonic()
+        if circuit.state == "open":
+            # A call admitted before the circuit opened.
+            return
+        if circuit.state == "half_open":
+            circuit.probing = False
+            if failed:
+                self._open(circuit, now)
+            else:
+                circuit.state = "closed"
+                circuit.calls.clear()
+            return
+        calls = circuit.calls
+        calls.append((now, failed))
+        while calls[0][0] < now - self.window:
+            calls.popleft()
+        if len(calls) >= self.min_calls and sum(failed for _, failed in calls) >= self.error_rate * len(calls):
+            self._open(circuit, now)
+
+    def _open(self, circuit: _Circuit, now: float) -> None:
+        circuit.state = "open"
+        circuit.opened_at = now
+        circuit.opened += 1
+        circuit.calls.clear()
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Returns the state of every circuit.
+
+        Returns:
+            dict[str, dict]: Per endpoint, the state, the calls and failures in the
+            current window and how often the circuit has opened.
+        """
+        return {
+            endpoint: {
+                "state": circuit.state,
+                "calls": len(circuit.calls),
+                "failures": sum(failed for _, failed in circuit.calls),
+                "opened": circuit.opened,
+            }
+            for endpoint, circuit in self._circuits.items()
+        }
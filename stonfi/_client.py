@@ -1,5 +1,22 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import aclosing
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Container, Iterable, TypeVar
+
 import httpx
-from stonfi.types import Asset, Farm, Pool, SwapSimulateData, SwapResponse, SwapStatus, Operation, DexStats, PoolStats
+from stonfi._cache import ResponseCache, ResponseInfo
+from stonfi._circuit import CircuitBreaker
+from stonfi._fanout import FanOutResult, fan_out
+from stonfi._metrics import Metrics, RequestEvent
+from stonfi._ratelimit import RETRY_STATUSES, RateLimiter
+from stonfi._singleflight import SingleFlight
+from stonfi._stats_cache import StatsCache
+from stonfi._stream import iter_json_array
+from stonfi._time import format_time as _format_time, parse_time as _parse_time
+from stonfi.types import Asset, Farm, Pool, SwapSimulateData, SwapResponse, SwapStatus, Operation, DexStats, PoolStats, decoder
 
 
 def clean_dict(d: dict) -> dict:
@@ -16,20 +33,175 @@ def clean_dict(d: dict) -> dict:
     return {k: v for k, v in d.items() if v is not None}
 
 
+T = TypeVar("T")
+
+_MISS = object()
+
+CONDITIONAL_ENDPOINTS = frozenset({"assets", "farms", "pools"})
+
+MIN_OPERATIONS_WINDOW = timedelta(minutes=1)
+
+_decode_asset = decoder(Asset)
+_decode_farm = decoder(Farm)
+_decode_pool = decoder(Pool)
+_decode_operation = decoder(Operation)
+_decode_swap_status = decoder(SwapStatus)
+_decode_swap_response = decoder(SwapResponse)
+_decode_dex_stats = decoder(DexStats)
+_decode_pool_stats = decoder(PoolStats)
+
+_response_info: ContextVar[ResponseInfo | None] = ContextVar("stonfi_response_info", default=None)
+
+
 class APIClient:
     """
     A client for interacting with the STON.fi API using asynchronous HTTP requests.
     
     Attributes:
         client (httpx.AsyncClient): The HTTP client used to make requests to the API.
+        cache (ResponseCache | None): The cache of decoded responses, if caching is enabled.
+        conditional (bool): Whether bulk list endpoints are revalidated with conditional GETs.
+        rate_limiter (RateLimiter | None): Paces requests and retries throttled ones, if enabled.
+        stats_cache (StatsCache | None): The on-disk store of stats over closed windows, if enabled.
+        circuit_breaker (CircuitBreaker | None): Rejects requests to failing endpoints, if enabled.
+        metrics (Metrics | None): Per-endpoint request measurements, if enabled.
     """
 
-    def __init__(self):
+    _shared: "APIClient | None" = None
+
+    def __init__(
+        self,
+        *,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 30.0,
+        http2: bool = False,
+        timeout: float | None = 10.0,
+        retries: int = 5,
+        cache: bool | ResponseCache = False,
+        conditional: bool = True,
+        asset_index_ttl: float = 300.0,
+        rate_limiter: bool | RateLimiter = False,
+        base_url: str = "https://api.ston.fi",
+        transport: httpx.AsyncBaseTransport | None = None,
+        operations_window: timedelta = timedelta(days=7),
+        max_window_operations: int = 1000,
+        stats_cache: str | StatsCache | None = None,
+        circuit_breaker: bool | CircuitBreaker = False,
+        metrics: bool | Metrics = False,
+    ):
         """
-        Initializes the APIClient with a default AsyncClient that retries up to 5 times
-        in case of failures.
+        Initializes the APIClient with a pooled AsyncClient that retries failed
+        connections up to `retries` times.
+
+        Args:
+            max_connections (int, optional): Upper bound on open connections. Defaults to 100.
+            max_keepalive_connections (int, optional): Idle connections kept warm in the pool. Defaults to 20.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept alive. Defaults to 30.
+            http2 (bool, optional): Multiplex requests over HTTP/2 (requires the `h2` package). Defaults to False.
+            timeout (float, optional): Network timeout in seconds. Defaults to 10.
+            retries (int, optional): Connection retries performed by the transport. Defaults to 5.
+            cache (bool | ResponseCache, optional): Cache decoded responses of slowly changing
+                endpoints in memory. Pass True for the default TTLs or a configured
+                ResponseCache. Defaults to False.
+            conditional (bool, optional): Remember the ETag/Last-Modified validators of
+                the pool, asset and farm lists and reuse the previously decoded list
+                when the API answers 304 Not Modified. Defaults to True.
+            asset_index_ttl (float, optional): Seconds the asset snapshot used by
+                `get_assets_many` is trusted before it is refreshed. Defaults to 300.
+            rate_limiter (bool | RateLimiter, optional): Pace requests per endpoint group
+                and retry 429/503 responses with backoff. Pass True for the default
+                limits or a configured RateLimiter. Defaults to False.
+            base_url (str, optional): The root of the API, e.g. a local stand-in server.
+                Defaults to "https://api.ston.fi".
+            transport (httpx.AsyncBaseTransport, optional): Replaces the pooled HTTP
+                transport, e.g. with a `stonfi.offline` recording or replay transport.
+                The pool and retry options are ignored then. Defaults to None.
+            operations_window (timedelta, optional): The longest range fetched in a
+                single wallet operations request. Defaults to 7 days.
+            max_window_operations (int, optional): A window returning this many
+                operations is treated as truncated and split. Defaults to 1000.
+            stats_cache (str | StatsCache, optional): Keep the DEX, pool and operations
+                stats of windows that have already ended on disk and never request
+                them again. Pass a database path or a configured StatsCache.
+                Defaults to None.
+            circuit_breaker (bool | CircuitBreaker, optional): Track error rate and
+                latency per endpoint and fail fast with `CircuitOpenError` while an
+                endpoint is failing. With a `ResponseCache` whose `stale_ttl` is set,
+                expired values are then served as stale instead. Pass True for the
+                default thresholds or a configured CircuitBreaker. Defaults to False.
+            metrics (bool | Metrics, optional): Record count, statuses, latency, bytes and
+                parse/decode time of every round trip per endpoint. Pass True or a
+                Metrics instance, e.g. with hooks registered. Defaults to False.
+        """
+        if transport is None:
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+            transport = httpx.AsyncHTTPTransport(retries=retries, limits=limits, http2=http2)
+        self.client = httpx.AsyncClient(transport=transport, timeout=timeout)
+        self._base_url = base_url.rstrip("/")
+        self.cache = ResponseCache() if cache is True else (cache if isinstance(cache, ResponseCache) else None)
+        self.conditional = conditional
+        self._validators: dict[tuple, tuple[str | None, str | None, Any]] = {}
+        self._inflight = SingleFlight()
+        self.asset_index_ttl = asset_index_ttl
+        self._asset_index: dict[str, Asset] = {}
+        self._asset_index_expires = 0.0
+        self.rate_limiter = RateLimiter() if rate_limiter is True else (rate_limiter or None)
+        self.operations_window = operations_window
+        self.max_window_operations = max_window_operations
+        self._owns_stats_cache = isinstance(stats_cache, str)
+        self.stats_cache = StatsCache(stats_cache) if self._owns_stats_cache else stats_cache
+        self.circuit_breaker = CircuitBreaker() if circuit_breaker is True else (circuit_breaker or None)
+        self._refreshes: set[asyncio.Task] = set()
+        self.metrics = Metrics() if metrics is True else (metrics or None)
+
+    @classmethod
+    def shared(cls, **kwargs) -> "APIClient":
         """
-        self.client = httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(retries=5))
+        Returns the process-wide client, creating it on first use.
+
+        The keyword arguments are only applied when a new client is created, i.e.
+        on the first call or after the shared client has been closed.
+
+        Returns:
+            APIClient: The shared client instance.
+        """
+        if cls._shared is None or cls._shared.closed:
+            cls._shared = cls(**kwargs)
+        return cls._shared
+
+    @property
+    def closed(self) -> bool:
+        """
+        Returns whether the underlying HTTP client has been closed.
+
+        Returns:
+            bool: True once `close` has been awaited.
+        """
+        return self.client.is_closed
+
+    async def __aenter__(self) -> "APIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def response_info(self) -> ResponseInfo | None:
+        """
+        Returns how the last call made by the current task was answered, e.g.
+        whether it returned a stale value.
+
+        Calls made by other tasks, such as the ones started by `fan_out`, are not visible here.
+
+        Returns:
+            ResponseInfo | None: The description of the last response, or None before the first call.
+        """
+        return _response_info.get()
 
     @property
     def base_url(self) -> str:
@@ -39,7 +211,262 @@ class APIClient:
         Returns:
             str: The base URL for the STON.fi API.
         """
-        return "https://api.ston.fi"
+        return self._base_url
+
+    async def _request(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        decode: Callable[[Any], T],
+        params: dict | None = None,
+    ) -> T:
+        """
+        Sends a request to the API and decodes its JSON body.
+
+        GET responses of endpoints with a configured TTL are served from and
+        stored in `cache`. An expired entry still within the cache's `stale_ttl`
+        is returned immediately as a stale value while it is refreshed in the
+        background (unless the endpoint's circuit is open). Stats over closed
+        windows are served from and stored in `stats_cache`. Concurrent identical
+        requests (same method, URL and params) share a single round trip and
+        decoded result.
+
+        Args:
+            endpoint (str): The endpoint name used for caching.
+            method (str): The HTTP method.
+            url (str): The absolute request URL.
+            decode (Callable): Turns the parsed JSON body into the returned value.
+            params (dict, optional): Query parameters. Defaults to None.
+
+        Returns:
+            T: The decoded response.
+        """
+        frozen_params = tuple(sorted(params.items())) if params else ()
+        key = (endpoint, url, frozen_params)
+        flight = (method, url, frozen_params)
+        cached = method == "GET" and self.cache is not None and self.cache.cacheable(endpoint)
+        stored = method == "GET" and self.stats_cache is not None and self.stats_cache.storable(endpoint, params)
+        fetch = lambda: self._inflight.do(flight, lambda: self._fetch(key, method, url, decode, params, cached, stored))
+        if cached:
+            value = self.cache.get(key, _MISS)
+            if value is not _MISS:
+                _response_info.set(ResponseInfo(endpoint))
+                return value
+            stale = self.cache.get_stale(key)
+            if stale is not None:
+                self._revalidate(endpoint, flight, fetch)
+                _response_info.set(ResponseInfo(endpoint, stale=True, age=stale[1]))
+                return stale[0]
+        if stored:
+            data = await asyncio.to_thread(self.stats_cache.get, endpoint, params["since"], params["until"])
+            if data is not None:
+                _response_info.set(ResponseInfo(endpoint))
+                return decode(data)
+        value = await fetch()
+        _response_info.set(ResponseInfo(endpoint))
+        return list(value) if isinstance(value, list) else value
+
+    def _revalidate(self, endpoint: str, flight: tuple, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Refreshes a stale cache entry in the background, unless a request for it
+        is already in flight or the circuit of its endpoint is open.
+        """
+        if flight in self._inflight or (self.circuit_breaker is not None and self.circuit_breaker.is_open(endpoint)):
+            return
+        task = asyncio.ensure_future(fetch())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshed)
+
+    def _refreshed(self, task: asyncio.Task) -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled():
+            # A failed refresh leaves the stale entry in place.
+            task.exception()
+
+    async def _fetch(
+        self,
+        key: tuple,
+        method: str,
+        url: str,
+        decode: Callable[[Any], T],
+        params: dict | None,
+        cached: bool,
+        stored: bool = False,
+    ) -> T:
+        """
+        Performs the round trip behind `_request` and stores the decoded value.
+
+        GETs of the endpoints in `CONDITIONAL_ENDPOINTS` carry the validators of
+        the previous response, and a 304 answer reuses the value decoded back then.
+        With `stored`, the raw body is written to `stats_cache`. The round trip
+        is reported to `metrics`.
+        """
+        conditional = method == "GET" and self.conditional and key[0] in CONDITIONAL_ENDPOINTS
+        validated = self._validators.get(key) if conditional else None
+        headers = {}
+        if validated is not None:
+            etag, last_modified, _ = validated
+            if etag is not None:
+                headers["If-None-Match"] = etag
+            if last_modified is not None:
+                headers["If-Modified-Since"] = last_modified
+        response = None
+        parse_time = decode_time = 0.0
+        try:
+            response = await self._send(key[0], method, url, params=params, headers=headers)
+            if validated is not None and response.status_code == 304:
+                value = validated[2]
+            else:
+                start = time.perf_counter()
+                data = response.json()
+                parsed = time.perf_counter()
+                value = decode(data)
+                parse_time, decode_time = parsed - start, time.perf_counter() - parsed
+                if stored:
+                    await asyncio.to_thread(self.stats_cache.set, key[0], params["since"], params["until"], data)
+                if conditional:
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    if etag is not None or last_modified is not None:
+                        self._validators[key] = (etag, last_modified, value)
+        except Exception as error:
+            if self.metrics is not None:
+                self._record(key[0], method, url, getattr(error, "response", response), error=error)
+            raise
+        if self.metrics is not None:
+            self._record(key[0], method, url, response, parse_time, decode_time)
+        if cached:
+            self.cache.set(key, value)
+        return value
+
+    def _record(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        response: httpx.Response | None,
+        parse_time: float = 0.0,
+        decode_time: float = 0.0,
+        error: Exception | None = None,
+    ) -> None:
+        """
+        Reports a finished round trip to `metrics`.
+        """
+        if response is None:
+            event = RequestEvent(endpoint, method, url, None, error=error)
+        else:
+            size = response.num_bytes_downloaded
+            if not size:
+                # In-process transports hand over the body without downloading it.
+                try:
+                    size = len(response.content)
+                except httpx.ResponseNotRead:
+                    pass
+            event = RequestEvent(
+                endpoint, method, url, response.status_code,
+                latency=response.extensions.get("stonfi_latency", 0.0),
+                bytes=size,
+                parse_time=parse_time,
+                decode_time=decode_time,
+                error=error,
+            )
+        self.metrics.record(event)
+
+    async def _send(self, endpoint: str, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Sends a single request through the rate limiter and the circuit breaker.
+
+        429 and 503 responses are retried after the server's `Retry-After` or a
+        jittered exponential backoff, up to `rate_limiter.max_retries` times.
+        Every attempt is reported to the circuit breaker, so retries stop as
+        soon as the circuit opens. The rate limiter is waited on before the
+        circuit is checked, so a caller cancelled while waiting never holds the
+        half-open probe.
+
+        With `stream`, the body is not read; the caller must close the response.
+
+        Raises:
+            CircuitOpenError: If the circuit of the endpoint is open.
+            httpx.HTTPStatusError: If the final response has an error status.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(endpoint)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.check(endpoint)
+            response = await self._attempt(endpoint, method, url, stream, **kwargs)
+            if (
+                self.rate_limiter is None
+                or response.status_code not in RETRY_STATUSES
+                or attempt >= self.rate_limiter.max_retries
+            ):
+                break
+            await response.aclose()
+            await self.rate_limiter.backoff(endpoint, attempt, response.headers.get("Retry-After"))
+            attempt += 1
+        if response.is_error:
+            if stream:
+                await response.aclose()
+            response.raise_for_status()
+        return response
+
+    async def _attempt(self, endpoint: str, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Sends one request and reports its latency and outcome to the circuit breaker.
+
+        A cancelled request has no outcome and only releases its admission.
+        The latency is also kept in the response's `extensions` for `metrics`.
+        """
+        start = time.monotonic()
+        try:
+            response = await self.client.send(self.client.build_request(method, url, **kwargs), stream=stream)
+        except asyncio.CancelledError:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release(endpoint)
+            raise
+        except Exception:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(endpoint, time.monotonic() - start, True)
+            raise
+        latency = response.extensions["stonfi_latency"] = time.monotonic() - start
+        if self.circuit_breaker is not None:
+            failed = response.status_code >= 500 or response.status_code == 429
+            self.circuit_breaker.record(endpoint, latency, failed)
+        return response
+
+    async def _stream(self, endpoint: str, url: str, key: str) -> AsyncIterator[Any]:
+        """
+        Streams a list response and yields the raw items of the array under `key`
+        while the body is still being received.
+
+        The request goes through `_send`, so it is paced and retried like
+        buffered requests.
+
+        Raises:
+            CircuitOpenError: If the circuit of the endpoint is open.
+            httpx.HTTPStatusError: If the final response has an error status.
+        """
+        start = time.monotonic()
+        try:
+            response = await self._send(endpoint, "GET", url, stream=True)
+        except Exception as error:
+            if self.metrics is not None:
+                self._record(endpoint, "GET", url, getattr(error, "response", None), error=error)
+            raise
+        error = None
+        try:
+            async for item in iter_json_array(response.aiter_text(), key):
+                yield item
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            await response.aclose()
+            if self.metrics is not None:
+                response.extensions["stonfi_latency"] = time.monotonic() - start
+                self._record(endpoint, "GET", url, response, error=error)
 
     async def get_assets(self) -> list[Asset]:
         """
@@ -48,8 +475,20 @@ class APIClient:
         Returns:
             list[Asset]: A list of Asset objects representing all assets.
         """
-        response = await self.client.get(f'{self.base_url}/v1/assets')
-        return [Asset(**asset) for asset in response.json()["asset_list"]]
+        return await self._request(
+            "assets", "GET", f'{self.base_url}/v1/assets',
+            lambda data: [_decode_asset(asset) for asset in data["asset_list"]],
+        )
+
+    async def iter_assets(self) -> AsyncIterator[Asset]:
+        """
+        Streams all assets available in the API, decoding them one at a time.
+
+        Yields:
+            Asset: The assets, in the order returned by the API.
+        """
+        async for asset in self._stream("assets", f'{self.base_url}/v1/assets', "asset_list"):
+            yield _decode_asset(asset)
 
     async def get_asset(self, addr: str) -> Asset:
         """
@@ -61,8 +500,45 @@ class APIClient:
         Returns:
             Asset: An Asset object representing the asset.
         """
-        response = await self.client.get(f'{self.base_url}/v1/assets/{addr}')
-        return Asset(**response.json()["asset"])
+        return await self._request(
+            "asset", "GET", f'{self.base_url}/v1/assets/{addr}',
+            lambda data: _decode_asset(data["asset"]),
+        )
+
+    async def get_assets_many(self, addrs: Iterable[str], concurrency: int = 8) -> dict[str, Asset]:
+        """
+        Resolves many assets at once.
+
+        Lookups are answered from an index of the `get_assets` snapshot keyed by
+        contract address, which is refreshed at most once per `asset_index_ttl`.
+        Addresses missing from the snapshot are fetched one by one, at most
+        `concurrency` at a time.
+
+        Args:
+            addrs (Iterable[str]): The addresses of the assets.
+            concurrency (int, optional): The maximum number of concurrent per-address
+                requests. Defaults to 8.
+
+        Returns:
+            dict[str, Asset]: The resolved assets keyed by address. Addresses that
+                could not be resolved are left out.
+        """
+        addrs = list(dict.fromkeys(addrs))
+        if time.monotonic() >= self._asset_index_expires:
+            await self._refresh_asset_index()
+        missing = [addr for addr in addrs if addr not in self._asset_index]
+        async for result in fan_out(missing, self.get_asset, concurrency):
+            if result.ok:
+                self._asset_index[result.key] = result.value
+        return {addr: self._asset_index[addr] for addr in addrs if addr in self._asset_index}
+
+    async def _refresh_asset_index(self) -> None:
+        """
+        Rebuilds the address index used by `get_assets_many` from `get_assets`.
+        """
+        assets = await self.get_assets()
+        self._asset_index = {asset.contract_address: asset for asset in assets}
+        self._asset_index_expires = time.monotonic() + self.asset_index_ttl
 
     async def get_farms(self) -> list[Farm]:
         """
@@ -71,8 +547,20 @@ class APIClient:
         Returns:
             list[Farm]: A list of Farm objects representing all farms.
         """
-        response = await self.client.get(f'{self.base_url}/v1/farms')
-        return [Farm.from_dict(farm) for farm in response.json()["farm_list"]]
+        return await self._request(
+            "farms", "GET", f'{self.base_url}/v1/farms',
+            lambda data: [_decode_farm(farm) for farm in data["farm_list"]],
+        )
+
+    async def iter_farms(self) -> AsyncIterator[Farm]:
+        """
+        Streams all farms available in the API, decoding them one at a time.
+
+        Yields:
+            Farm: The farms, in the order returned by the API.
+        """
+        async for farm in self._stream("farms", f'{self.base_url}/v1/farms', "farm_list"):
+            yield _decode_farm(farm)
 
     async def get_farm(self, farm_addr: str) -> Farm:
         """
@@ -84,8 +572,27 @@ class APIClient:
         Returns:
             Farm: A Farm object representing the farm.
         """
-        response = await self.client.get(f'{self.base_url}/v1/farms/{farm_addr}')
-        return Farm.from_dict(response.json()["farm"])
+        return await self._request(
+            "farm", "GET", f'{self.base_url}/v1/farms/{farm_addr}',
+            lambda data: _decode_farm(data["farm"]),
+        )
+
+    def get_farms_by_address(
+        self, farm_addrs: Iterable[str], concurrency: int = 8
+    ) -> AsyncIterator[FanOutResult[str, Farm]]:
+        """
+        Fetches many farms by address with bounded, adaptive concurrency.
+
+        Args:
+            farm_addrs (Iterable[str]): The addresses of the farms.
+            concurrency (int, optional): The maximum number of requests in flight.
+                Lowered automatically while requests fail or slow down. Defaults to 8.
+
+        Yields:
+            FanOutResult[str, Farm]: One result per address, as soon as it completes,
+                carrying either the farm or the error of its request.
+        """
+        return fan_out(farm_addrs, self.get_farm, concurrency)
 
     async def get_farms_by_pool(self, pool_addr: str) -> list[Farm]:
         """
@@ -97,8 +604,10 @@ class APIClient:
         Returns:
             list[Farm]: A list of Farm objects associated with the pool.
         """
-        response = await self.client.get(f'{self.base_url}/v1/farms_by_pool/{pool_addr}')
-        return [Farm.from_dict(farm) for farm in response.json()["farm_list"]]
+        return await self._request(
+            "farms_by_pool", "GET", f'{self.base_url}/v1/farms_by_pool/{pool_addr}',
+            lambda data: [_decode_farm(farm) for farm in data["farm_list"]],
+        )
 
     async def get_markets(self) -> list[list[str]]:
         """
@@ -107,8 +616,10 @@ class APIClient:
         Returns:
             list[list[str]]: A list of trading pairs, where each pair is represented by a list of strings.
         """
-        response = await self.client.get(f'{self.base_url}/v1/markets')
-        return response.json()["pairs"]
+        return await self._request(
+            "markets", "GET", f'{self.base_url}/v1/markets',
+            lambda data: data["pairs"],
+        )
 
     async def get_pools(self) -> list[Pool]:
         """
@@ -117,8 +628,24 @@ class APIClient:
         Returns:
             list[Pool]: A list of Pool objects representing all pools.
         """
-        response = await self.client.get(f'{self.base_url}/v1/pools')
-        return [Pool.from_dict(pool) for pool in response.json()["pool_list"]]
+        return await self._request(
+            "pools", "GET", f'{self.base_url}/v1/pools',
+            lambda data: [_decode_pool(pool) for pool in data["pool_list"]],
+        )
+
+    async def iter_pools(self) -> AsyncIterator[Pool]:
+        """
+        Streams all pools available in the API, decoding them one at a time.
+
+        Unlike `get_pools`, the response is parsed incrementally, so memory use
+        stays bounded and the first pool is available before the body has
+        been fully received.
+
+        Yields:
+            Pool: The pools, in the order returned by the API.
+        """
+        async for pool in self._stream("pools", f'{self.base_url}/v1/pools', "pool_list"):
+            yield _decode_pool(pool)
 
     async def get_pool(self, pool_addr: str) -> Pool:
         """
@@ -130,8 +657,27 @@ class APIClient:
         Returns:
             Pool: A Pool object representing the pool.
         """
-        response = await self.client.get(f'{self.base_url}/v1/pools/{pool_addr}')
-        return Pool.from_dict(response.json()["pool"])
+        return await self._request(
+            "pool", "GET", f'{self.base_url}/v1/pools/{pool_addr}',
+            lambda data: _decode_pool(data["pool"]),
+        )
+
+    def get_pools_by_address(
+        self, pool_addrs: Iterable[str], concurrency: int = 8
+    ) -> AsyncIterator[FanOutResult[str, Pool]]:
+        """
+        Fetches many pools by address with bounded, adaptive concurrency.
+
+        Args:
+            pool_addrs (Iterable[str]): The addresses of the pools.
+            concurrency (int, optional): The maximum number of requests in flight.
+                Lowered automatically while requests fail or slow down. Defaults to 8.
+
+        Yields:
+            FanOutResult[str, Pool]: One result per address, as soon as it completes,
+                carrying either the pool or the error of its request.
+        """
+        return fan_out(pool_addrs, self.get_pool, concurrency)
 
     async def get_swap_status(self, router_addr: str, owner_addr: str, query_id: int) -> SwapStatus:
         """
@@ -145,15 +691,15 @@ class APIClient:
         Returns:
             SwapStatus: A SwapStatus object representing the status of the swap.
         """
-        response = await self.client.get(
-            f'{self.base_url}/v1/swap/status',
+        return await self._request(
+            "swap_status", "GET", f'{self.base_url}/v1/swap/status',
+            _decode_swap_status,
             params={
                 "router_address": router_addr,
                 "owner_address": owner_addr,
                 "query_id": str(query_id)
             }
         )
-        return SwapStatus.from_dict(response.json())
 
     async def reverse_swap_simulate(self, simulate_data: SwapSimulateData) -> SwapResponse:
         """
@@ -166,8 +712,11 @@ class APIClient:
             SwapResponse: A SwapResponse object representing the result of the simulation.
         """
         url = f'{self.base_url}/v1/reverse_swap/simulate'
-        response = await self.client.post(url, params=clean_dict(simulate_data.to_dict()))
-        return SwapResponse.from_dict(response.json())
+        return await self._request(
+            "reverse_swap_simulate", "POST", url,
+            _decode_swap_response,
+            params=clean_dict(simulate_data.to_dict()),
+        )
 
     async def swap_simulate(self, simulate_data: SwapSimulateData) -> SwapResponse:
         """
@@ -180,8 +729,11 @@ class APIClient:
             SwapResponse: A SwapResponse object representing the result of the simulation.
         """
         url = f'{self.base_url}/v1/swap/simulate'
-        response = await self.client.post(url, params=clean_dict(simulate_data.to_dict()))
-        return SwapResponse.from_dict(response.json())
+        return await self._request(
+            "swap_simulate", "POST", url,
+            _decode_swap_response,
+            params=clean_dict(simulate_data.to_dict()),
+        )
 
     async def get_jetton_address(self, owner_addr: str, jetton_addr: str) -> str:
         """
@@ -196,8 +748,11 @@ class APIClient:
         """
         url = f"{self.base_url}/v1/jetton/{jetton_addr}/address"
         params = {"owner_address": owner_addr, "addr_str": jetton_addr}
-        response = await self.client.get(url, params=params)
-        return response.json()["address"]
+        return await self._request(
+            "jetton_address", "GET", url,
+            lambda data: data["address"],
+            params=params,
+        )
 
     async def get_wallet_assets(self, wallet_addr: str) -> list[Asset]:
         """
@@ -210,8 +765,10 @@ class APIClient:
             list[Asset]: A list of Asset objects representing the wallet's assets.
         """
         url = f"{self.base_url}/v1/wallets/{wallet_addr}/assets"
-        response = await self.client.get(url)
-        return [Asset(**asset) for asset in response.json()["asset_list"]]
+        return await self._request(
+            "wallet_assets", "GET", url,
+            lambda data: [_decode_asset(asset) for asset in data["asset_list"]],
+        )
 
     async def get_wallet_asset(self, wallet_addr: str, asset_addr: str) -> Asset:
         """
@@ -225,8 +782,10 @@ class APIClient:
             Asset: An Asset object representing the asset.
         """
         url = f"{self.base_url}/v1/wallets/{wallet_addr}/assets/{asset_addr}"
-        response = await self.client.get(url)
-        return Asset(**response.json()["asset"])
+        return await self._request(
+            "wallet_asset", "GET", url,
+            lambda data: _decode_asset(data["asset"]),
+        )
 
     async def get_wallet_farms(self, addr: str) -> list[Farm]:
         """
@@ -239,8 +798,10 @@ class APIClient:
             list[Farm]: A list of Farm objects representing the wallet's farms.
         """
         url = f"{self.base_url}/v1/wallets/{addr}/farms"
-        response = await self.client.get(url)
-        return [Farm.from_dict(farm) for farm in response.json()["farm_list"]]
+        return await self._request(
+            "wallet_farms", "GET", url,
+            lambda data: [_decode_farm(farm) for farm in data["farm_list"]],
+        )
 
     async def get_wallet_farm(self, wallet_addr: str, farm_addr: str) -> Farm:
         """
@@ -254,12 +815,18 @@ class APIClient:
             Farm: A Farm object representing the farm.
         """
         url = f"{self.base_url}/v1/wallets/{wallet_addr}/farms/{farm_addr}"
-        response = await self.client.get(url)
-        return Farm.from_dict(response.json()["farm"])
+        return await self._request(
+            "wallet_farm", "GET", url,
+            lambda data: _decode_farm(data["farm"]),
+        )
 
     async def get_wallet_operations(self, wallet_addr: str, since: str, until: str, op_type: str | None = None) -> list[Operation]:
         """
         Fetches the list of operations associated with a specific wallet.
+
+        Ranges longer than `operations_window` are split into windows that are
+        fetched concurrently (see `iter_wallet_operation_windows`); the results
+        are merged and deduplicated on `(pool_tx_hash, wallet_tx_lt)`.
         
         Args:
             wallet_addr (str): The wallet's address.
@@ -268,7 +835,84 @@ class APIClient:
             op_type (str, optional): The type of operations to fetch. Defaults to None.
         
         Returns:
-            list[Operation]: A list of Operation objects representing the wallet's operations.
+            list[Operation]: A list of Operation objects representing the wallet's operations,
+                ordered by wallet transaction logical time.
+        """
+        operations = {}
+        async for _, _, window_operations in self.iter_wallet_operation_windows(wallet_addr, since, until, op_type):
+            for operation in window_operations:
+                operations.setdefault((operation.operation.pool_tx_hash, operation.operation.wallet_tx_lt), operation)
+        return sorted(operations.values(), key=lambda operation: operation.operation.wallet_tx_lt)
+
+    async def iter_wallet_operation_windows(
+        self,
+        wallet_addr: str,
+        since: str | datetime,
+        until: str | datetime,
+        op_type: str | None = None,
+        window: timedelta | None = None,
+        concurrency: int = 4,
+        skip: Container[tuple[str, str]] = (),
+    ) -> AsyncIterator[tuple[str, str, list[Operation]]]:
+        """
+        Fetches a wallet's operations window by window.
+
+        The range is cut into windows of `window` length that are fetched at most
+        `concurrency` at a time. A window returning `max_window_operations` or
+        more operations is assumed to be truncated and is split in half and
+        fetched again. Windows are yielded as they complete, so a long backfill
+        can be resumed by passing the windows already stored as `skip`; the
+        windows of a range are the same on every run.
+
+        Args:
+            wallet_addr (str): The wallet's address.
+            since (str | datetime): The start of the range (ISO 8601 format; naive times are UTC).
+            until (str | datetime): The end of the range (ISO 8601 format; naive times are UTC).
+            op_type (str, optional): The type of operations to fetch. Defaults to None.
+            window (timedelta, optional): The window length. Defaults to `operations_window`.
+            concurrency (int, optional): The maximum number of windows in flight. Defaults to 4.
+            skip (Container[tuple[str, str]], optional): `(since, until)` windows not to fetch.
+
+        Yields:
+            tuple[str, str, list[Operation]]: The bounds of a window and its operations.
+        """
+        start, end = _parse_time(since), _parse_time(until)
+        window = window or self.operations_window
+        queue = deque()
+        while start < end:
+            queue.append((start, min(start + window, end)))
+            start += window
+        pending: dict[asyncio.Task, tuple[datetime, datetime]] = {}
+        try:
+            while queue or pending:
+                while queue and len(pending) < concurrency:
+                    window_since, window_until = queue.popleft()
+                    bounds = (_format_time(window_since), _format_time(window_until))
+                    if bounds in skip:
+                        continue
+                    task = asyncio.ensure_future(self._get_wallet_operations_window(wallet_addr, *bounds, op_type))
+                    pending[task] = (window_since, window_until)
+                if not pending:
+                    continue
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    window_since, window_until = pending.pop(task)
+                    operations = task.result()
+                    if len(operations) >= self.max_window_operations and window_until - window_since > MIN_OPERATIONS_WINDOW:
+                        middle = window_since + (window_until - window_since) / 2
+                        queue.appendleft((middle, window_until))
+                        queue.appendleft((window_since, middle))
+                    else:
+                        yield _format_time(window_since), _format_time(window_until), operations
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_wallet_operations_window(
+        self, wallet_addr: str, since: str, until: str, op_type: str | None = None
+    ) -> list[Operation]:
+        """
+        Fetches a wallet's operations in one request.
         """
         url = f"{self.base_url}/v1/wallets/{wallet_addr}/operations"
         params = {
@@ -276,8 +920,11 @@ class APIClient:
             "until": until,
             "op_type": op_type
         }
-        response = await self.client.get(url, params=clean_dict(params))
-        return [Operation.from_dict(operation) for operation in response.json()["operations"]]
+        return await self._request(
+            "wallet_operations", "GET", url,
+            lambda data: [_decode_operation(operation) for operation in data["operations"]],
+            params=clean_dict(params),
+        )
 
     async def get_wallet_pools(self, wallet_addr: str) -> list[Pool]:
         """
@@ -290,8 +937,10 @@ class APIClient:
             list[Pool]: A list of Pool objects representing the wallet's pools.
         """
         url = f"{self.base_url}/v1/wallets/{wallet_addr}/pools"
-        response = await self.client.get(url)
-        return [Pool.from_dict(pool) for pool in response.json()["pool_list"]]
+        return await self._request(
+            "wallet_pools", "GET", url,
+            lambda data: [_decode_pool(pool) for pool in data["pool_list"]],
+        )
 
     async def get_wallet_pool(self, wallet_addr: str, pool_addr: str) -> Pool:
         """
@@ -305,12 +954,36 @@ class APIClient:
             Pool: A Pool object representing the pool.
         """
         url = f"{self.base_url}/v1/wallets/{wallet_addr}/pools/{pool_addr}"
-        response = await self.client.get(url)
-        return Pool.from_dict(response.json()["pool"])
+        return await self._request(
+            "wallet_pool", "GET", url,
+            lambda data: _decode_pool(data["pool"]),
+        )
+
+    def get_wallet_pools_by_address(
+        self, wallet_addr: str, pool_addrs: Iterable[str], concurrency: int = 8
+    ) -> AsyncIterator[FanOutResult[str, Pool]]:
+        """
+        Fetches a wallet's view of many pools with bounded, adaptive concurrency.
+
+        Args:
+            wallet_addr (str): The wallet's address.
+            pool_addrs (Iterable[str]): The addresses of the pools.
+            concurrency (int, optional): The maximum number of requests in flight.
+                Lowered automatically while requests fail or slow down. Defaults to 8.
+
+        Yields:
+            FanOutResult[str, Pool]: One result per pool address, as soon as it
+                completes, carrying either the pool or the error of its request.
+        """
+        return fan_out(pool_addrs, lambda pool_addr: self.get_wallet_pool(wallet_addr, pool_addr), concurrency)
 
     async def get_dex_stats(self, since: str, until: str) -> DexStats:
         """
         Fetches DEX statistics for a given time period.
+
+        With a `stats_cache`, the response is stored once the whole window has
+        closed. These stats are aggregates over the window, so unlike
+        `get_operations_stats` they cannot be assembled from sub-windows.
         
         Args:
             since (str): The start date for fetching DEX statistics (ISO 8601 format).
@@ -321,12 +994,22 @@ class APIClient:
         """
         url = f"{self.base_url}/v1/stats/dex"
         params = {"since": since, "until": until}
-        response = await self.client.get(url, params=params)
-        return DexStats.from_dict(response.json()["stats"])
+        return await self._request(
+            "dex_stats", "GET", url,
+            lambda data: _decode_dex_stats(data["stats"]),
+            params=params,
+        )
 
     async def get_operations_stats(self, since: str, until: str) -> list[Operation]:
         """
         Fetches operation statistics for a given time period.
+
+        With a `stats_cache`, the range is split into the cache's aligned
+        sub-windows. Stored closed sub-windows are read from disk in one query,
+        the others are fetched (at most 4 at a time) and the closed ones stored,
+        so a long range only costs requests for its open tail and for windows
+        never seen before. Operations on sub-window boundaries are deduplicated
+        on `(pool_tx_hash, pool_tx_lt)`.
         
         Args:
             since (str): The start date for fetching operation statistics (ISO 8601 format).
@@ -336,13 +1019,33 @@ class APIClient:
             list[Operation]: A list of Operation objects representing the statistics.
         """
         url = f"{self.base_url}/v1/stats/operations"
-        params = {"since": since, "until": until}
-        response = await self.client.get(url, params=params)
-        return [Operation.from_dict(operation) for operation in response.json()["operations"]]
+        decode = lambda data: [_decode_operation(operation) for operation in data["operations"]]
+        if self.stats_cache is None:
+            return await self._request("operations_stats", "GET", url, decode, params={"since": since, "until": until})
+        windows = self.stats_cache.split(since, until)
+        stored = await asyncio.to_thread(self.stats_cache.get_many, "operations_stats", windows)
+        fetched = {}
+        fetch = lambda window: self._request(
+            "operations_stats", "GET", url, decode, params={"since": window[0], "until": window[1]}
+        )
+        async with aclosing(fan_out([window for window in windows if window not in stored], fetch, concurrency=4)) as results:
+            async for result in results:
+                if not result.ok:
+                    raise result.error
+                fetched[result.key] = result.value
+        operations = {}
+        for window in windows:
+            for operation in decode(stored[window]) if window in stored else fetched[window]:
+                operations.setdefault((operation.operation.pool_tx_hash, operation.operation.pool_tx_lt), operation)
+        return list(operations.values())
 
     async def get_pool_stats(self, since: str, until: str) -> list[PoolStats]:
         """
         Fetches pool statistics for a given time period.
+
+        With a `stats_cache`, the response is stored once the whole window has
+        closed. These stats are aggregates over the window, so unlike
+        `get_operations_stats` they cannot be assembled from sub-windows.
         
         Args:
             since (str): The start date for fetching pool statistics (ISO 8601 format).
@@ -353,11 +1056,19 @@ class APIClient:
         """
         url = f"{self.base_url}/v1/stats/pool"
         params = {"since": since, "until": until}
-        response = await self.client.get(url, params=params)
-        return [PoolStats.from_dict(stat) for stat in response.json()["stats"]]
+        return await self._request(
+            "pool_stats", "GET", url,
+            lambda data: [_decode_pool_stats(stat) for stat in data["stats"]],
+            params=params,
+        )
 
     async def close(self):
         """
-        Closes the HTTP client session.
+        Closes the HTTP client session, and the stats cache if the client opened it.
+        Background refreshes of stale values are cancelled.
         """
+        for task in self._refreshes:
+            task.cancel()
         await self.client.aclose()
+        if self._owns_stats_cache:
+            self.stats_cache.close()
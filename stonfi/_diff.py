@@ -0,0 +1,133 @@
+import hashlib
+from operator import attrgetter
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Iterable
+
+from stonfi.types import Pool
+
+
+FINGERPRINT_FIELDS = (
+    "reserve0",
+    "reserve1",
+    "lp_total_supply",
+    "lp_fee",
+    "protocol_fee",
+    "ref_fee",
+    "collected_token0_protocol_fee",
+    "collected_token1_protocol_fee",
+    "deprecated",
+)
+
+
+class PoolChange(StrEnum):
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+@dataclass(frozen=True)
+class PoolEvent:
+    """
+    A difference between two pool snapshots.
+
+    Attributes:
+        change (PoolChange): Whether the pool was added, removed or changed.
+        address (str): The pool address.
+        pool (Pool | None): The new state of the pool; None when it was removed.
+    """
+
+    change: PoolChange
+    address: str
+    pool: Pool | None = None
+
+
+class PoolDiff:
+    """
+    Detects which pools changed between consecutive `get_pools` snapshots.
+
+    Only a 64-bit fingerprint of the fields that matter (reserves, fees, LP
+    supply and deprecation by default) is kept per pool, so memory does not
+    depend on the size of the `Pool` objects and nothing of the previous
+    snapshot has to be retained. Fingerprints are stable across processes and
+    can be stored with `fingerprints` and restored via the constructor.
+
+    Attributes:
+        fields (tuple[str, ...]): The pool fields that make up the fingerprint.
+        fingerprints (dict[str, int]): The fingerprint of every known pool by address.
+    """
+
+    def __init__(self, fingerprints: dict[str, int] | None = None, fields: tuple[str, ...] = FINGERPRINT_FIELDS):
+        """
+        Args:
+            fingerprints (dict[str, int], optional): The fingerprints of a previous
+                run. Defaults to None, so the first snapshot reports every pool as added.
+            fields (tuple[str, ...], optional): The pool fields to compare. Defaults
+                to `FINGERPRINT_FIELDS`.
+        """
+        self.fields = fields
+        self._values = attrgetter(*fields)
+        self.fingerprints = dict(fingerprints or {})
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def fingerprint(self, pool: Pool) -> int:
+        """
+        Hashes the compared fields of a pool.
+
+        Args:
+            pool (Pool): The pool.
+
+        Returns:
+            int: A 64-bit fingerprint.
+        """
+        values = repr(self._values(pool)).encode()
+        return int.from_bytes(hashlib.blake2b(values, digest_size=8).digest(), "little")
+
+    def update(self, pools: Iterable[Pool]) -> list[PoolEvent]:
+        """
+        Compares a full snapshot with the previous one and remembers it.
+
+        Args:
+            pools (Iterable[Pool]): All current pools, e.g. from `APIClient.get_pools`.
+
+        Returns:
+            list[PoolEvent]: The added and changed pools in snapshot order,
+            followed by the removed ones.
+        """
+        previous = self.fingerprints
+        current: dict[str, int] = {}
+        events = []
+        for pool in pools:
+            fingerprint = current[pool.address] = self.fingerprint(pool)
+            known = previous.get(pool.address)
+            if known is None:
+                events.append(PoolEvent(PoolChange.ADDED, pool.address, pool))
+            elif known != fingerprint:
+                events.append(PoolEvent(PoolChange.CHANGED, pool.address, pool))
+        events.extend(PoolEvent(PoolChange.REMOVED, address) for address in previous if address not in current)
+        self.fingerprints = current
+        return events
+
+    def apply(self, pools: Iterable[Pool]) -> list[PoolEvent]:
+        """
+        Compares a partial list of pools, e.g. from `get_pools_by_address`,
+        with the known state and remembers it. Pools that are not listed are
+        left as they are and never reported as removed.
+
+        Args:
+            pools (Iterable[Pool]): Some current pools.
+
+        Returns:
+            list[PoolEvent]: The added and changed pools.
+        """
+        events = []
+        for pool in pools:
+            fingerprint = self.fingerprint(pool)
+            known = self.fingerprints.get(pool.address)
+            if known != fingerprint:
+                change = PoolChange.ADDED if known is None else PoolChange.CHANGED
+                events.append(PoolEvent(change, pool.address, pool))
+                self.fingerprints[pool.address] = fingerprint
+        return events
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Generic, Iterable, TypeVar
+
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+_END = object()
+
+
+@dataclass(frozen=True)
+class FanOutResult(Generic[K, T]):
+    """
+    The outcome of one item of a fan-out.
+
+    Attributes:
+        key (K): The item, e.g. the address that was looked up.
+        value (T | None): The result, if the call succeeded.
+        error (Exception | None): The exception raised by the call, if it failed.
+    """
+
+    key: K
+    value: T | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class AdaptiveLimit:
+    """
+    An AIMD concurrency limit driven by observed latency and errors.
+
+    The limit grows by about one per round of successful calls, shrinks
+    slightly when the smoothed latency exceeds `latency_tolerance` times the
+    best latency seen so far, and halves on every error.
+
+    Attributes:
+        value (float): The current limit.
+        minimum (int): The lowest limit.
+        maximum (int): The highest limit.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, latency_tolerance: float = 2.0):
+        self.value = float(maximum)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_tolerance = latency_tolerance
+        self._latency: float | None = None
+        self._best_latency: float | None = None
+
+    def __int__(self) -> int:
+        return max(self.minimum, int(self.value))
+
+    def on_success(self, latency: float) -> None:
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        if self._best_latency is None or self._latency < self._best_latency:
+            self._best_latency = self._latency
+        if self._latency > self._best_latency * self.latency_tolerance:
+            self.value = max(self.minimum, self.value * 0.9)
+        else:
+            self.value = min(self.maximum, self.value + 1 / self.value)
+
+    def on_error(self) -> None:
+        self.value = max(self.minimum, self.value / 2)
+
+
+async def fan_out(
+    keys: Iterable[K],
+    fetch: Callable[[K], Awaitable[T]],
+    concurrency: int = 8,
+    adaptive: bool = True,
+) -> AsyncIterator[FanOutResult[K, T]]:
+    """
+    Calls `fetch` for every key with bounded concurrency and yields the results
+    as they complete.
+
+    Failures do not stop the fan-out; they are reported on their item.
+
+    Args:
+        keys (Iterable[K]): The items to fetch.
+        fetch (Callable[[K], Awaitable[T]]): Fetches one item.
+        concurrency (int, optional): The maximum number of calls in flight. Defaults to 8.
+        adaptive (bool, optional): Lower the number of calls in flight while errors
+            occur or latency rises, and raise it back up to `concurrency` as calls
+            recover. Defaults to True.
+
+    Yields:
+        FanOutResult[K, T]: One result per key, in completion order.
+    """
+    limit = AdaptiveLimit(concurrency) if adaptive else None
+    keys = iter(keys)
+    pending: set[asyncio.Task] = set()
+
+    async def call(key: K) -> FanOutResult[K, T]:
+        start = time.monotonic()
+        try:
+            value = await fetch(key)
+        except Exception as error:
+            if limit is not None:
+                limit.on_error()
+            return FanOutResult(key, error=error)
+        if limit is not None:
+            limit.on_success(time.monotonic() - start)
+        return FanOutResult(key, value)
+
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < (int(limit) if limit is not None else concurrency):
+                key = next(keys, _END)
+                if key is _END:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.ensure_future(call(key)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
@@ -0,0 +1,364 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import pairwise
+from pathlib import Path
+from typing import Iterable
+
+from stonfi.types import Pool
+
+
+RAW = 0
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+
+RESOLUTIONS = (RAW, MINUTE, HOUR, DAY)
+
+DEFAULT_RETENTION: dict[int, timedelta | None] = {
+    RAW: timedelta(days=7),
+    MINUTE: timedelta(days=90),
+    HOUR: timedelta(days=730),
+    DAY: None,
+}
+
+_KEYFRAME = 0
+_DELTA = 1
+
+
+@dataclass(frozen=True, slots=True)
+class PoolSnapshot:
+    """
+    The state of a pool at one point in time.
+
+    Attributes:
+        ts (int): Unix time in seconds; the start of the bucket for rollups.
+        reserve0, reserve1 (int): The reserves in base units.
+        lp_total_supply (int): The LP token supply in base units.
+        lp_fee, protocol_fee, ref_fee (int): The fees in basis points (0 when unset).
+    """
+
+    ts: int
+    reserve0: int
+    reserve1: int
+    lp_total_supply: int
+    lp_fee: int
+    protocol_fee: int
+    ref_fee: int
+
+
+def _values(pool: Pool) -> tuple[int, ...]:
+    return (
+        pool.reserve0_units,
+        pool.reserve1_units,
+        pool.lp_total_supply_units,
+        pool.lp_fee_bps,
+        pool.protocol_fee_bps,
+        pool.ref_fee_bps or 0,
+    )
+
+
+def _encode(kind: int, values: Iterable[int]) -> bytes:
+    out = bytearray((kind,))
+    for value in values:
+        value = value << 1 if value >= 0 else (-value << 1) - 1
+        while value >= 0x80:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def _decode(payload: bytes) -> tuple[int, list[int]]:
+    values = []
+    value = shift = 0
+    for byte in payload[1:]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(value >> 1 if not value & 1 else -((value + 1) >> 1))
+        value = shift = 0
+    return payload[0], values
+
+
+def _timestamp(ts: int | float | datetime | None) -> int:
+    if ts is None:
+        return int(time.time())
+    if isinstance(ts, datetime):
+        return int(ts.timestamp())
+    return int(ts)
+
+
+class PoolHistory:
+    """
+    A compact on-disk time series of pool reserves, LP supply and fees.
+
+    `record` writes one row per pool whose values changed since its previous
+    row. Raw rows hold zigzag varint deltas to the previous row, with a full
+    keyframe every `keyframe_interval` rows of a pool, so a typical row takes
+    a few dozen bytes. Rows live in a SQLite WITHOUT ROWID table clustered on
+    (pool, resolution, time), so a range query of one pool reads a contiguous
+    stretch of the B-tree no matter how many points the store holds.
+
+    `compact` enforces `retention`: rows older than the retention of their
+    resolution are downsampled into the next coarser one (raw to 1m, 1m to
+    1h, 1h to 1d; a bucket keeps its last state) and deleted.
+
+    Attributes:
+        path (str): The SQLite database file.
+        retention (dict[int, timedelta | None]): How long rows of each resolution
+            are kept before they are rolled up; None keeps them forever.
+        keyframe_interval (int): The maximum number of raw rows per keyframe.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = "history.db",
+        retention: dict[int, timedelta | None] | None = None,
+        keyframe_interval: int = 64,
+    ):
+        """
+        Opens (and creates, if needed) the store.
+
+        Args:
+            path (str | Path, optional): The SQLite database file. Defaults to "history.db".
+            retention (dict[int, timedelta | None], optional): Overrides merged over
+                `DEFAULT_RETENTION` (7 days raw, 90 days 1m, 2 years 1h, 1d forever).
+            keyframe_interval (int, optional): The maximum number of raw rows per
+                keyframe. Defaults to 64.
+        """
+        self.path = str(path)
+        self.retention = {**DEFAULT_RETENTION, **(retention or {})}
+        self.keyframe_interval = keyframe_interval
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(
+            "PRAGMA journal_mode = WAL;"
+            "PRAGMA synchronous = NORMAL;"
+            "CREATE TABLE IF NOT EXISTS history_pools ("
+            " id INTEGER PRIMARY KEY, address TEXT NOT NULL UNIQUE);"
+            "CREATE TABLE IF NOT EXISTS history_points ("
+            " pool_id INTEGER NOT NULL, resolution INTEGER NOT NULL, ts INTEGER NOT NULL, payload BLOB NOT NULL,"
+            " PRIMARY KEY (pool_id, resolution, ts)) WITHOUT ROWID;"
+        )
+        self._ids: dict[str, int] = dict(self._db.execute("SELECT address, id FROM history_pools"))
+        # Per pool id: the time and values of the latest raw row and the number of rows since its keyframe.
+        self._last: dict[int, tuple[int, list[int], int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _pool_id(self, address: str) -> int:
+        pool_id = self._ids.get(address)
+        if pool_id is None:
+            pool_id = self._db.execute("INSERT INTO history_pools (address) VALUES (?)", (address,)).lastrowid
+            self._ids[address] = pool_id
+        return pool_id
+
+    def _load_last(self, pool_id: int) -> tuple[int, list[int], int] | None:
+        rows = self._db.execute(
+            "SELECT ts, payload FROM history_points WHERE pool_id = ? AND resolution = 0 ORDER BY ts DESC LIMIT ?",
+            (pool_id, self.keyframe_interval),
+        ).fetchall()
+        if not rows:
+            return None
+        for start, (_, payload) in enumerate(rows):
+            if payload[0] == _KEYFRAME:
+                break
+        points = self._replay(reversed(rows[: start + 1]))
+        ts, values = points[-1]
+        return ts, values, start
+
+    @staticmethod
+    def _replay(rows: Iterable[tuple[int, bytes]]) -> list[tuple[int, list[int]]]:
+        points = []
+        values: list[int] = []
+        for ts, payload in rows:
+            kind, decoded = _decode(payload)
+            if kind == _KEYFRAME:
+                values = decoded
+            else:
+                values = [value + delta for value, delta in zip(values, decoded)]
+            points.append((ts, values))
+        return points
+
+    def record(self, pools: Iterable[Pool], ts: int | float | datetime | None = None) -> int:
+        """
+        Stores the current state of the pools that changed.
+
+        Args:
+            pools (Iterable[Pool]): The pools, e.g. a full `get_pools` snapshot or
+                the changed pools reported by `PoolDiff`.
+            ts (int | float | datetime, optional): The time of the snapshot.
+                Defaults to now.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            ValueError: If `ts` is not after the previous row of a pool.
+        """
+        ts = _timestamp(ts)
+        rows = []
+        states: dict[int, tuple[int, list[int], int]] = {}
+        try:
+            with self._db:
+                for pool in pools:
+                    values = list(_values(pool))
+                    pool_id = self._pool_id(pool.address)
+                    last = states.get(pool_id) or self._last.get(pool_id) or self._load_last(pool_id)
+                    if last is not None:
+                        if values == last[1]:
+                            continue
+                        if ts <= last[0]:
+                            raise ValueError(f"snapshot at {ts} is not after the last one of {pool.address} at {last[0]}")
+                    if last is None or last[2] + 1 >= self.keyframe_interval:
+                        payload, since_keyframe = _encode(_KEYFRAME, values), 0
+                    else:
+                        payload = _encode(_DELTA, (value - previous for value, previous in zip(values, last[1])))
+                        since_keyframe = last[2] + 1
+                    rows.append((pool_id, ts, payload))
+                    states[pool_id] = (ts, values, since_keyframe)
+                self._db.executemany("INSERT INTO history_points VALUES (?, 0, ?, ?)", rows)
+        except BaseException:
+            # Pools registered in the rolled back transaction got no ids after all.
+            self._ids = dict(self._db.execute("SELECT address, id FROM history_pools"))
+            raise
+        self._last.update(states)
+        return len(rows)
+
+    def _raw(self, pool_id: int, since: int, until: int) -> list[tuple[int, list[int]]]:
+        head = self._db.execute(
+            "SELECT ts, payload FROM history_points WHERE pool_id = ? AND resolution = 0 AND ts < ?"
+            " ORDER BY ts DESC LIMIT ?",
+            (pool_id, since, self.keyframe_interval),
+        ).fetchall()
+        for start, (_, payload) in enumerate(head):
+            if payload[0] == _KEYFRAME:
+                head = head[: start + 1]
+                break
+        else:
+            head = []
+        tail = self._db.execute(
+            "SELECT ts, payload FROM history_points WHERE pool_id = ? AND resolution = 0 AND ts >= ? AND ts <= ?"
+            " ORDER BY ts",
+            (pool_id, since, until),
+        ).fetchall()
+        return [point for point in self._replay([*reversed(head), *tail]) if point[0] >= since]
+
+    def history(
+        self,
+        address: str,
+        since: int | float | datetime,
+        until: int | float | datetime | None = None,
+        resolution: int = RAW,
+    ) -> list[PoolSnapshot]:
+        """
+        Returns the recorded states of a pool within a time range.
+
+        With a coarser `resolution`, the rolled-up rows are combined with the
+        finer rows that have not been rolled up yet, downsampled on the fly.
+
+        Args:
+            address (str): The pool address.
+            since (int | float | datetime): The start of the range (Unix time or datetime).
+            until (int | float | datetime, optional): The end of the range. Defaults to now.
+            resolution (int, optional): RAW, MINUTE, HOUR or DAY. Defaults to RAW.
+
+        Returns:
+            list[PoolSnapshot]: The states in time order.
+        """
+        pool_id = self._ids.get(address)
+        if pool_id is None:
+            return []
+        since, until = _timestamp(since), _timestamp(until)
+        start = since - since % resolution if resolution else since
+        points: dict[int, list[int]] = {}
+        # Coarser levels hold older data, so finer ones are merged last and win shared buckets.
+        for level in reversed(RESOLUTIONS):
+            if level > resolution:
+                continue
+            if level == RAW:
+                rows = self._raw(pool_id, start, until)
+            else:
+                rows = self._replay(self._db.execute(
+                    "SELECT ts, payload FROM history_points WHERE pool_id = ? AND resolution = ? AND ts >= ? AND ts <= ?"
+                    " ORDER BY ts",
+                    (pool_id, level, start - start % level, until),
+                ))
+            for ts, values in rows:
+                points[ts - ts % resolution if resolution else ts] = values
+        return [PoolSnapshot(ts, *values) for ts, values in sorted(points.items())]
+
+    def compact(self, now: int | float | datetime | None = None) -> dict[int, int]:
+        """
+        Rolls rows past their retention up into the next coarser resolution and deletes them.
+
+        The latest raw row of every pool is always kept, since new rows are
+        encoded relative to it.
+
+        Args:
+            now (int | float | datetime, optional): The reference time. Defaults to now.
+
+        Returns:
+            dict[int, int]: The number of rows deleted per resolution.
+        """
+        now = _timestamp(now)
+        deleted = {}
+        with self._db:
+            for finer, coarser in pairwise(RESOLUTIONS):
+                keep = self.retention[finer]
+                if keep is None:
+                    continue
+                cutoff = now - int(keep.total_seconds())
+                deleted[finer] = sum(self._compact_pool(pool_id, finer, coarser, cutoff) for pool_id in self._ids.values())
+        return deleted
+
+    def _compact_pool(self, pool_id: int, finer: int, coarser: int, cutoff: int) -> int:
+        old = self._db.execute(
+            "SELECT ts, payload FROM history_points WHERE pool_id = ? AND resolution = ? AND ts < ? ORDER BY ts",
+            (pool_id, finer, cutoff),
+        ).fetchall()
+        if not old:
+            return 0
+        rebase = None
+        if finer == RAW:
+            following = self._db.execute(
+                "SELECT ts, payload FROM history_points WHERE pool_id = ? AND resolution = 0 AND ts >= ? ORDER BY ts LIMIT 1",
+                (pool_id, cutoff),
+            ).fetchone()
+            points = self._replay(old + [following] if following else old)
+            # The first surviving raw row becomes a keyframe; without one the latest old row survives.
+            rebase = points[-1]
+            if following is None:
+                old.pop()
+            points = points[: len(old)] if following else points
+        else:
+            points = self._replay(old)
+        rollup = {}
+        for ts, values in points:
+            rollup[ts - ts % coarser] = values
+        self._db.executemany(
+            "INSERT OR REPLACE INTO history_points VALUES (?, ?, ?, ?)",
+            [(pool_id, coarser, bucket, _encode(_KEYFRAME, values)) for bucket, values in rollup.items()],
+        )
+        self._db.executemany(
+            "DELETE FROM history_points WHERE pool_id = ? AND resolution = ? AND ts = ?",
+            [(pool_id, finer, ts) for ts, _ in old],
+        )
+        if rebase is not None:
+            self._db.execute(
+                "UPDATE history_points SET payload = ? WHERE pool_id = ? AND resolution = 0 AND ts = ?",
+                (_encode(_KEYFRAME, rebase[1]), pool_id, rebase[0]),
+            )
+            last = self._last.get(pool_id)
+            if last is not None and last[0] == rebase[0]:
+                self._last[pool_id] = (last[0], last[1], 0)
+        return len(old)
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self._db.close()
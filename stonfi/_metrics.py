@@ -0,0 +1,178 @@
+import bisect
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """
+    The measurements of one API round trip.
+
+    Attributes:
+        endpoint (str): The endpoint name.
+        method (str): The HTTP method.
+        url (str): The request URL.
+        status (int | None): The final HTTP status, or None if no response was received.
+        latency (float): Seconds from sending the request until its body was received.
+        bytes (int): The number of body bytes received over the network.
+        parse_time (float): Seconds spent parsing the JSON body.
+        decode_time (float): Seconds spent turning the parsed JSON into typed objects.
+        error (Exception | None): The exception raised by the request, if it failed.
+    """
+
+    endpoint: str
+    method: str
+    url: str
+    status: int | None
+    latency: float = 0.0
+    bytes: int = 0
+    parse_time: float = 0.0
+    decode_time: float = 0.0
+    error: Exception | None = None
+
+
+class _EndpointMetrics:
+    __slots__ = ("count", "errors", "status", "latency", "latency_sum", "latency_max", "bytes", "parse_time", "decode_time")
+
+    def __init__(self, buckets: int):
+        self.count = 0
+        self.errors = 0
+        self.status: Counter[int | None] = Counter()
+        self.latency = [0] * (buckets + 1)
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.bytes = 0
+        self.parse_time = 0.0
+        self.decode_time = 0.0
+
+
+class Metrics:
+    """
+    Per-endpoint request counters, latency histograms and timings.
+
+    `APIClient` records a `RequestEvent` for every round trip (not for cache
+    hits) and passes it to the registered hooks, e.g. to export it elsewhere.
+    Streamed responses report their whole transfer time as latency and no
+    parse or decode time, since items are decoded while they arrive.
+
+    Attributes:
+        buckets (tuple[float, ...]): Upper bounds of the latency histogram buckets in seconds.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Initializes empty metrics.
+
+        Args:
+            buckets (tuple[float, ...], optional): Ascending latency bucket bounds in
+                seconds; a final +Inf bucket is implied. Defaults to `LATENCY_BUCKETS`.
+        """
+        self.buckets = tuple(buckets)
+        self._endpoints: dict[str, _EndpointMetrics] = {}
+        self._hooks: list[Callable[[RequestEvent], None]] = []
+
+    def add_hook(self, hook: Callable[[RequestEvent], None]) -> Callable[[RequestEvent], None]:
+        """
+        Registers a callback that receives every recorded event.
+
+        Hooks run synchronously on the event loop and should return quickly.
+        Can be used as a decorator.
+
+        Args:
+            hook (Callable[[RequestEvent], None]): The callback.
+
+        Returns:
+            Callable[[RequestEvent], None]: The callback.
+        """
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        """
+        Unregisters a callback added with `add_hook`.
+
+        Args:
+            hook (Callable[[RequestEvent], None]): The callback.
+        """
+        self._hooks.remove(hook)
+
+    def record(self, event: RequestEvent) -> None:
+        """
+        Adds an event to the counters of its endpoint and passes it to the hooks.
+
+        Args:
+            event (RequestEvent): The measurements of a round trip.
+        """
+        metrics = self._endpoints.get(event.endpoint)
+        if metrics is None:
+            metrics = self._endpoints[event.endpoint] = _EndpointMetrics(len(self.buckets))
+        metrics.count += 1
+        if event.error is not None:
+            metrics.errors += 1
+        metrics.status[event.status] += 1
+        if event.status is not None:
+            metrics.latency[bisect.bisect_left(self.buckets, event.latency)] += 1
+            metrics.latency_sum += event.latency
+            metrics.latency_max = max(metrics.latency_max, event.latency)
+        metrics.bytes += event.bytes
+        metrics.parse_time += event.parse_time
+        metrics.decode_time += event.decode_time
+        for hook in self._hooks:
+            hook(event)
+
+    def _quantile(self, counts: list[int], q: float) -> float | None:
+        total = sum(counts)
+        if total == 0:
+            return None
+        rank = q * total
+        seen = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Returns the current counters.
+
+        Latency quantiles are estimated as the upper bound of the histogram
+        bucket they fall into.
+
+        Returns:
+            dict[str, dict]: Per endpoint, the number of requests and errors, the
+            requests per status (None for requests without a response), the
+            latency histogram and summary, the bytes received and the total
+            parse and decode time in seconds.
+        """
+        snapshot = {}
+        for endpoint, metrics in self._endpoints.items():
+            timed = sum(metrics.latency)
+            snapshot[endpoint] = {
+                "count": metrics.count,
+                "errors": metrics.errors,
+                "status": dict(metrics.status),
+                "latency": {
+                    "buckets": dict(zip((*self.buckets, float("inf")), metrics.latency)),
+                    "sum": metrics.latency_sum,
+                    "max": metrics.latency_max,
+                    "mean": metrics.latency_sum / timed if timed else None,
+                    "p50": self._quantile(metrics.latency, 0.5),
+                    "p95": self._quantile(metrics.latency, 0.95),
+                    "p99": self._quantile(metrics.latency, 0.99),
+                },
+                "bytes": metrics.bytes,
+                "parse_time": metrics.parse_time,
+                "decode_time": metrics.decode_time,
+            }
+        return snapshot
+
+    def reset(self) -> None:
+        """
+        Clears all counters. Hooks stay registered.
+        """
+        self._endpoints.clear()
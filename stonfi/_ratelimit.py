@@ -0,0 +1,197 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+
+RETRY_STATUSES = frozenset({429, 503})
+
+DEFAULT_LIMITS: dict[str, tuple[float, int]] = {
+    "default": (10.0, 20),
+    "stats": (2.0, 4),
+    "simulate": (5.0, 10),
+}
+
+DEFAULT_GROUPS: dict[str, str] = {
+    "dex_stats": "stats",
+    "operations_stats": "stats",
+    "pool_stats": "stats",
+    "swap_simulate": "simulate",
+    "reverse_swap_simulate": "simulate",
+}
+
+
+class TokenBucket:
+    """
+    A token bucket that allows `rate` acquisitions per second on average and
+    bursts of up to `burst` acquisitions.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        burst (int): The capacity of the bucket.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """
+        Takes one token, sleeping until one is available.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now > self._updated:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                delay = self._paused_until - now
+                if delay <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops handing out tokens for the given number of seconds.
+
+        Args:
+            seconds (float): The length of the pause.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+
+class RateLimiter:
+    """
+    Client-side rate limiting and 429/503 backoff for groups of endpoints.
+
+    Each group has its own token bucket; endpoints that are not mapped to a
+    group share the "default" one.
+
+    Attributes:
+        limits (dict[str, tuple[float, int]]): Sustained rate per second and burst size per group.
+        groups (dict[str, str]): The group of each endpoint name.
+        max_retries (int): How often a throttled request is retried.
+        backoff_base (float): The first backoff delay in seconds, doubled on every retry.
+        backoff_max (float): The upper bound of a single backoff delay in seconds.
+        waited (dict[str, float]): Seconds spent waiting for tokens or backing off per group.
+        throttled (dict[str, int]): The number of 429/503 responses per group.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[float, int]] | None = None,
+        groups: dict[str, str] | None = None,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        """
+        Initializes the limiter.
+
+        Args:
+            limits (dict[str, tuple[float, int]], optional): Overrides merged over `DEFAULT_LIMITS`.
+            groups (dict[str, str], optional): Overrides merged over `DEFAULT_GROUPS`.
+            max_retries (int, optional): Retries of throttled requests. Defaults to 5.
+            backoff_base (float, optional): The first backoff delay. Defaults to 0.5.
+            backoff_max (float, optional): The longest backoff delay. Defaults to 30.
+        """
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.groups = {**DEFAULT_GROUPS, **(groups or {})}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.waited: dict[str, float] = {}
+        self.throttled: dict[str, int] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _bucket(self, endpoint: str) -> tuple[str, TokenBucket]:
+        group = self.groups.get(endpoint, "default")
+        if group not in self.limits:
+            group = "default"
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            bucket = self._buckets[group] = TokenBucket(*self.limits[group])
+        return group, bucket
+
+    async def acquire(self, endpoint: str) -> None:
+        """
+        Waits until a request to the endpoint may be sent.
+
+        Args:
+            endpoint (str): The endpoint name.
+        """
+        group, bucket = self._bucket(endpoint)
+        waited = await bucket.acquire()
+        if waited:
+            self.waited[group] = self.waited.get(group, 0.0) + waited
+
+    async def backoff(self, endpoint: str, attempt: int, retry_after: str | None = None) -> None:
+        """
+        Sleeps before retrying a throttled request and pauses the endpoint's group.
+
+        The delay is the server's `Retry-After` when present, otherwise a jittered
+        exponential backoff.
+
+        Args:
+            endpoint (str): The endpoint name.
+            attempt (int): The zero-based number of the retry.
+            retry_after (str, optional): The `Retry-After` header of the response.
+        """
+        group, bucket = self._bucket(endpoint)
+        self.throttled[group] = self.throttled.get(group, 0) + 1
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        else:
+            delay = min(delay, self.backoff_max) + random.uniform(0, self.backoff_base)
+        bucket.pause(delay)
+        await asyncio.sleep(delay)
+        self.waited[group] = self.waited.get(group, 0.0) + delay
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Returns the waiting time and throttled response count of every group.
+
+        Returns:
+            dict[str, dict[str, float]]: The counters keyed by group.
+        """
+        return {
+            group: {"waited": self.waited.get(group, 0.0), "throttled": self.throttled.get(group, 0)}
+            for group in self.limits
+        }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a `Retry-After` header given either in seconds or as an HTTP date.
+
+    Args:
+        value (str, optional): The header value.
+
+    Returns:
+        float | None: The delay in seconds, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,219 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable
+
+from stonfi._simulate import amount_out
+from stonfi.types import Pool
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    A swap path found by `Router.best_route`.
+
+    Attributes:
+        tokens (tuple[str, ...]): The tokens along the path, from the offered to the asked one.
+        pools (tuple[Pool, ...]): The pool of every hop.
+        amounts (tuple[int, ...]): The amount held before the first and after every hop, in base units.
+    """
+
+    tokens: tuple[str, ...]
+    pools: tuple[Pool, ...]
+    amounts: tuple[int, ...]
+
+    @property
+    def offer_units(self) -> int:
+        return self.amounts[0]
+
+    @property
+    def ask_units(self) -> int:
+        return self.amounts[-1]
+
+
+class Router:
+    """
+    Finds the best multi-hop swap over an index of pools by token.
+
+    The index is updated in place with `update` and `remove`, e.g. with the
+    pools a refresh reported as changed, so routing never rescans the whole
+    pool list. Quotes use the local swap math of `simulate_swap`, so they are
+    only as current as the indexed pools. Deprecated and empty pools are not
+    routed through.
+    """
+
+    def __init__(self, pools: Iterable[Pool] = ()):
+        """
+        Builds the index.
+
+        Args:
+            pools (Iterable[Pool], optional): The pools to route through, e.g. from
+                `APIClient.get_pools`. Defaults to none.
+        """
+        self._pools: dict[str, Pool] = {}
+        self._by_token: dict[str, dict[str, Pool]] = {}
+        self._by_pair: dict[tuple[str, str], dict[str, Pool]] = {}
+        self._neighbors: dict[str, Counter[str]] = {}
+        self.update(pools)
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._pools
+
+    @staticmethod
+    def _pair(token_a: str, token_b: str) -> tuple[str, str]:
+        return (token_a, token_b) if token_a <= token_b else (token_b, token_a)
+
+    def update(self, pools: Iterable[Pool]) -> None:
+        """
+        Adds pools to the index or replaces the indexed pools with the same address.
+
+        Args:
+            pools (Iterable[Pool]): New or changed pools.
+        """
+        for pool in pools:
+            self._discard(pool.address)
+            if pool.deprecated or not pool.reserve0_units or not pool.reserve1_units:
+                continue
+            token0, token1 = pool.token0_address, pool.token1_address
+            self._pools[pool.address] = pool
+            self._by_token.setdefault(token0, {})[pool.address] = pool
+            self._by_token.setdefault(token1, {})[pool.address] = pool
+            self._by_pair.setdefault(self._pair(token0, token1), {})[pool.address] = pool
+            self._neighbors.setdefault(token0, Counter())[token1] += 1
+            self._neighbors.setdefault(token1, Counter())[token0] += 1
+
+    def remove(self, addresses: Iterable[str]) -> None:
+        """
+        Removes pools from the index.
+
+        Args:
+            addresses (Iterable[str]): The addresses of the pools; unknown ones are ignored.
+        """
+        for address in addresses:
+            self._discard(address)
+
+    def _discard(self, address: str) -> None:
+        pool = self._pools.pop(address, None)
+        if pool is None:
+            return
+        token0, token1 = pool.token0_address, pool.token1_address
+        pair = self._pair(token0, token1)
+        for index, key in ((self._by_token, token0), (self._by_token, token1), (self._by_pair, pair)):
+            pools = index[key]
+            pools.pop(address, None)
+            if not pools:
+                del index[key]
+        for token, other in ((token0, token1), (token1, token0)):
+            neighbors = self._neighbors[token]
+            neighbors[other] -= 1
+            if neighbors[other] <= 0:
+                del neighbors[other]
+            if not neighbors:
+                del self._neighbors[token]
+
+    def pools_of(self, token: str) -> list[Pool]:
+        """
+        Returns the indexed pools that trade a token.
+
+        Args:
+            token (str): The token address.
+
+        Returns:
+            list[Pool]: The pools with the token on either side.
+        """
+        return list(self._by_token.get(token, {}).values())
+
+    def best_route(
+        self,
+        offer_address: str,
+        ask_address: str,
+        units: int,
+        max_hops: int = 3,
+        referral: bool = False,
+    ) -> Route | None:
+        """
+        Finds the route that yields the most of the asked token.
+
+        Layer `k` of the search holds, for every token, the largest amount that
+        can be held after `k` hops, and only tokens whose amount improved are
+        expanded into the next layer. Since a swap's output grows with its
+        input this finds the best route of up to `max_hops` hops. The last hop
+        only looks at pools of the asked token, and the hop before it only at
+        tokens that trade against it.
+
+        Args:
+            offer_address (str): The offered token.
+            ask_address (str): The asked token.
+            units (int): The offered amount in base units.
+            max_hops (int, optional): The longest route considered. Defaults to 3.
+            referral (bool, optional): Charge the pools' referral fees. Defaults to False.
+
+        Returns:
+            Route | None: The best route, or None if the tokens are not connected
+            within `max_hops` hops.
+        """
+        best = {offer_address: units}
+        frontier = {offer_address: units}
+        layers: list[dict[str, tuple[Pool, str]]] = []
+        ask_neighbors = self._neighbors.get(ask_address, {})
+        for hop in range(max_hops):
+            remaining = max_hops - hop - 1
+            reached: dict[str, int] = {}
+            came: dict[str, tuple[Pool, str]] = {}
+            for token, amount in frontier.items():
+                if token == ask_address:
+                    continue
+                if remaining == 0:
+                    pools = self._by_pair.get(self._pair(token, ask_address), {}).values()
+                else:
+                    pools = self._by_token.get(token, {}).values()
+                for pool in pools:
+                    if pool.token0_address == token:
+                        other, reserve_in, reserve_out = pool.token1_address, pool.reserve0_units, pool.reserve1_units
+                    else:
+                        other, reserve_in, reserve_out = pool.token0_address, pool.reserve1_units, pool.reserve0_units
+                    if other == offer_address or (remaining == 1 and other != ask_address and other not in ask_neighbors):
+                        continue
+                    ref_fee = (pool.ref_fee_bps or 0) if referral else 0
+                    out = amount_out(amount, reserve_in, reserve_out, pool.lp_fee_bps, pool.protocol_fee_bps, ref_fee)[0]
+                    if out > reached.get(other, 0) and out > best.get(other, 0):
+                        reached[other] = out
+                        came[other] = (pool, token)
+            if not reached:
+                break
+            best.update(reached)
+            layers.append(came)
+            frontier = reached
+        # Only improvements are recorded, so the last layer reaching the asked token holds its best amount.
+        for depth in range(len(layers), 0, -1):
+            if ask_address in layers[depth - 1]:
+                return self._trace(layers, depth, ask_address, units, referral)
+        return None
+
+    def _trace(
+        self,
+        layers: list[dict[str, tuple[Pool, str]]],
+        depth: int,
+        ask_address: str,
+        units: int,
+        referral: bool,
+    ) -> Route:
+        tokens = [ask_address]
+        pools = []
+        for layer in reversed(layers[:depth]):
+            pool, previous = layer[tokens[-1]]
+            pools.append(pool)
+            tokens.append(previous)
+        tokens.reverse()
+        pools.reverse()
+        amounts = [units]
+        for token, pool in zip(tokens, pools):
+            if pool.token0_address == token:
+                reserve_in, reserve_out = pool.reserve0_units, pool.reserve1_units
+            else:
+                reserve_in, reserve_out = pool.reserve1_units, pool.reserve0_units
+            ref_fee = (pool.ref_fee_bps or 0) if referral else 0
+            amounts.append(amount_out(amounts[-1], reserve_in, reserve_out, pool.lp_fee_bps, pool.protocol_fee_bps, ref_fee)[0])
+        return Route(tuple(tokens), tuple(pools), tuple(amounts))
@@ -0,0 +1,162 @@
+from decimal import Decimal
+
+from stonfi.types import Pool, SwapResponse, SwapSimulateData
+
+
+FEE_DIVIDER = 10000
+
+
+def amount_out(
+    amount_in: int,
+    reserve_in: int,
+    reserve_out: int,
+    lp_fee: int,
+    protocol_fee: int,
+    ref_fee: int = 0,
+) -> tuple[int, int, int]:
+    """
+    Computes the output of a swap on a constant-product pool.
+
+    The LP fee stays in the pool; the protocol and referral fees are taken
+    from the output and rounded up, as the STON.fi v1 router does.
+
+    Args:
+        amount_in (int): The offered amount in base units.
+        reserve_in (int): The pool's reserve of the offered token.
+        reserve_out (int): The pool's reserve of the asked token.
+        lp_fee (int): The LP fee in basis points.
+        protocol_fee (int): The protocol fee in basis points.
+        ref_fee (int, optional): The referral fee in basis points. Defaults to 0.
+
+    Returns:
+        tuple[int, int, int]: The amount received, the protocol fee and the referral fee.
+    """
+    amount_in_with_fee = amount_in * (FEE_DIVIDER - lp_fee)
+    base_out = amount_in_with_fee * reserve_out // (reserve_in * FEE_DIVIDER + amount_in_with_fee)
+    protocol_fee_out = -(-base_out * protocol_fee // FEE_DIVIDER)
+    ref_fee_out = -(-base_out * ref_fee // FEE_DIVIDER)
+    return base_out - protocol_fee_out - ref_fee_out, protocol_fee_out, ref_fee_out
+
+
+def amount_in(
+    amount_out: int,
+    reserve_in: int,
+    reserve_out: int,
+    lp_fee: int,
+    protocol_fee: int,
+    ref_fee: int = 0,
+) -> int:
+    """
+    Computes the smallest offer that yields at least `amount_out` after fees.
+
+    Args:
+        amount_out (int): The wanted amount in base units.
+        reserve_in (int): The pool's reserve of the offered token.
+        reserve_out (int): The pool's reserve of the asked token.
+        lp_fee (int): The LP fee in basis points.
+        protocol_fee (int): The protocol fee in basis points.
+        ref_fee (int, optional): The referral fee in basis points. Defaults to 0.
+
+    Returns:
+        int: The amount to offer in base units.
+
+    Raises:
+        ValueError: If the pool does not hold enough of the asked token.
+    """
+    base_out = -(-amount_out * FEE_DIVIDER // (FEE_DIVIDER - protocol_fee - ref_fee))
+    if base_out >= reserve_out:
+        raise ValueError("not enough liquidity")
+    return -(-reserve_in * base_out * FEE_DIVIDER // ((reserve_out - base_out) * (FEE_DIVIDER - lp_fee)))
+
+
+def _reserves(pool: Pool, simulate_data: SwapSimulateData) -> tuple[int, int]:
+    tokens = (pool.token0_address, pool.token1_address)
+    if tokens == (simulate_data.offer_address, simulate_data.ask_address):
+        return pool.reserve0_units, pool.reserve1_units
+    if tokens == (simulate_data.ask_address, simulate_data.offer_address):
+        return pool.reserve1_units, pool.reserve0_units
+    raise ValueError(f"pool {pool.address} does not trade {simulate_data.offer_address} for {simulate_data.ask_address}")
+
+
+def _response(
+    pool: Pool,
+    simulate_data: SwapSimulateData,
+    offer_units: int,
+    reserve_in: int,
+    reserve_out: int,
+) -> SwapResponse:
+    ref_fee = (pool.ref_fee_bps or 0) if simulate_data.referral_address else 0
+    ask_units, protocol_fee, ref_fee_out = amount_out(
+        offer_units, reserve_in, reserve_out, pool.lp_fee_bps, pool.protocol_fee_bps, ref_fee
+    )
+    # Exact integer arithmetic: amounts can exceed the precision of a Decimal context.
+    numerator, denominator = Decimal(simulate_data.slippage_tolerance).as_integer_ratio()
+    min_ask_units = ask_units * (denominator - numerator) // denominator
+    spot = reserve_out / reserve_in if reserve_in else 0.0
+    rate = ask_units / offer_units if offer_units else 0.0
+    return SwapResponse(
+        ask_address=simulate_data.ask_address,
+        ask_jetton_wallet="",
+        ask_units=str(ask_units),
+        fee_address=pool.protocol_fee_address,
+        fee_percent=str((pool.lp_fee_bps + pool.protocol_fee_bps) / FEE_DIVIDER),
+        fee_units=str(protocol_fee + ref_fee_out),
+        min_ask_units=str(min_ask_units),
+        offer_address=simulate_data.offer_address,
+        offer_jetton_wallet="",
+        offer_units=str(offer_units),
+        pool_address=pool.address,
+        price_impact=str(max(0.0, (spot - rate) / spot) if spot else 0.0),
+        router_address=pool.router_address,
+        slippage_tolerance=simulate_data.slippage_tolerance,
+        swap_rate=str(rate),
+    )
+
+
+def simulate_swap(pool: Pool, simulate_data: SwapSimulateData) -> SwapResponse:
+    """
+    Simulates a swap locally, in the shape of `APIClient.swap_simulate`.
+
+    The quote is computed from the pool's reserves and fees, so it is only as
+    current as the `Pool` it is given. The referral fee is the pool's `ref_fee`
+    and applies when `referral_address` is set. Jetton wallet addresses are not
+    known locally and are left empty.
+
+    Args:
+        pool (Pool): The pool trading the pair, e.g. from `APIClient.get_pools`.
+        simulate_data (SwapSimulateData): The swap, with `units` being the offered amount.
+
+    Returns:
+        SwapResponse: The simulated swap.
+
+    Raises:
+        ValueError: If the pool does not trade the pair.
+    """
+    reserve_in, reserve_out = _reserves(pool, simulate_data)
+    return _response(pool, simulate_data, int(simulate_data.units), reserve_in, reserve_out)
+
+
+def simulate_reverse_swap(pool: Pool, simulate_data: SwapSimulateData) -> SwapResponse:
+    """
+    Simulates a reverse swap locally, in the shape of `APIClient.reverse_swap_simulate`.
+
+    The offer is the smallest amount that yields `units` of the asked token;
+    the returned `ask_units` is what that offer actually yields and may exceed
+    `units` by rounding.
+
+    Args:
+        pool (Pool): The pool trading the pair.
+        simulate_data (SwapSimulateData): The swap, with `units` being the asked amount.
+
+    Returns:
+        SwapResponse: The simulated swap.
+
+    Raises:
+        ValueError: If the pool does not trade the pair or lacks the liquidity.
+    """
+    reserve_in, reserve_out = _reserves(pool, simulate_data)
+    ref_fee = (pool.ref_fee_bps or 0) if simulate_data.referral_address else 0
+    offer_units = amount_in(
+        int(simulate_data.units), reserve_in, reserve_out, pool.lp_fee_bps, pool.protocol_fee_bps, ref_fee
+    )
+    return _response(pool, simulate_data, offer_units, reserve_in, reserve_out)
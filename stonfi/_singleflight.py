@@ -0,0 +1,52 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    The first caller for a key starts the call; everyone who asks for the same
+    key while it is still running awaits that call and gets its result (or its
+    exception). Once it finishes the key is forgotten, so later callers start a
+    new call.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `fn` unless a call for `key` is already in flight, and awaits the result.
+
+        Cancelling one awaiter does not cancel the shared call for the others.
+
+        Args:
+            key (Hashable): Identifies the call.
+            fn (Callable): Starts the call when no call for `key` is in flight.
+
+        Returns:
+            T: The result of the shared call.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(call)
+
+    def _forget(self, key: Hashable, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            # Mark the exception as retrieved when every awaiter went away.
+            call.exception()
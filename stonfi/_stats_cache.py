@@ -0,0 +1,207 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from stonfi._time import format_time, parse_time, utcnow
+
+
+STATS_ENDPOINTS = frozenset({"dex_stats", "operations_stats", "pool_stats"})
+
+
+class StatsCache:
+    """
+    A persistent on-disk store of stats responses for closed time windows.
+
+    Statistics over a window that ended in the past never change, so their
+    raw JSON responses are kept in SQLite forever, keyed on endpoint and
+    window. Windows ending after `now - settle` are still open and are never
+    stored. Naive timestamps are taken as UTC.
+
+    Responses that are plain lists of events can be split into windows
+    aligned to `window` with `split`, so a long range reuses every stored
+    sub-window and only fetches the ones still open or not seen before.
+
+    The connection may be used from worker threads (e.g. via `asyncio.to_thread`);
+    calls are serialized by a lock.
+
+    Attributes:
+        path (str): The SQLite database file.
+        settle (timedelta): How long after its end a window is still considered open.
+        window (timedelta): The length of the aligned sub-windows made by `split`.
+        hits (int): The number of responses served from disk.
+        misses (int): The number of closed windows that had to be fetched.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = "stats_cache.db",
+        settle: timedelta = timedelta(minutes=5),
+        window: timedelta = timedelta(days=1),
+    ):
+        """
+        Opens (and creates, if needed) the store.
+
+        Args:
+            path (str | Path, optional): The SQLite database file. Defaults to "stats_cache.db".
+            settle (timedelta, optional): Grace period for late data. Defaults to 5 minutes.
+            window (timedelta, optional): The length of the sub-windows made by `split`,
+                aligned to midnight UTC. Defaults to 1 day.
+        """
+        self.path = str(path)
+        self.settle = settle
+        self.window = window
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS stats_cache ("
+            " endpoint TEXT NOT NULL, since TEXT NOT NULL, until TEXT NOT NULL, body TEXT NOT NULL,"
+            " PRIMARY KEY (endpoint, since, until)) WITHOUT ROWID"
+        )
+        self._db.commit()
+
+    def closed(self, until: str) -> bool:
+        """
+        Returns whether a window ending at `until` can no longer change.
+
+        Args:
+            until (str): The end of the window (ISO 8601 format).
+
+        Returns:
+            bool: True if the window ended before `now - settle`.
+        """
+        try:
+            end = parse_time(until)
+        except ValueError:
+            return False
+        return end <= utcnow() - self.settle
+
+    def storable(self, endpoint: str, params: dict | None) -> bool:
+        """
+        Returns whether a request is a stats request over a closed window.
+
+        Args:
+            endpoint (str): The endpoint name.
+            params (dict, optional): The query parameters of the request.
+
+        Returns:
+            bool: True if its response may be served from and stored in the cache.
+        """
+        return endpoint in STATS_ENDPOINTS and params is not None and self.closed(params["until"])
+
+    def split(self, since: str | datetime, until: str | datetime) -> list[tuple[str, str]]:
+        """
+        Cuts a range into sub-windows at multiples of `window` since the Unix epoch.
+
+        All but the first and last sub-window are exactly `window` long, so
+        overlapping ranges share them.
+
+        Args:
+            since (str | datetime): The start of the range.
+            until (str | datetime): The end of the range.
+
+        Returns:
+            list[tuple[str, str]]: The `(since, until)` bounds of the sub-windows in order.
+        """
+        start, end = parse_time(since), parse_time(until)
+        epoch = datetime(1970, 1, 1)
+        windows = []
+        while start < end:
+            boundary = epoch + ((start - epoch) // self.window + 1) * self.window
+            windows.append((format_time(start), format_time(min(boundary, end))))
+            start = boundary
+        return windows
+
+    def get_many(self, endpoint: str, windows: list[tuple[str, str]]) -> dict[tuple[str, str], Any]:
+        """
+        Looks up the stored responses of many windows in one query.
+
+        Args:
+            endpoint (str): The endpoint name.
+            windows (list[tuple[str, str]]): The `(since, until)` windows, e.g. from `split`.
+
+        Returns:
+            dict[tuple[str, str], Any]: The parsed JSON responses of the stored windows.
+        """
+        if not windows:
+            return {}
+        wanted = set(windows)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT since, until, body FROM stats_cache WHERE endpoint = ? AND since >= ? AND since <= ?",
+                (endpoint, min(since for since, _ in windows), max(since for since, _ in windows)),
+            ).fetchall()
+        found = {(since, until): json.loads(body) for since, until, body in rows if (since, until) in wanted}
+        self.hits += len(found)
+        return found
+
+    def get(self, endpoint: str, since: str, until: str) -> Any | None:
+        """
+        Looks up the stored response of a window.
+
+        Args:
+            endpoint (str): The endpoint name.
+            since (str): The start of the window.
+            until (str): The end of the window.
+
+        Returns:
+            Any | None: The parsed JSON response, or None if it is not stored.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body FROM stats_cache WHERE endpoint = ? AND since = ? AND until = ?",
+                (endpoint, since, until),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, endpoint: str, since: str, until: str, data: Any) -> None:
+        """
+        Stores the response of a closed window.
+
+        Args:
+            endpoint (str): The endpoint name.
+            since (str): The start of the window.
+            until (str): The end of the window.
+            data (Any): The parsed JSON response.
+        """
+        body = json.dumps(data, separators=(",", ":"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO stats_cache (endpoint, since, until, body) VALUES (?, ?, ?, ?)",
+                (endpoint, since, until, body),
+            )
+            self._db.commit()
+
+    def invalidate(self, endpoint: str | None = None) -> int:
+        """
+        Deletes stored responses.
+
+        Args:
+            endpoint (str, optional): Only delete responses of this endpoint. Deletes
+                everything when omitted.
+
+        Returns:
+            int: The number of responses deleted.
+        """
+        with self._lock:
+            if endpoint is None:
+                cursor = self._db.execute("DELETE FROM stats_cache")
+            else:
+                cursor = self._db.execute("DELETE FROM stats_cache WHERE endpoint = ?", (endpoint,))
+            self._db.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,139 @@
+import json
+import re
+from typing import Any, AsyncIterator
+
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+# Outside strings only quotes and brackets matter for finding a top-level key.
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_STRING_END = re.compile(r'["\\]')
+_ARRAY_START = re.compile(r"\s*:\s*\[")
+_ARRAY_START_PREFIX = re.compile(r"\s*(?::\s*)?")
+
+# A decoded number is only complete once a character that cannot continue it follows.
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+# Drop the consumed part of the buffer once it grows past this many characters.
+_COMPACT_AFTER = 1 << 16
+
+
+class _TopLevelKey:
+    """
+    Finds `"key": [` among the keys of the top-level object of a JSON document
+    that arrives in chunks, skipping keys of nested objects and string contents.
+    """
+
+    def __init__(self, key: str):
+        self.token = json.dumps(key, ensure_ascii=False)
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.string_start: int | None = None
+
+    def feed(self, chunk: str) -> str | None:
+        """
+        Scans the next chunk.
+
+        Returns:
+            str | None: The text following the opening bracket of the array, or
+            None if it has not arrived yet.
+        """
+        buffer, pos = self.buffer + chunk, self.pos
+        while True:
+            if self.string_start is None:
+                match = _STRUCTURAL.search(buffer, pos)
+                if match is None:
+                    self.buffer, self.pos = "", 0
+                    return None
+                pos = match.end()
+                char = match.group()
+                if char == '"':
+                    self.string_start = match.start()
+                elif char in "{[":
+                    self.depth += 1
+                else:
+                    self.depth -= 1
+                continue
+            match = _STRING_END.search(buffer, pos)
+            if match is None or (match.group() == "\\" and match.end() == len(buffer)):
+                break
+            if match.group() == "\\":
+                pos = match.end() + 1
+                continue
+            pos = match.end()
+            start, self.string_start = self.string_start, None
+            if self.depth != 1 or buffer[start:pos] != self.token:
+                continue
+            array = _ARRAY_START.match(buffer, pos)
+            if array is not None:
+                return buffer[array.end():]
+            if _ARRAY_START_PREFIX.fullmatch(buffer, pos):
+                # The colon or bracket has not arrived yet; rescan the key with the next chunk.
+                self.string_start = None
+                self.buffer, self.pos = buffer[start:], 0
+                return None
+        # Keep the open string, the only state that spans chunks.
+        self.buffer, self.pos = buffer[self.string_start:], pos - self.string_start
+        self.string_start = 0
+        return None
+
+
+async def iter_json_array(chunks: AsyncIterator[str], key: str) -> AsyncIterator[Any]:
+    """
+    Incrementally decodes the items of the array stored under `key` in a JSON
+    document that arrives in chunks.
+
+    Items are yielded as soon as they have been received completely, so only
+    the current item and the unparsed tail of the stream are held in memory.
+    Only keys of the top-level object are matched, and a number is only
+    yielded once the character after it has arrived, since a chunk may end
+    in the middle of it.
+
+    Args:
+        chunks (AsyncIterator[str]): The text of the document, in pieces.
+        key (str): The top-level object key holding the array, e.g. "pool_list".
+
+    Yields:
+        Any: The decoded array items, in order.
+
+    Raises:
+        ValueError: If the key is not found or the document ends prematurely.
+    """
+    decoder = json.JSONDecoder()
+    start = _TopLevelKey(key)
+    async for chunk in chunks:
+        buffer = start.feed(chunk)
+        if buffer is not None:
+            break
+    else:
+        raise ValueError(f"{key!r} not found in response")
+
+    pos = 0
+    finished = False
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer):
+            if buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if finished:
+                    raise ValueError(f"truncated {key!r} array in response")
+            else:
+                if isinstance(item, (dict, list, str)) or finished or (
+                    end < len(buffer) and buffer[end] not in _NUMBER_CHARS
+                ):
+                    yield item
+                    pos = end
+                    if pos > _COMPACT_AFTER:
+                        buffer = buffer[pos:]
+                        pos = 0
+                    continue
+        elif finished:
+            raise ValueError(f"truncated {key!r} array in response")
+        try:
+            buffer += await anext(chunks)
+        except StopAsyncIteration:
+            finished = True
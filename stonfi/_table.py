@@ -0,0 +1,280 @@
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from stonfi._simulate import FEE_DIVIDER
+from stonfi.types import Asset, Pool
+
+
+@dataclass(frozen=True)
+class Quotes:
+    """
+    Swap quotes computed by `PoolTable.quote`, one element per pool and trade size.
+
+    Attributes:
+        offer (np.ndarray): The offered amounts in base units.
+        ask (np.ndarray): The received amounts in base units.
+        fee (np.ndarray): The protocol and referral fees taken from the output.
+        swap_rate (np.ndarray): ask / offer.
+        price_impact (np.ndarray): The relative shortfall of the swap rate from the spot price.
+    """
+
+    offer: np.ndarray
+    ask: np.ndarray
+    fee: np.ndarray
+    swap_rate: np.ndarray
+    price_impact: np.ndarray
+
+
+class PoolTable:
+    """
+    A columnar snapshot of a pool list for vectorized analytics.
+
+    Amounts and fees are held as float64 arrays (one element per pool, in the
+    order of `pools`), token addresses are mapped to integer ids, and missing
+    values are NaN. Rankings and screens are plain NumPy expressions over the
+    columns, e.g. ``table.where((table.tvl(prices) > 10_000) & (table.apy_7d > 0.1))``.
+    Float64 keeps about 15 significant digits, which is plenty for analytics;
+    use the pools' `*_units` attributes where exact amounts are needed.
+
+    Attributes:
+        pools (list[Pool]): The pools, row by row.
+        tokens (list[str]): Token addresses indexed by token id.
+        token_ids (dict[str, int]): Token ids keyed by address.
+        addresses (np.ndarray): Pool addresses (object array).
+        token0, token1 (np.ndarray): Token ids (int32).
+        reserve0, reserve1 (np.ndarray): Reserves in base units.
+        lp_total_supply (np.ndarray): LP token supply in base units.
+        collected_token0_protocol_fee, collected_token1_protocol_fee (np.ndarray): Collected protocol fees.
+        lp_fee, protocol_fee, ref_fee (np.ndarray): Fees in basis points.
+        apy_1d, apy_7d, apy_30d (np.ndarray): APYs as fractions.
+        deprecated (np.ndarray): Deprecation flags (bool).
+    """
+
+    _COLUMNS = (
+        "reserve0",
+        "reserve1",
+        "lp_total_supply",
+        "collected_token0_protocol_fee",
+        "collected_token1_protocol_fee",
+        "lp_fee",
+        "protocol_fee",
+        "ref_fee",
+        "apy_1d",
+        "apy_7d",
+        "apy_30d",
+    )
+
+    def __init__(self, pools: Sequence[Pool], token_ids: dict[str, int] | None = None):
+        """
+        Builds the columns from a pool list.
+
+        Args:
+            pools (Sequence[Pool]): The pools, e.g. the result of `APIClient.get_pools`.
+            token_ids (dict[str, int], optional): An existing token id mapping to
+                extend, so ids stay comparable between tables. Defaults to None.
+        """
+        self.pools = list(pools)
+        self.token_ids = dict(token_ids or {})
+        self.tokens = sorted(self.token_ids, key=self.token_ids.__getitem__)
+        self.addresses = np.array([pool.address for pool in self.pools], dtype=object)
+        self.token0 = np.fromiter((self._token_id(pool.token0_address) for pool in self.pools), np.int32, len(self.pools))
+        self.token1 = np.fromiter((self._token_id(pool.token1_address) for pool in self.pools), np.int32, len(self.pools))
+        for column in self._COLUMNS:
+            values = ["nan" if (value := getattr(pool, column)) is None else value for pool in self.pools]
+            setattr(self, column, np.array(values, dtype=np.float64))
+        self.deprecated = np.fromiter((pool.deprecated for pool in self.pools), bool, len(self.pools))
+
+    def _token_id(self, address: str) -> int:
+        token_id = self.token_ids.get(address)
+        if token_id is None:
+            token_id = self.token_ids[address] = len(self.tokens)
+            self.tokens.append(address)
+        return token_id
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    def token_prices(self, assets: Iterable[Asset]) -> np.ndarray:
+        """
+        Builds a USD price per base unit for every token id.
+
+        Args:
+            assets (Iterable[Asset]): Assets with DEX prices, e.g. from `APIClient.get_assets`.
+
+        Returns:
+            np.ndarray: Prices indexed by token id; NaN for tokens without a price.
+        """
+        prices = np.full(len(self.tokens), np.nan)
+        for asset in assets:
+            token_id = self.token_ids.get(asset.contract_address)
+            if token_id is not None and asset.dex_price_usd is not None:
+                prices[token_id] = float(asset.dex_price_usd) / 10 ** asset.decimals
+        return prices
+
+    def token_decimals(self, assets: Iterable[Asset]) -> np.ndarray:
+        """
+        Builds the number of decimals for every token id.
+
+        Args:
+            assets (Iterable[Asset]): The assets of the tokens.
+
+        Returns:
+            np.ndarray: Decimals indexed by token id; NaN for unknown tokens.
+        """
+        decimals = np.full(len(self.tokens), np.nan)
+        for asset in assets:
+            token_id = self.token_ids.get(asset.contract_address)
+            if token_id is not None:
+                decimals[token_id] = asset.decimals
+        return decimals
+
+    def tvl(self, prices: np.ndarray) -> np.ndarray:
+        """
+        Computes the total value locked of every pool.
+
+        Args:
+            prices (np.ndarray): USD prices per base unit indexed by token id (see `token_prices`).
+
+        Returns:
+            np.ndarray: TVL in USD; NaN where a token price is unknown.
+        """
+        return self.reserve0 * prices[self.token0] + self.reserve1 * prices[self.token1]
+
+    def price(self, decimals: np.ndarray | None = None) -> np.ndarray:
+        """
+        Computes the spot price of token0 in token1 from the reserves.
+
+        Args:
+            decimals (np.ndarray, optional): Decimals indexed by token id (see
+                `token_decimals`). Without them the price is a ratio of base units.
+
+        Returns:
+            np.ndarray: The prices; NaN or inf for empty pools.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price = self.reserve1 / self.reserve0
+        if decimals is not None:
+            price = price * 10.0 ** (decimals[self.token0] - decimals[self.token1])
+        return price
+
+    def fee_share(self) -> np.ndarray:
+        """
+        Computes the share of the swap fee that goes to liquidity providers.
+
+        Returns:
+            np.ndarray: lp_fee / (lp_fee + protocol_fee + ref_fee); NaN for fee-less pools.
+        """
+        total = self.lp_fee + self.protocol_fee + np.nan_to_num(self.ref_fee)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.lp_fee / total
+
+    def involving(self, address: str) -> np.ndarray:
+        """
+        Returns a mask of the pools that trade a token.
+
+        Args:
+            address (str): The token address.
+
+        Returns:
+            np.ndarray: True for pools with the token on either side.
+        """
+        token_id = self.token_ids.get(address)
+        if token_id is None:
+            return np.zeros(len(self), dtype=bool)
+        return (self.token0 == token_id) | (self.token1 == token_id)
+
+    def top(self, values: np.ndarray, n: int) -> np.ndarray:
+        """
+        Returns the rows with the largest values, NaN values last.
+
+        Args:
+            values (np.ndarray): One value per pool, e.g. `tvl(prices)`.
+            n (int): The number of rows.
+
+        Returns:
+            np.ndarray: Row indices ordered by descending value.
+        """
+        keys = np.where(np.isnan(values), -np.inf, values)
+        n = min(n, len(keys))
+        if n == 0:
+            return np.empty(0, dtype=np.intp)
+        candidates = np.argpartition(-keys, n - 1)[:n]
+        return candidates[np.argsort(-keys[candidates], kind="stable")]
+
+    def where(self, mask: np.ndarray) -> "PoolTable":
+        """
+        Returns the rows selected by a boolean mask or index array as a new table.
+
+        Token ids are kept, so token-indexed arrays remain valid for the result.
+
+        Args:
+            mask (np.ndarray): A boolean mask or an array of row indices.
+
+        Returns:
+            PoolTable: The selected rows.
+        """
+        rows = np.flatnonzero(mask) if np.asarray(mask).dtype == bool else np.asarray(mask)
+        table = object.__new__(PoolTable)
+        table.pools = [self.pools[row] for row in rows]
+        table.token_ids = self.token_ids
+        table.tokens = self.tokens
+        for column in ("addresses", "token0", "token1", "deprecated", *self._COLUMNS):
+            setattr(table, column, getattr(self, column)[rows])
+        return table
+
+    def quote(
+        self,
+        amounts: np.ndarray | Sequence[float],
+        offer_token0: bool | np.ndarray = True,
+        reverse: bool = False,
+        referral: bool = False,
+    ) -> Quotes:
+        """
+        Quotes swaps of many sizes on every pool at once.
+
+        This is the math of `simulate_swap` / `simulate_reverse_swap` in float64
+        without the integer rounding, so outputs may differ from them by a couple
+        of base units (and the offers of reverse quotes by the equivalent amount
+        of the offered token). `amounts` is broadcast against a column of pools: a 1-D ladder
+        quotes every size on every pool, giving `(len(table), len(amounts))`
+        arrays, while a 2-D array sets sizes per pool, e.g. fractions of the
+        reserves: ``table.quote(table.reserve0[:, None] * np.logspace(-4, -1, 16))``.
+
+        Args:
+            amounts (np.ndarray | Sequence[float]): Offered amounts in base units, or
+                asked amounts with `reverse`.
+            offer_token0 (bool | np.ndarray, optional): Whether token0 is offered, for
+                all pools or per pool. Defaults to True.
+            reverse (bool, optional): Treat `amounts` as the amounts to receive and
+                compute the offers. Defaults to False.
+            referral (bool, optional): Charge the pools' referral fees. Defaults to False.
+
+        Returns:
+            Quotes: The quotes; offers and asks are NaN where a reverse quote exceeds the
+                liquidity, and the price impact is NaN for pools without reserves.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if amounts.ndim < 2:
+            amounts = np.atleast_1d(amounts)[None, :]
+        offer_token0 = np.asarray(offer_token0, dtype=bool)[..., None]
+        reserve_in = np.where(offer_token0, self.reserve0[:, None], self.reserve1[:, None])
+        reserve_out = np.where(offer_token0, self.reserve1[:, None], self.reserve0[:, None])
+        lp_fee = self.lp_fee[:, None]
+        output_fee = self.protocol_fee[:, None] + (np.nan_to_num(self.ref_fee[:, None]) if referral else 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if reverse:
+                base_out = amounts * FEE_DIVIDER / (FEE_DIVIDER - output_fee)
+                offer = reserve_in * base_out * FEE_DIVIDER / ((reserve_out - base_out) * (FEE_DIVIDER - lp_fee))
+                offer = np.where(base_out < reserve_out, offer, np.nan)
+            else:
+                offer = np.broadcast_to(amounts, np.broadcast_shapes(amounts.shape, reserve_in.shape))
+            offer_with_fee = offer * (FEE_DIVIDER - lp_fee)
+            base_out = offer_with_fee * reserve_out / (reserve_in * FEE_DIVIDER + offer_with_fee)
+            fee = base_out * output_fee / FEE_DIVIDER
+            ask = base_out - fee
+            swap_rate = ask / offer
+            spot = reserve_out / reserve_in
+            price_impact = np.maximum(0.0, (spot - swap_rate) / spot)
+        return Quotes(offer, ask, fee, swap_rate, price_impact)
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+
+def parse_time(value: str | datetime) -> datetime:
+    """
+    Turns an ISO 8601 string or a datetime into a naive UTC datetime.
+
+    Naive values are taken to be UTC already; aware ones are converted.
+
+    Args:
+        value (str | datetime): The time.
+
+    Returns:
+        datetime: The time in UTC without tzinfo.
+
+    Raises:
+        ValueError: If `value` is not a datetime or an ISO 8601 string.
+    """
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid time {value!r}, expected an ISO 8601 string or a datetime") from None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def format_time(value: datetime) -> str:
+    """
+    Formats a time the way the API expects it, e.g. "2024-01-01T00:00:00".
+
+    Args:
+        value (datetime): The time, as returned by `parse_time`.
+
+    Returns:
+        str: The time in ISO 8601 format to the second.
+    """
+    return value.isoformat(timespec="seconds")
+
+
+def utcnow() -> datetime:
+    """
+    Returns the current time as a naive UTC datetime.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -1,67 +1,230 @@
+"""
+Ingests a wallet's operations into a SQLite database, incrementally.
+
+    python -m stonfi.get_wallet_operations_db WALLET [--since 2024-01-01T00:00:00] [--op-type swap] [--db operations.db]
+
+Every run continues from the wallet's checkpoint, so it can be repeated
+(e.g. from cron) to keep the table current.
+"""
+import argparse
 import asyncio
-from sqlalchemy import create_engine, Column
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.types import Integer, String, Float, Boolean, DateTime
-from stonfi import APIClient
-from stonfi.types import Operation
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+
+from sqlalchemy import Boolean, Column, Index, Integer, String, UniqueConstraint, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import declarative_base
+
+from stonfi import APIClient, format_time, parse_time
+from stonfi.sqlite import create_sqlite_engine
+from stonfi.types import OperationStat
+
+
+DATABASE_URL = "sqlite:///operations.db"
+
+# Operations indexed late by the API are caught by re-reading this much before the checkpoint.
+OVERLAP = timedelta(minutes=10)
 
 Base = declarative_base()
 
+
 class OperationModel(Base):
-    __tablename__ = 'operations'
-
-    def __init__(self, operation):
-        for attr_name in dir(operation):
-            if not callable(getattr(operation, attr_name)) and not attr_name.startswith("__"):
-                attr_value = getattr(operation, attr_name)
-                setattr(self, attr_name, attr_value)
-
-def map_type(attr_value):
-    if isinstance(attr_value, int):
-        return Integer
-    elif isinstance(attr_value, str):
-        return String
-    elif isinstance(attr_value, float):
-        return Float
-    elif isinstance(attr_value, bool):
-        return Boolean
-    elif isinstance(attr_value, datetime.datetime):
-        return DateTime
-    else:
-        return String
-
-async def get_wallet_operations(wallet_addr: str, since: str, until: str, op_type: str | None = None) -> list[Operation]:
-    client = APIClient()
-    url = f"{client.base_url}/v1/wallets/{wallet_addr}/operations"
-    params = {
-        "since": since,
-        "until": until,
-        "op_type": op_type
-    }
-    response = await client.get(url, params=clean_dict(params))
-    return [Operation.from_dict(operation) for operation in response.json()["operations"]]
-
-async def save_wallet_operations_to_db(wallet_addr: str, since: str, until: str, op_type: str | None = None):
-    operations = await get_wallet_operations(wallet_addr, since, until, op_type)
-
-    engine = create_engine('sqlite:///operations.db')
+    __tablename__ = "operations"
+    id = Column(Integer, primary_key=True)
+    pool_tx_hash = Column(String, nullable=False)
+    pool_tx_lt = Column(Integer, nullable=False)
+    pool_tx_timestamp = Column(String, nullable=False)
+    pool_address = Column(String, nullable=False)
+    router_address = Column(String)
+    operation_type = Column(String, nullable=False)
+    success = Column(Boolean, nullable=False)
+    exit_code = Column(String)
+    wallet_address = Column(String, nullable=False)
+    wallet_tx_hash = Column(String)
+    wallet_tx_lt = Column(Integer)
+    wallet_tx_timestamp = Column(String)
+    destination_wallet_address = Column(String)
+    # Amounts are base units, which overflow SQLite integers, so they stay strings.
+    asset0_address = Column(String)
+    asset0_amount = Column(String)
+    asset0_delta = Column(String)
+    asset0_reserve = Column(String)
+    asset1_address = Column(String)
+    asset1_amount = Column(String)
+    asset1_delta = Column(String)
+    asset1_reserve = Column(String)
+    fee_asset_address = Column(String)
+    lp_fee_amount = Column(String)
+    lp_token_delta = Column(String)
+    lp_token_supply = Column(String)
+    protocol_fee_amount = Column(String)
+    referral_address = Column(String)
+    referral_fee_amount = Column(String)
+
+    __table_args__ = (
+        UniqueConstraint("pool_tx_hash", "pool_tx_lt"),
+        Index("ix_operations_wallet_time", "wallet_address", "wallet_tx_timestamp"),
+        Index("ix_operations_pool_time", "pool_address", "pool_tx_timestamp"),
+    )
+
+
+class Checkpoint(Base):
+    __tablename__ = "operation_checkpoints"
+    wallet_address = Column(String, primary_key=True)
+    op_type = Column(String, primary_key=True)
+    until = Column(String, nullable=False)
+
+
+COLUMNS = tuple(field.name for field in fields(OperationStat))
+_row = attrgetter(*COLUMNS)
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """
+    The outcome of `ingest_wallet_operations`.
+
+    Attributes:
+        fetched (int): Operations returned by the API.
+        inserted (int): Operations that were not stored yet.
+        checkpoint (str): The time up to which the wallet is fully stored.
+        seconds (float): The duration of the run.
+    """
+
+    fetched: int
+    inserted: int
+    checkpoint: str
+    seconds: float
+
+
+def create_database(url: str = DATABASE_URL) -> Engine:
+    """
+    Opens the operations database and creates its tables.
+
+    Connections are set up by `stonfi.sqlite.create_sqlite_engine`, so a batch
+    costs one sequential WAL write instead of a sync per transaction.
+
+    Args:
+        url (str, optional): The database URL. Defaults to "sqlite:///operations.db".
+
+    Returns:
+        Engine: The database.
+    """
+    engine = create_sqlite_engine(url)
     Base.metadata.create_all(engine)
+    return engine
+
+
+def get_checkpoint(bind: Engine, wallet_addr: str, op_type: str | None = None) -> datetime | None:
+    """
+    Returns the time up to which a wallet's operations are stored.
+
+    Args:
+        bind (Engine): The operations database.
+        wallet_addr (str): The wallet's address.
+        op_type (str, optional): The operation type the wallet was ingested with. Defaults to None (all).
+
+    Returns:
+        datetime | None: The checkpoint (naive UTC), or None if the wallet was never ingested.
+    """
+    with bind.connect() as connection:
+        until = connection.scalar(
+            select(Checkpoint.until).where(Checkpoint.wallet_address == wallet_addr, Checkpoint.op_type == (op_type or ""))
+        )
+    return parse_time(until) if until is not None else None
+
+
+async def ingest_wallet_operations(
+    client: APIClient,
+    bind: Engine,
+    wallet_addr: str,
+    since: str | datetime,
+    until: str | datetime | None = None,
+    op_type: str | None = None,
+    batch_size: int = 10_000,
+) -> IngestResult:
+    """
+    Fetches a wallet's operations and stores the new ones.
+
+    The range starts at the wallet's checkpoint (less `OVERLAP`) when there is
+    one and `since` otherwise. Windows from `APIClient.iter_wallet_operation_windows`
+    are buffered and written `batch_size` rows at a time with one
+    `INSERT OR IGNORE` per batch, deduplicated on `(pool_tx_hash, pool_tx_lt)`.
+    Windows complete out of order, so the checkpoint only advances over the
+    contiguous completed prefix of the range, in the transaction that stores
+    its rows. An interrupted run therefore resumes where its last batch ended.
+
+    Args:
+        client (APIClient): The STON.fi client.
+        bind (Engine): The operations database, see `create_database`.
+        wallet_addr (str): The wallet's address.
+        since (str | datetime): The start of the first run (ISO 8601 format; naive times are UTC).
+        until (str | datetime, optional): The end of the range (naive times are UTC). Defaults to now.
+        op_type (str, optional): The type of operations to fetch. Defaults to None (all).
+        batch_size (int, optional): The number of rows per write. Defaults to 10,000.
+
+    Returns:
+        IngestResult: The number of fetched and inserted operations and the new checkpoint.
+    """
+    start = time.perf_counter()
+    checkpoint = get_checkpoint(bind, wallet_addr, op_type)
+    since = parse_time(since).replace(microsecond=0)
+    if checkpoint is not None:
+        since = max(since, checkpoint - OVERLAP)
+    until = parse_time(until if until is not None else datetime.now(timezone.utc)).replace(microsecond=0)
+    cursor = since
+    completed: dict[datetime, datetime] = {}
+    rows: list[dict] = []
+    fetched = inserted = 0
+    statement = insert(OperationModel).on_conflict_do_nothing()
+
+    def flush() -> None:
+        nonlocal cursor, inserted
+        while cursor in completed:
+            cursor = completed.pop(cursor)
+        with bind.begin() as connection:
+            if rows:
+                inserted += connection.execute(statement, rows).rowcount
+            if checkpoint is None or cursor > checkpoint:
+                stored = format_time(cursor)
+                connection.execute(
+                    insert(Checkpoint)
+                    .values(wallet_address=wallet_addr, op_type=op_type or "", until=stored)
+                    .on_conflict_do_update(index_elements=["wallet_address", "op_type"], set_={"until": stored})
+                )
+        rows.clear()
 
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    async for window_since, window_until, operations in client.iter_wallet_operation_windows(
+        wallet_addr, since, until, op_type
+    ):
+        fetched += len(operations)
+        rows.extend(dict(zip(COLUMNS, _row(operation.operation))) for operation in operations)
+        completed[parse_time(window_since)] = parse_time(window_until)
+        if len(rows) >= batch_size:
+            flush()
+    flush()
+    return IngestResult(fetched, inserted, format_time(max(cursor, checkpoint or cursor)), time.perf_counter() - start)
 
-    for operation in operations:
-        for attr_name in dir(operation):
-            if not callable(getattr(operation, attr_name)) and not attr_name.startswith("__"):
-                attr_value = getattr(operation, attr_name)
-                column = Column(attr_name, map_type(attr_value))
-                if not hasattr(OperationModel, attr_name):
-                    setattr(OperationModel, attr_name, column)
 
-        operation_model = OperationModel(operation)
-        session.add(operation_model)
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("wallet")
+    parser.add_argument("--since", default="2023-01-01T00:00:00", help="the start of the first run (ISO 8601)")
+    parser.add_argument("--until", help="the end of the range (ISO 8601); defaults to now")
+    parser.add_argument("--op-type")
+    parser.add_argument("--db", default=DATABASE_URL)
+    args = parser.parse_args()
+    engine = create_database(args.db if "://" in args.db else f"sqlite:///{args.db}")
+    async with APIClient() as client:
+        result = await ingest_wallet_operations(client, engine, args.wallet, args.since, args.until, args.op_type)
+    print(
+        f"fetched {result.fetched}, inserted {result.inserted} in {result.seconds:.3f}s;"
+        f" stored up to {result.checkpoint}"
+    )
 
-    session.commit()
-    session.close()
 
-asyncio.run(save_wallet_operations_to_db('your_wallet_address', 'start_date', 'end_date', 'operation_type'))
+if __name__ == "__main__":
+    asyncio.run(main())
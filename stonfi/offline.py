@@ -0,0 +1,690 @@
+"""
+Offline stand-ins for the STON.fi API, for load tests and reproducible benchmarks.
+
+- `RecordingTransport` passes requests through to the real API and stores
+  every response on disk; `ReplayTransport` serves those recordings back.
+- `FakeStonfi` is a local stand-in with a synthetic dataset and configurable
+  latency and error rate. It can be plugged into `APIClient` in-process via
+  `FakeStonfi.transport()` or served over HTTP:
+
+    python -m stonfi.offline --port 8080 --pools 20000 --latency 0.05 --error-rate 0.01
+
+  and then used with ``APIClient(base_url="http://127.0.0.1:8080")``.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import re
+from datetime import datetime, timedelta
+from fractions import Fraction
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Callable, Mapping
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+
+# Headers describing the wire encoding of a recorded body, which no longer
+# apply once the body has been decoded.
+_ENCODING_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+
+def _record_name(method: str, target: str, body: bytes) -> str:
+    digest = hashlib.sha1(b"\n".join([method.encode(), target.encode(), body])).hexdigest()[:16]
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", urlsplit(target).path).strip("_")[:80]
+    return f"{method}_{slug}_{digest}.json"
+
+
+def _target(request: httpx.Request) -> str:
+    return request.url.raw_path.decode("ascii")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    A transport that forwards requests and writes every response to a directory.
+
+    Recordings are keyed on method, path, query and body (not on the host), so
+    they can be replayed against any base URL. 304 responses are not recorded.
+
+    Attributes:
+        directory (Path): Where the recordings are written.
+        transport (httpx.AsyncBaseTransport): The transport doing the actual requests.
+    """
+
+    def __init__(self, directory: str | Path, transport: httpx.AsyncBaseTransport | None = None):
+        """
+        Args:
+            directory (str | Path): Where the recordings are written; created if missing.
+            transport (httpx.AsyncBaseTransport, optional): The transport doing the
+                actual requests. Defaults to an `httpx.AsyncHTTPTransport` with 5 retries.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.transport = transport or httpx.AsyncHTTPTransport(retries=5)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _ENCODING_HEADERS]
+        if response.status_code != 304:
+            record = {
+                "method": request.method,
+                "target": _target(request),
+                "status": response.status_code,
+                "headers": headers,
+            }
+            try:
+                record["text"] = body.decode("utf-8")
+            except UnicodeDecodeError:
+                record["base64"] = base64.b64encode(body).decode("ascii")
+            path = self.directory / _record_name(request.method, _target(request), request.content)
+            path.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    A transport that answers requests from recordings made by `RecordingTransport`.
+
+    Requests without a recording get a 404 response.
+
+    Attributes:
+        directory (Path): Where the recordings are read from.
+        latency (float): Seconds added to every response.
+    """
+
+    def __init__(self, directory: str | Path, latency: float = 0.0):
+        """
+        Args:
+            directory (str | Path): The recording directory.
+            latency (float, optional): Seconds added to every response. Defaults to 0.
+        """
+        self.directory = Path(directory)
+        self.latency = latency
+        self._records: dict[str, dict | None] = {}
+
+    def _load(self, name: str) -> dict | None:
+        if name not in self._records:
+            path = self.directory / name
+            self._records[name] = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+        return self._records[name]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        record = self._load(_record_name(request.method, _target(request), request.content))
+        if record is None:
+            return httpx.Response(
+                404, json={"error": f"no recording for {request.method} {_target(request)}"}, request=request
+            )
+        if "text" in record:
+            body = record["text"].encode("utf-8")
+        else:
+            body = base64.b64decode(record["base64"])
+        return httpx.Response(record["status"], headers=record["headers"], content=body, request=request)
+
+
+class _FakeTransport(httpx.AsyncBaseTransport):
+    def __init__(self, api: "FakeStonfi"):
+        self.api = api
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        status, headers, body = await self.api.handle(request.method, _target(request), request.headers)
+        return httpx.Response(status, headers=headers, content=body, request=request)
+
+
+FEE_DIVIDER = 10000
+
+TON_ADDRESS = "EQ" + "A" * 46
+
+
+def _address(prefix: str, i: int) -> str:
+    return f"EQ{prefix}{i:0{46 - len(prefix)}d}"
+
+
+class FakeStonfi:
+    """
+    A local stand-in for the STON.fi API backed by a synthetic dataset.
+
+    It implements the routes used by `APIClient`: pools, assets, farms,
+    markets, wallets, stats, swap simulation and status, and jetton addresses.
+    List endpoints carry an ETag that changes whenever `tick` moves reserves,
+    and answer 304 to a matching If-None-Match.
+
+    Attributes:
+        assets (list[dict]): The asset payloads; the first one is TON.
+        pools (list[dict]): The pool payloads.
+        farms (list[dict]): The farm payloads.
+        latency (float): Seconds added to every response.
+        error_rate (float): Probability of answering 503 instead.
+        operations_per_day (int): Synthetic wallet operations generated per day of a window.
+        operations_limit (int | None): Truncates operation lists to this many items, like a paging API.
+        requests (int): The number of requests handled.
+    """
+
+    def __init__(
+        self,
+        pools: int = 1000,
+        assets: int = 200,
+        farms: int = 100,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        operations_per_day: int = 24,
+        operations_limit: int | None = None,
+        seed: int = 0,
+    ):
+        """
+        Generates the dataset.
+
+        Args:
+            pools (int, optional): The number of pools. Defaults to 1000.
+            assets (int, optional): The number of assets. Defaults to 200.
+            farms (int, optional): The number of farms. Defaults to 100.
+            latency (float, optional): Seconds added to every response. Defaults to 0.
+            error_rate (float, optional): Probability of a 503 response. Defaults to 0.
+            operations_per_day (int, optional): Operations per day of a window. Defaults to 24.
+            operations_limit (int, optional): Maximum operations per response. Defaults to None.
+            seed (int, optional): Seeds the dataset and the error injection. Defaults to 0.
+        """
+        self._rng = random.Random(seed)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.operations_per_day = operations_per_day
+        self.operations_limit = operations_limit
+        self.requests = 0
+        self._version = 0
+        self._encoded: dict[str, bytes] = {}
+        self.assets = [self._make_asset(i) for i in range(max(assets, 2))]
+        self.pools = [self._make_pool(i) for i in range(pools)]
+        self.farms = [self._make_farm(i) for i in range(min(farms, pools))]
+        self._assets_by_address = {asset["contract_address"]: asset for asset in self.assets}
+        self._pools_by_address = {pool["address"]: pool for pool in self.pools}
+        self._farms_by_address = {farm["minter_address"]: farm for farm in self.farms}
+        self._routes: list[tuple[str, re.Pattern, Callable[..., Any]]] = [
+            ("GET", re.compile(r"/v1/assets"), lambda q: _Listing("asset_list", self.assets)),
+            ("GET", re.compile(r"/v1/assets/(?P<addr>[^/]+)"), lambda q, addr: {"asset": self._asset(addr)}),
+            ("GET", re.compile(r"/v1/farms"), lambda q: _Listing("farm_list", self.farms)),
+            ("GET", re.compile(r"/v1/farms/(?P<addr>[^/]+)"), lambda q, addr: {"farm": self._farm(addr)}),
+            ("GET", re.compile(r"/v1/farms_by_pool/(?P<addr>[^/]+)"), self._farms_by_pool),
+            ("GET", re.compile(r"/v1/markets"), self._markets),
+            ("GET", re.compile(r"/v1/pools"), lambda q: _Listing("pool_list", self.pools)),
+            ("GET", re.compile(r"/v1/pools/(?P<addr>[^/]+)"), lambda q, addr: {"pool": self._pool(addr)}),
+            ("GET", re.compile(r"/v1/swap/status"), self._swap_status),
+            ("POST", re.compile(r"/v1/swap/simulate"), lambda q: self._simulate(q, reverse=False)),
+            ("POST", re.compile(r"/v1/reverse_swap/simulate"), lambda q: self._simulate(q, reverse=True)),
+            ("GET", re.compile(r"/v1/jetton/(?P<addr>[^/]+)/address"), self._jetton_address),
+            ("GET", re.compile(r"/v1/wallets/(?P<wallet>[^/]+)/assets"), self._wallet_assets),
+            ("GET", re.compile(r"/v1/wallets/(?P<wallet>[^/]+)/assets/(?P<addr>[^/]+)"), self._wallet_asset),
+            ("GET", re.compile(r"/v1/wallets/(?P<wallet>[^/]+)/farms"), self._wallet_farms),
+            ("GET", re.compile(r"/v1/wallets/(?P<wallet>[^/]+)/farms/(?P<addr>[^/]+)"), self._wallet_farm),
+            ("GET", re.compile(r"/v1/wallets/(?P<wallet>[^/]+)/operations"), self._wallet_operations),
+            ("GET", re.compile(r"/v1/wallets/(?P<wallet>[^/]+)/pools"), self._wallet_pools),
+            ("GET", re.compile(r"/v1/wallets/(?P<wallet>[^/]+)/pools/(?P<addr>[^/]+)"), self._wallet_pool),
+            ("GET", re.compile(r"/v1/stats/dex"), self._dex_stats),
+            ("GET", re.compile(r"/v1/stats/operations"), self._operations_stats),
+            ("GET", re.compile(r"/v1/stats/pool"), self._pool_stats),
+        ]
+
+    # Dataset
+
+    def _make_asset(self, i: int) -> dict:
+        rng = self._rng
+        ton = i == 0
+        return {
+            "balance": None,
+            "blacklisted": False,
+            "community": not ton and rng.random() < 0.5,
+            "contract_address": TON_ADDRESS if ton else _address("asset", i),
+            "default_symbol": True,
+            "deprecated": False,
+            "dex_price_usd": "5.2" if ton else f"{rng.lognormvariate(-2, 2):.9f}",
+            "dex_usd_price": None,
+            "display_name": "Toncoin" if ton else f"Token {i}",
+            "image_url": None,
+            "kind": "Ton" if ton else "Jetton",
+            "symbol": "TON" if ton else f"TOK{i}",
+            "tags": ["default_symbol"],
+            "taxable": False,
+            "third_party_price_usd": None,
+            "third_party_usd_price": None,
+            "wallet_address": None,
+            "decimals": 9 if ton or rng.random() < 0.8 else 6,
+            "priority": 0 if ton else i,
+        }
+
+    def _make_pool(self, i: int) -> dict:
+        rng = self._rng
+        token0 = self.assets[1 + i % (len(self.assets) - 1)]["contract_address"]
+        token1 = TON_ADDRESS if i % 4 else self.assets[1 + rng.randrange(len(self.assets) - 1)]["contract_address"]
+        if token1 == token0:
+            token1 = TON_ADDRESS
+        reserve1 = int(rng.lognormvariate(25, 3))
+        return {
+            "address": _address("pool", i),
+            "apy_1d": f"{rng.random():.6f}",
+            "apy_30d": f"{rng.random():.6f}",
+            "apy_7d": f"{rng.random():.6f}" if rng.random() < 0.9 else None,
+            "collected_token0_protocol_fee": str(rng.randrange(10 ** 9)),
+            "collected_token1_protocol_fee": str(rng.randrange(10 ** 9)),
+            "deprecated": rng.random() < 0.05,
+            "lp_account_address": None,
+            "lp_balance": None,
+            "lp_fee": "20",
+            "lp_price_usd": f"{rng.random() * 10:.6f}",
+            "lp_total_supply": str(int(rng.lognormvariate(25, 3)) + 1),
+            "lp_total_supply_usd": f"{rng.lognormvariate(8, 3):.2f}",
+            "lp_wallet_address": None,
+            "protocol_fee": "10",
+            "protocol_fee_address": _address("fee", 0),
+            "ref_fee": "10",
+            "reserve0": str(int(reserve1 * rng.lognormvariate(0, 3)) + 1),
+            "reserve1": str(reserve1 + 1),
+            "router_address": _address("router", 0),
+            "token0_address": token0,
+            "token0_balance": None,
+            "token1_address": token1,
+            "token1_balance": None,
+        }
+
+    def _make_farm(self, i: int) -> dict:
+        pool = self.pools[i]
+        reward = {"address": pool["token0_address"], "amount": "1000"}
+        return {
+            "locked_total_lp": pool["lp_total_supply"],
+            "min_stake_duration_s": "0",
+            "minter_address": _address("farm", i),
+            "nft_infos": [
+                {
+                    "address": _address("nft", i),
+                    "create_timestamp": "1700000000",
+                    "min_unstake_timestamp": "1700000000",
+                    "nonclaimed_rewards": "0",
+                    "rewards": [reward],
+                    "staked_tokens": "1000",
+                    "status": "active",
+                }
+            ],
+            "pool_address": pool["address"],
+            "reward_token_address": pool["token0_address"],
+            "rewards": [
+                {"address": pool["token0_address"], "remaining_rewards": "10000", "reward_rate_24h": "100", "status": "active"}
+            ],
+            "status": "active",
+            "apy": f"{self._rng.random():.6f}",
+            "locked_total_lp_usd": pool["lp_total_supply_usd"],
+        }
+
+    def tick(self, fraction: float = 0.05) -> list[str]:
+        """
+        Simulates trading by moving the reserves of a random share of the pools.
+
+        Args:
+            fraction (float, optional): The share of pools that change. Defaults to 0.05.
+
+        Returns:
+            list[str]: The addresses of the changed pools.
+        """
+        changed = self._rng.sample(self.pools, int(len(self.pools) * fraction))
+        for pool in changed:
+            offer = self._rng.randrange(1, max(2, int(pool["reserve0"]) // 100))
+            out, protocol_fee, _ = _amount_out(pool, offer, int(pool["reserve0"]), int(pool["reserve1"]), False)
+            pool["reserve0"] = str(int(pool["reserve0"]) + offer)
+            pool["reserve1"] = str(int(pool["reserve1"]) - out - protocol_fee)
+            pool["collected_token1_protocol_fee"] = str(int(pool["collected_token1_protocol_fee"]) + protocol_fee)
+        self._version += 1
+        self._encoded.clear()
+        return [pool["address"] for pool in changed]
+
+    # Request handling
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """
+        Returns an in-process transport for `APIClient(transport=...)`.
+
+        Returns:
+            httpx.AsyncBaseTransport: A transport answering from this stand-in.
+        """
+        return _FakeTransport(self)
+
+    async def handle(self, method: str, target: str, headers: Mapping[str, str]) -> tuple[int, dict, bytes]:
+        """
+        Answers a request.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The path and query string.
+            headers (Mapping[str, str]): The request headers (lower-case names).
+
+        Returns:
+            tuple[int, dict, bytes]: The status, headers and JSON body.
+        """
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return 503, {"Content-Type": "application/json"}, b'{"error":"service unavailable"}'
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(url.path)
+            if route_method == method and match is not None:
+                break
+        else:
+            return 404, {"Content-Type": "application/json"}, b'{"error":"not found"}'
+        try:
+            payload = handler(query, **match.groupdict())
+        except KeyError as error:
+            body = json.dumps({"error": f"unknown {error.args[0]}"}).encode()
+            return 404, {"Content-Type": "application/json"}, body
+        except ValueError as error:
+            return 400, {"Content-Type": "application/json"}, json.dumps({"error": str(error)}).encode()
+        response_headers = {"Content-Type": "application/json"}
+        if isinstance(payload, _Listing):
+            etag = f'"{self._version}"'
+            if headers.get("if-none-match") == etag:
+                return 304, {"ETag": etag}, b""
+            response_headers["ETag"] = etag
+            body = self._encoded.get(payload.key)
+            if body is None:
+                body = self._encoded[payload.key] = _encode({payload.key: payload.items})
+            return 200, response_headers, body
+        return 200, response_headers, _encode(payload)
+
+    def _asset(self, addr: str) -> dict:
+        return self._assets_by_address[addr]
+
+    def _pool(self, addr: str) -> dict:
+        return self._pools_by_address[addr]
+
+    def _farm(self, addr: str) -> dict:
+        return self._farms_by_address[addr]
+
+    def _farms_by_pool(self, query: dict, addr: str) -> dict:
+        return {"farm_list": [farm for farm in self.farms if farm["pool_address"] == addr]}
+
+    def _markets(self, query: dict) -> dict:
+        return {"pairs": [[pool["token0_address"], pool["token1_address"]] for pool in self.pools]}
+
+    def _swap_status(self, query: dict) -> dict:
+        return {"@type": "Found", "address": query.get("owner_address"), "query_id": query.get("query_id"), "exit_code": "swap_ok"}
+
+    def _jetton_address(self, query: dict, addr: str) -> dict:
+        digest = hashlib.sha1(f"{query.get('owner_address')}:{addr}".encode()).hexdigest()
+        return {"address": "EQ" + digest + "0" * 6}
+
+    def _wallet_sample(self, wallet: str, items: list[dict], count: int) -> list[dict]:
+        rng = random.Random(wallet)
+        return rng.sample(items, min(count, len(items)))
+
+    def _wallet_assets(self, query: dict, wallet: str) -> dict:
+        assets = self._wallet_sample(wallet, self.assets, 10)
+        return {"asset_list": [dict(asset, balance="1000000000", wallet_address=wallet) for asset in assets]}
+
+    def _wallet_asset(self, query: dict, wallet: str, addr: str) -> dict:
+        return {"asset": dict(self._asset(addr), balance="1000000000", wallet_address=wallet)}
+
+    def _wallet_farms(self, query: dict, wallet: str) -> dict:
+        return {"farm_list": self._wallet_sample(wallet, self.farms, 3)}
+
+    def _wallet_farm(self, query: dict, wallet: str, addr: str) -> dict:
+        return {"farm": self._farm(addr)}
+
+    def _wallet_pools(self, query: dict, wallet: str) -> dict:
+        pools = self._wallet_sample(wallet, self.pools, 5)
+        return {"pool_list": [dict(pool, lp_balance="1000", lp_wallet_address=wallet) for pool in pools]}
+
+    def _wallet_pool(self, query: dict, wallet: str, addr: str) -> dict:
+        return {"pool": dict(self._pool(addr), lp_balance="1000", lp_wallet_address=wallet)}
+
+    def _operations(self, wallet: str, query: dict) -> list[dict]:
+        since = datetime.fromisoformat(query["since"])
+        until = datetime.fromisoformat(query["until"])
+        step = timedelta(days=1) / max(self.operations_per_day, 1)
+        # Operations sit on a fixed grid so that overlapping windows agree.
+        epoch = datetime(2020, 1, 1, tzinfo=since.tzinfo)
+        index = -(-(since - epoch) // step)
+        operations = []
+        while (timestamp := epoch + index * step) < until:
+            operations.append(self._operation(wallet, index, timestamp))
+            index += 1
+        if self.operations_limit is not None:
+            operations = operations[: self.operations_limit]
+        return operations
+
+    def _operation(self, wallet: str, index: int, timestamp: datetime) -> dict:
+        pool = self.pools[index % len(self.pools)] if self.pools else self._make_pool(0)
+        asset0 = self._assets_by_address[pool["token0_address"]]
+        asset1 = self._assets_by_address[pool["token1_address"]]
+        stamp = timestamp.replace(tzinfo=None).isoformat(timespec="seconds")
+        lt = 40_000_000_000 + index
+        return {
+            "asset0_info": asset0,
+            "asset1_info": asset1,
+            "operation": {
+                "asset0_address": asset0["contract_address"],
+                "asset0_amount": "1000",
+                "asset0_delta": "1000",
+                "asset0_reserve": pool["reserve0"],
+                "asset1_address": asset1["contract_address"],
+                "asset1_amount": "997",
+                "asset1_delta": "-997",
+                "asset1_reserve": pool["reserve1"],
+                "destination_wallet_address": wallet,
+                "exit_code": "swap_ok",
+                "fee_asset_address": None,
+                "lp_fee_amount": "2",
+                "lp_token_delta": "0",
+                "lp_token_supply": pool["lp_total_supply"],
+                "operation_type": "swap",
+                "pool_address": pool["address"],
+                "pool_tx_hash": hashlib.sha1(f"pool:{wallet}:{index}".encode()).hexdigest(),
+                "pool_tx_lt": lt,
+                "pool_tx_timestamp": stamp,
+                "protocol_fee_amount": "1",
+                "referral_address": None,
+                "referral_fee_amount": "0",
+                "router_address": pool["router_address"],
+                "success": True,
+                "wallet_address": wallet,
+                "wallet_tx_hash": hashlib.sha1(f"wallet:{wallet}:{index}".encode()).hexdigest(),
+                "wallet_tx_lt": lt - 1,
+                "wallet_tx_timestamp": stamp,
+            },
+        }
+
+    def _wallet_operations(self, query: dict, wallet: str) -> dict:
+        operations = self._operations(wallet, query)
+        if "op_type" in query:
+            operations = [op for op in operations if op["operation"]["operation_type"] == query["op_type"]]
+        return {"operations": operations}
+
+    def _dex_stats(self, query: dict) -> dict:
+        trades = len(self._operations("EQstats", query))
+        return {"stats": {"trades": trades, "tvl": "123456789.0", "unique_wallets": trades // 3, "volume_usd": str(trades * 10)}}
+
+    def _operations_stats(self, query: dict) -> dict:
+        return {"operations": self._operations("EQstats", query)}
+
+    def _pool_stats(self, query: dict) -> dict:
+        stats = []
+        for pool in self.pools[:100]:
+            base = self._assets_by_address[pool["token0_address"]]
+            quote = self._assets_by_address[pool["token1_address"]]
+            stats.append({
+                "apy": pool["apy_30d"],
+                "base_id": base["contract_address"],
+                "base_liquidity": pool["reserve0"],
+                "base_name": base["display_name"],
+                "base_symbol": base["symbol"],
+                "base_volume": "0",
+                "last_price": str(int(pool["reserve1"]) / int(pool["reserve0"])),
+                "lp_price": None,
+                "lp_price_usd": pool["lp_price_usd"],
+                "pool_address": pool["address"],
+                "quote_id": quote["contract_address"],
+                "quote_liquidity": pool["reserve1"],
+                "quote_name": quote["display_name"],
+                "quote_symbol": quote["symbol"],
+                "quote_volume": "0",
+                "router_address": pool["router_address"],
+                "url": f"https://app.ston.fi/pools/{pool['address']}",
+            })
+        return {"stats": stats}
+
+    def _simulate(self, query: dict, reverse: bool) -> dict:
+        offer, ask = query["offer_address"], query["ask_address"]
+        units = int(query["units"])
+        slippage = Fraction(query["slippage_tolerance"])
+        has_ref = "referral_address" in query
+        for pool in self.pools:
+            if {pool["token0_address"], pool["token1_address"]} == {offer, ask}:
+                break
+        else:
+            raise ValueError("no pool for this pair")
+        if pool["token0_address"] == offer:
+            reserve_in, reserve_out = int(pool["reserve0"]), int(pool["reserve1"])
+        else:
+            reserve_in, reserve_out = int(pool["reserve1"]), int(pool["reserve0"])
+        if reverse:
+            ask_units = units
+            offer_units = _amount_in(pool, ask_units, reserve_in, reserve_out, has_ref)
+        else:
+            offer_units = units
+        ask_units, protocol_fee, ref_fee = _amount_out(pool, offer_units, reserve_in, reserve_out, has_ref)
+        spot = reserve_out / reserve_in
+        rate = ask_units / offer_units if offer_units else 0.0
+        return {
+            "ask_address": ask,
+            "ask_jetton_wallet": "",
+            "ask_units": str(ask_units),
+            "fee_address": pool["protocol_fee_address"],
+            "fee_percent": str((int(pool["lp_fee"]) + int(pool["protocol_fee"])) / FEE_DIVIDER),
+            "fee_units": str(protocol_fee + ref_fee),
+            "min_ask_units": str(int(ask_units * (1 - slippage))),
+            "offer_address": offer,
+            "offer_jetton_wallet": "",
+            "offer_units": str(offer_units),
+            "pool_address": pool["address"],
+            "price_impact": str(max(0.0, (spot - rate) / spot) if spot else 0.0),
+            "router_address": pool["router_address"],
+            "slippage_tolerance": query["slippage_tolerance"],
+            "swap_rate": str(rate),
+        }
+
+    # HTTP server
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """
+        Starts serving the stand-in over HTTP/1.1 with keep-alive.
+
+        Args:
+            host (str, optional): The interface to bind. Defaults to "127.0.0.1".
+            port (int, optional): The port to bind; 0 picks a free one. Defaults to 8080.
+
+        Returns:
+            asyncio.AbstractServer: The running server.
+        """
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request_line := await reader.readline():
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if length := int(headers.get("content-length", 0)):
+                    await reader.readexactly(length)
+                status, response_headers, body = await self.handle(method, target, headers)
+                head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", f"Content-Length: {len(body)}"]
+                head += [f"{name}: {value}" for name, value in response_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+class _Listing:
+    """
+    A list response that is cached in encoded form and carries an ETag.
+    """
+
+    def __init__(self, key: str, items: list[dict]):
+        self.key = key
+        self.items = items
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+# The fake quotes swaps independently of stonfi._simulate, so that comparing
+# the two checks the simulator against a second implementation.
+def _amount_out(pool: dict, amount_in: int, reserve_in: int, reserve_out: int, has_ref: bool) -> tuple[int, int, int]:
+    lp_fee, protocol_fee = int(pool["lp_fee"]), int(pool["protocol_fee"])
+    ref_fee = int(pool["ref_fee"] or 0)
+    amount_in_with_fee = amount_in * (FEE_DIVIDER - lp_fee)
+    base_out = amount_in_with_fee * reserve_out // (reserve_in * FEE_DIVIDER + amount_in_with_fee)
+    protocol_fee_out = -(-base_out * protocol_fee // FEE_DIVIDER)
+    ref_fee_out = -(-base_out * ref_fee // FEE_DIVIDER) if has_ref else 0
+    return base_out - protocol_fee_out - ref_fee_out, protocol_fee_out, ref_fee_out
+
+
+def _amount_in(pool: dict, amount_out: int, reserve_in: int, reserve_out: int, has_ref: bool) -> int:
+    lp_fee, protocol_fee = int(pool["lp_fee"]), int(pool["protocol_fee"])
+    ref_fee = int(pool["ref_fee"] or 0) if has_ref else 0
+    base_out = -(-amount_out * FEE_DIVIDER // (FEE_DIVIDER - protocol_fee - ref_fee))
+    if base_out >= reserve_out:
+        raise ValueError("not enough liquidity")
+    return -(-reserve_in * base_out * FEE_DIVIDER // ((reserve_out - base_out) * (FEE_DIVIDER - lp_fee)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the STON.fi API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pools", type=int, default=1000)
+    parser.add_argument("--assets", type=int, default=200)
+    parser.add_argument("--farms", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 503 response")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    async def run() -> None:
+        api = FakeStonfi(
+            pools=args.pools,
+            assets=args.assets,
+            farms=args.farms,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        server = await api.serve(args.host, args.port)
+        print(f"Serving {len(api.pools)} pools on http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+SQLite engines shared by the bot's database and the operations ingest script.
+
+Requires SQLAlchemy, which the API client itself does not need.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "busy_timeout": 5000,
+}
+
+
+def create_sqlite_engine(url: str) -> Engine:
+    """
+    Creates an engine whose connections are tuned for many readers and one writer.
+
+    WAL journaling lets reads run while a write commits, `synchronous = NORMAL`
+    skips the sync on every commit, the file is memory-mapped for reads and
+    writers wait for the lock instead of failing with "database is locked".
+
+    Args:
+        url (str): The database URL, e.g. "sqlite:///pools.db".
+
+    Returns:
+        Engine: The engine.
+    """
+    engine = create_engine(url)
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(connection, _):
+        for name, value in PRAGMAS.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+
+    return engine
@@ -4,6 +4,7 @@ from .pool import Pool
 from .swap import SwapSimulateData, SwapResponse, SwapStatus
 from .operation import OperationStat, Operation
 from .stats import DexStats, PoolStats
+from ._decode import decoder
 
 __all__ = [
     "Asset",
@@ -19,5 +20,6 @@ __all__ = [
     "OperationStat",
     "Operation",
     "DexStats",
-    "PoolStats"
+    "PoolStats",
+    "decoder"
 ]
@@ -0,0 +1,90 @@
+import dataclasses
+import enum
+import functools
+import types
+import typing
+from typing import Any, Callable, TypeVar
+
+
+T = TypeVar("T")
+
+
+@functools.cache
+def decoder(cls: type[T]) -> Callable[[dict], T]:
+    """
+    Returns a decoder specialised for a dataclass of `stonfi.types`.
+
+    The decoder is generated once per class and turns a JSON object into an
+    instance without the per-call introspection of `from_dict`: it reads every
+    field by its JSON name (honouring `config(field_name=...)` aliases), decodes
+    nested dataclasses and lists of them, and converts enum values. Unknown keys
+    are ignored and missing optional fields fall back to their defaults.
+
+    Args:
+        cls (type): The dataclass to decode.
+
+    Returns:
+        Callable[[dict], T]: A function building a `cls` from a JSON object.
+    """
+    hints = typing.get_type_hints(cls)
+    namespace: dict[str, Any] = {"cls": cls}
+    arguments = []
+    for index, field in enumerate(dataclasses.fields(cls)):
+        if not field.init:
+            continue
+        key = _json_key(field)
+        if field.default is not dataclasses.MISSING:
+            namespace[f"_default{index}"] = field.default
+            source = f"d.get({key!r}, _default{index})"
+        else:
+            source = f"d[{key!r}]"
+        optional, annotation = _unwrap_optional(hints[field.name])
+        convert = _converter(annotation, namespace, f"_convert{index}")
+        if convert is None:
+            value = source
+        elif optional or field.default is None:
+            value = f"(_v if (_v := {source}) is None else {convert}(_v))"
+        else:
+            value = f"{convert}({source})"
+        arguments.append(f"        {field.name}={value},")
+    source = "\n".join(["def decode(d):", "    return cls(", *arguments, "    )"])
+    exec(compile(source, f"<decoder {cls.__qualname__}>", "exec"), namespace)
+    return namespace["decode"]
+
+
+def _json_key(field: dataclasses.Field) -> str:
+    override = field.metadata.get("dataclasses_json", {}).get("letter_case")
+    return override(field.name) if override is not None else field.name
+
+
+def _unwrap_optional(annotation: Any) -> tuple[bool, Any]:
+    if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return len(args) < len(typing.get_args(annotation)), args[0]
+    return False, annotation
+
+
+def _converter(annotation: Any, namespace: dict[str, Any], name: str) -> str | None:
+    """
+    Registers the conversion of a value of the given type in `namespace`.
+
+    Returns:
+        str | None: The name of the conversion function, or None if the JSON
+            value can be used as is.
+    """
+    if dataclasses.is_dataclass(annotation):
+        namespace[name] = decoder(annotation)
+        return name
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        namespace[name] = annotation
+        return name
+    if typing.get_origin(annotation) is list:
+        (item,) = typing.get_args(annotation)
+        item_converter = _converter(item, namespace, f"{name}_item")
+        if item_converter is None:
+            return None
+        item_decoder = namespace[item_converter]
+        namespace[name] = lambda items: [item_decoder(item) for item in items]
+        return name
+    return None
@@ -0,0 +1,46 @@
+from decimal import Decimal
+from typing import Any, Callable
+
+
+class Parsed:
+    """
+    A read-only attribute exposing a string-encoded field as a number.
+
+    The field is parsed on every access. Nothing is cached on the instance,
+    so the slotted types stay as small as their fields; callers that read a
+    value in a loop should keep it in a local. Missing (None) values stay None.
+    """
+
+    def __init__(self, field: str, parse: Callable[[str], Any] = int):
+        """
+        Args:
+            field (str): The name of the string field to parse.
+            parse (Callable, optional): The parser, `int` for base units or
+                `Decimal` for prices and rates. Defaults to int.
+        """
+        self.field = field
+        self.parse = parse
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        raw = getattr(instance, self.field)
+        return None if raw is None else self.parse(raw)
+
+
+def to_human(units: int | str, decimals: int) -> Decimal:
+    """
+    Converts an amount in base units into token units.
+
+    Args:
+        units (int | str): The amount in base units.
+        decimals (int): The number of decimals of the token.
+
+    Returns:
+        Decimal: The exact amount in token units.
+    """
+    sign, digits, exponent = Decimal(int(units)).as_tuple()
+    return Decimal((sign, digits, exponent - decimals))
@@ -1,7 +1,10 @@
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
+from decimal import Decimal
 from enum import StrEnum
 
+from stonfi.types._numeric import Parsed, to_human
+
 
 
 class AssetKind(StrEnum):
@@ -11,7 +14,7 @@ class AssetKind(StrEnum):
     NOT_AN_ASSET = "NotAnAsset"
 
 @dataclass_json
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class Asset:
     balance: str | None = None
     blacklisted: bool
@@ -32,3 +35,34 @@ class Asset:
     wallet_address: str | None = None
     decimals: int
     priority: int
+
+    balance_units = Parsed("balance")
+    dex_price_usd_decimal = Parsed("dex_price_usd", Decimal)
+    dex_usd_price_decimal = Parsed("dex_usd_price", Decimal)
+    third_party_price_usd_decimal = Parsed("third_party_price_usd", Decimal)
+    third_party_usd_price_decimal = Parsed("third_party_usd_price", Decimal)
+
+    def to_human(self, units: int | str) -> Decimal:
+        """
+        Converts an amount of this asset from base units into token units.
+
+        Args:
+            units (int | str): The amount in base units.
+
+        Returns:
+            Decimal: The exact amount, scaled by the asset's decimals.
+        """
+        return to_human(units, self.decimals)
+
+    def usd_value(self, units: int | str) -> Decimal | None:
+        """
+        Values an amount of this asset at its DEX price.
+
+        Args:
+            units (int | str): The amount in base units.
+
+        Returns:
+            Decimal | None: The value in USD, or None if the asset has no DEX price.
+        """
+        price = self.dex_price_usd_decimal
+        return None if price is None else self.to_human(units) * price
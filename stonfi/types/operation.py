@@ -1,10 +1,11 @@
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
 
+from stonfi.types._numeric import Parsed
 from stonfi.types.asset import Asset
 
 @dataclass_json
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class OperationStat:
     asset0_address: str
     asset0_amount: str
@@ -35,6 +36,18 @@ class OperationStat:
     wallet_tx_lt: int
     wallet_tx_timestamp: str
 
+    asset0_amount_units = Parsed("asset0_amount")
+    asset0_delta_units = Parsed("asset0_delta")
+    asset0_reserve_units = Parsed("asset0_reserve")
+    asset1_amount_units = Parsed("asset1_amount")
+    asset1_delta_units = Parsed("asset1_delta")
+    asset1_reserve_units = Parsed("asset1_reserve")
+    lp_fee_amount_units = Parsed("lp_fee_amount")
+    lp_token_delta_units = Parsed("lp_token_delta")
+    lp_token_supply_units = Parsed("lp_token_supply")
+    protocol_fee_amount_units = Parsed("protocol_fee_amount")
+    referral_fee_amount_units = Parsed("referral_fee_amount")
+
 @dataclass_json
 @dataclass(frozen=True, kw_only=True)
 class Operation:
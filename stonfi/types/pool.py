@@ -1,8 +1,11 @@
 from dataclasses_json import dataclass_json
 from dataclasses import dataclass
+from decimal import Decimal
+
+from stonfi.types._numeric import Parsed
 
 @dataclass_json
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class Pool:
     address: str
     apy_1d: str | None = None
@@ -29,3 +32,19 @@ class Pool:
     token1_address: str
     token1_balance: str | None = None
 
+    reserve0_units = Parsed("reserve0")
+    reserve1_units = Parsed("reserve1")
+    lp_total_supply_units = Parsed("lp_total_supply")
+    lp_balance_units = Parsed("lp_balance")
+    token0_balance_units = Parsed("token0_balance")
+    token1_balance_units = Parsed("token1_balance")
+    collected_token0_protocol_fee_units = Parsed("collected_token0_protocol_fee")
+    collected_token1_protocol_fee_units = Parsed("collected_token1_protocol_fee")
+    lp_fee_bps = Parsed("lp_fee")
+    protocol_fee_bps = Parsed("protocol_fee")
+    ref_fee_bps = Parsed("ref_fee")
+    apy_1d_decimal = Parsed("apy_1d", Decimal)
+    apy_7d_decimal = Parsed("apy_7d", Decimal)
+    apy_30d_decimal = Parsed("apy_30d", Decimal)
+    lp_price_usd_decimal = Parsed("lp_price_usd", Decimal)
+    lp_total_supply_usd_decimal = Parsed("lp_total_supply_usd", Decimal)
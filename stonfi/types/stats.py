@@ -12,7 +12,7 @@ class DexStats:
 
 
 @dataclass_json
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class PoolStats:
     apy: str | None = None
     base_id: str
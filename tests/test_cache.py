@@ -0,0 +1,57 @@
+import asyncio
+
+from stonfi import APIClient, ResponseCache
+from stonfi.offline import FakeStonfi
+
+
+def test_cache_is_opt_in():
+    assert APIClient().cache is None
+    assert isinstance(APIClient(cache=True).cache, ResponseCache)
+
+
+def test_empty_cache_instance_is_used():
+    # A fresh ResponseCache is empty, and therefore falsy, but still enabled.
+    cache = ResponseCache()
+    assert len(cache) == 0
+    api = FakeStonfi(pools=5, assets=5)
+
+    async def main():
+        async with APIClient(transport=api.transport(), cache=cache) as client:
+            assert client.cache is cache
+            address = api.assets[0]["contract_address"]
+            first = await client.get_asset(address)
+            requests = api.requests
+            assert await client.get_asset(address) == first
+            assert api.requests == requests
+
+    asyncio.run(main())
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_entries_expire_after_their_ttl():
+    cache = ResponseCache(ttl={"asset": 0.02})
+    cache.set(("asset", "a"), 1)
+    cache.set(("pool", "p"), 2)
+    assert cache.get(("asset", "a")) == 1
+    assert cache.get(("pool", "p")) is None
+    asyncio.run(asyncio.sleep(0.03))
+    assert cache.get(("asset", "a")) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(maxsize=2)
+    cache.set(("asset", "a"), 1)
+    cache.set(("asset", "b"), 2)
+    cache.get(("asset", "a"))
+    cache.set(("asset", "c"), 3)
+    assert cache.get(("asset", "a")) == 1
+    assert cache.get(("asset", "b")) is None
+    assert cache.invalidate("asset") == 2
+
+
+def test_cached_lists_are_copies():
+    cache = ResponseCache()
+    cache.set(("assets",), [1, 2])
+    cache.get(("assets",)).append(3)
+    assert cache.get(("assets",)) == [1, 2]
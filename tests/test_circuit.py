@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+from stonfi import APIClient, CircuitBreaker, CircuitOpenError, RateLimiter, ResponseCache
+
+
+class Flaky:
+    """A transport handler whose pool list fails, hangs or succeeds on demand."""
+
+    def __init__(self):
+        self.mode = "ok"
+        self.statuses: list[int] = []
+
+    async def __call__(self, request):
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), headers={"Retry-After": "0"}, json={})
+        if self.mode == "fail":
+            return httpx.Response(503, json={})
+        if self.mode == "hang":
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"pool_list": []})
+
+
+def test_circuit_breaker_is_opt_in():
+    assert APIClient().circuit_breaker is None
+    assert isinstance(APIClient(circuit_breaker=True).circuit_breaker, CircuitBreaker)
+
+
+def client_for(handler, **kwargs):
+    breaker = CircuitBreaker(min_calls=2, window=10.0, open_for=0.05)
+    return APIClient(transport=httpx.MockTransport(handler), circuit_breaker=breaker, **kwargs)
+
+
+async def open_circuit(client, handler):
+    handler.mode = "fail"
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_pools()
+    with pytest.raises(CircuitOpenError):
+        await client.get_pools()
+    handler.mode = "ok"
+    await asyncio.sleep(0.06)
+
+
+def test_cancelled_while_rate_limited_does_not_hold_the_probe():
+    async def main():
+        handler = Flaky()
+        async with client_for(handler) as client:
+            await open_circuit(client, handler)
+            client.rate_limiter = RateLimiter(limits={"default": (0.01, 1)})
+            await client.rate_limiter.acquire("pools")
+
+            async def consume():
+                return [pool async for pool in client.iter_pools()]
+
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            client.rate_limiter = None
+            assert await client.get_pools() == []
+            assert client.circuit_breaker.stats()["pools"]["state"] == "closed"
+
+    asyncio.run(main())
+
+
+def test_cancelled_probe_is_released():
+    async def main():
+        handler = Flaky()
+        async with client_for(handler) as client:
+            await open_circuit(client, handler)
+            handler.mode = "hang"
+            task = asyncio.ensure_future(client.get_pools())
+            await asyncio.sleep(0.01)
+            assert client.circuit_breaker.is_open("pools")
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            handler.mode = "ok"
+            assert await client.get_pools() == []
+
+    asyncio.run(main())
+
+
+def test_stream_retries_throttled_responses():
+    async def main():
+        handler = Flaky()
+        handler.statuses = [429, 503]
+        limiter = RateLimiter(backoff_base=0.001)
+        async with client_for(handler, rate_limiter=limiter) as client:
+            assert [pool async for pool in client.iter_pools()] == []
+        assert limiter.throttled == {"default": 2}
+
+    asyncio.run(main())
+
+
+def test_open_circuit_serves_stale_values():
+    async def main():
+        handler = Flaky()
+        cache = ResponseCache(ttl={"pools": 0.01}, stale_ttl=60.0)
+        async with client_for(handler, cache=cache) as client:
+            assert await client.get_pools() == []
+            await asyncio.sleep(0.02)
+            handler.mode = "fail"
+            for _ in range(2):
+                client.circuit_breaker.record("pools", 0.0, True)
+            assert client.circuit_breaker.is_open("pools")
+            assert await client.get_pools() == []
+            assert client.response_info.stale
+            assert not client._refreshes
+
+    asyncio.run(main())
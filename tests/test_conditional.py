@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+from stonfi import APIClient
+from stonfi.offline import FakeStonfi
+
+
+class Spy(httpx.AsyncBaseTransport):
+    """Passes requests through and remembers their headers and response statuses."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+        self.requests: list[httpx.Request] = []
+        self.statuses: list[int] = []
+
+    async def handle_async_request(self, request):
+        self.requests.append(request)
+        response = await self.inner.handle_async_request(request)
+        self.statuses.append(response.status_code)
+        return response
+
+
+def test_not_modified_lists_are_reused():
+    api = FakeStonfi(pools=30, assets=10)
+    spy = Spy(api.transport())
+
+    async def main():
+        async with APIClient(transport=spy) as client:
+            first = await client.get_pools()
+            second = await client.get_pools()
+            assert second == first
+            api.tick(0.5)
+            third = await client.get_pools()
+            assert third != first
+            assert [pool.reserve0 for pool in third] == [pool["reserve0"] for pool in api.pools]
+
+    asyncio.run(main())
+    assert spy.statuses == [200, 304, 200]
+    assert "if-none-match" not in spy.requests[0].headers
+    assert spy.requests[1].headers["if-none-match"] == spy.requests[2].headers["if-none-match"]
+
+
+def test_conditional_requests_can_be_disabled():
+    api = FakeStonfi(pools=5, assets=5)
+    spy = Spy(api.transport())
+
+    async def main():
+        async with APIClient(transport=spy, conditional=False) as client:
+            await client.get_pools()
+            await client.get_pools()
+
+    asyncio.run(main())
+    assert spy.statuses == [200, 200]
+    assert all("if-none-match" not in request.headers for request in spy.requests)
@@ -0,0 +1,112 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+import db
+from stonfi import APIClient
+from stonfi.offline import FakeStonfi
+from stonfi.types import Pool, decoder
+
+
+decode_pool = decoder(Pool)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = db.create_database(f"sqlite:///{tmp_path / 'pools.db'}")
+    db.migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+def pools(api):
+    return [decode_pool(pool) for pool in api.pools]
+
+
+def test_migrate_upgrades_a_legacy_table(tmp_path):
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE pools (id INTEGER PRIMARY KEY, name VARCHAR, address VARCHAR)")
+        connection.executemany(
+            "INSERT INTO pools (name, address) VALUES (?, ?)", [("first", "EQa"), ("second", "EQb"), ("copy", "EQa")]
+        )
+    engine = db.create_database(f"sqlite:///{path}")
+    db.migrate(engine)
+    db.migrate(engine)
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        rows = connection.exec_driver_sql("SELECT name, address, token_lqd FROM pools ORDER BY id").all()
+    assert rows == [("first", "EQa", None), ("second", "EQb", None)]
+    with pytest.raises(IntegrityError), engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO pools (name, address) VALUES ('again', 'EQb')")
+    engine.dispose()
+
+
+def test_sync_writes_only_the_differences(engine):
+    api = FakeStonfi(pools=50, assets=10)
+    first = db.sync_pools(pools(api), engine)
+    assert (first.inserted, first.updated, first.deleted) == (50, 0, 0)
+    assert db.count_pools(engine) == 50
+
+    again = db.sync_pools(pools(api), engine)
+    assert (again.inserted, again.updated, again.deleted) == (0, 0, 0)
+
+    # Reserves are not stored, so only the token change counts as an update.
+    api.tick(0.5)
+    api.pools[0]["token1_address"] = "EQrelisted"
+    removed = api.pools.pop()["address"]
+    api.pools.append({**api.pools[2], "address": "EQnew"})
+    result = db.sync_pools(pools(api), engine)
+    assert (result.inserted, result.updated, result.deleted) == (1, 1, 1)
+    with engine.connect() as connection:
+        addresses = {address for (address,) in connection.exec_driver_sql("SELECT address FROM pools")}
+        token_base = connection.exec_driver_sql(
+            "SELECT token_base FROM pools WHERE address = ?", (api.pools[0]["address"],)
+        ).scalar()
+    assert addresses == {pool["address"] for pool in api.pools} and removed not in addresses
+    assert token_base == "EQrelisted"
+
+
+def test_watchlist_skips_deleted_pools(engine):
+    api = FakeStonfi(pools=5, assets=5)
+    db.sync_pools(pools(api), engine)
+    watched = [api.pools[3]["address"], api.pools[0]["address"], api.pools[4]["address"]]
+    for address in watched:
+        assert db.add_watchlist_entry(7, address, engine)
+    db.add_watchlist_entry(8, api.pools[1]["address"], engine)
+    db.sync_pools(pools(api)[:4], engine)
+    assert [pool.address for pool in db.get_watchlist(7, engine)] == watched[:2]
+    assert db.get_watchlist(9, engine) == []
+
+
+def test_watchlist_rejects_unknown_pools(engine):
+    api = FakeStonfi(pools=2, assets=2)
+    api.pools[0]["address"] = "EQpool_with_underscores"
+    db.sync_pools(pools(api), engine)
+    assert not db.add_watchlist_entry(7, "EQpool", engine)
+    assert db.add_watchlist_entry(7, "EQpool_with_underscores", engine)
+    assert [pool.address for pool in db.get_watchlist(7, engine)] == ["EQpool_with_underscores"]
+
+
+def test_refresh_runs_the_sync_in_the_executor(engine, monkeypatch):
+    api = FakeStonfi(pools=20, assets=5)
+    threads = []
+    sync_pools = db.sync_pools
+
+    def spy(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return sync_pools(*args, **kwargs)
+
+    monkeypatch.setattr(db, "sync_pools", spy)
+
+    async def main():
+        async with APIClient(transport=api.transport()) as client:
+            return await db.refresh_pools(client, engine)
+
+    result = asyncio.run(main())
+    assert result.inserted == 20
+    assert threads and threads[0].startswith("db")
+    assert asyncio.run(db.run_db(db.count_pools, engine)) == 20
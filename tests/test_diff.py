@@ -0,0 +1,84 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+from stonfi import APIClient, PoolChange, PoolDiff
+from stonfi.offline import FakeStonfi
+
+
+def snapshots(api, steps):
+    """Fetches the pool list, then runs every step against `api` and fetches it again."""
+
+    async def main():
+        async with APIClient(transport=api.transport()) as client:
+            result = [await client.get_pools()]
+            for step in steps:
+                step()
+                result.append(await client.get_pools())
+            return result
+
+    return asyncio.run(main())
+
+
+def test_reports_added_changed_and_removed_pools():
+    api = FakeStonfi(pools=100, seed=3)
+    changed = []
+    removed = api.pools[-1]["address"]
+
+    def remove_last():
+        api.pools.pop()
+        api.tick(0.0)  # publishes the shorter list under a new ETag
+
+    first, second, third = snapshots(api, [lambda: changed.extend(api.tick(0.1)), remove_last])
+    diff = PoolDiff()
+    assert {event.change for event in diff.update(first)} == {PoolChange.ADDED}
+    assert len(diff) == 100
+    events = diff.update(second)
+    assert {event.change for event in events} == {PoolChange.CHANGED}
+    assert {event.address for event in events} == set(changed)
+    assert all(event.pool.address == event.address for event in events)
+    assert [(event.change, event.address, event.pool) for event in diff.update(third)] == [
+        (PoolChange.REMOVED, removed, None)
+    ]
+    assert diff.update(third) == []
+
+
+def test_restored_fingerprints_continue_where_they_left_off():
+    api = FakeStonfi(pools=50, seed=4)
+    first, second = snapshots(api, [lambda: api.tick(0.2)])
+    diff = PoolDiff()
+    diff.update(first)
+    restored = PoolDiff(diff.fingerprints)
+    assert restored.update(second) == diff.update(second)
+
+
+def test_fingerprints_are_stable_across_processes():
+    pool = snapshots(FakeStonfi(pools=1), [])[0][0]
+    script = (
+        "import asyncio; from stonfi import APIClient, PoolDiff; from stonfi.offline import FakeStonfi\n"
+        "async def main():\n"
+        "    async with APIClient(transport=FakeStonfi(pools=1).transport()) as client:\n"
+        "        print(PoolDiff().fingerprint((await client.get_pools())[0]))\n"
+        "asyncio.run(main())\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=root).stdout
+    assert int(output) == PoolDiff().fingerprint(pool)
+
+
+def test_apply_never_reports_removals():
+    api = FakeStonfi(pools=20, seed=5)
+    first, second = snapshots(api, [lambda: api.tick(0.5)])
+    diff = PoolDiff()
+    diff.update(first[1:])
+    partial = second[:5]
+    expected = [first[0].address] + [
+        new.address for old, new in zip(first[1:5], partial[1:]) if old.reserve0 != new.reserve0
+    ]
+    events = diff.apply(partial)
+    assert [event.address for event in events] == expected
+    assert events[0].change == PoolChange.ADDED
+    assert all(event.change == PoolChange.CHANGED for event in events[1:])
+    assert len(diff) == 20
+    assert diff.apply(partial) == []
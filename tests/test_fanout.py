@@ -0,0 +1,149 @@
+import asyncio
+import math
+from functools import partial
+
+import httpx
+import pytest
+
+from stonfi import APIClient
+from stonfi import _fanout
+from stonfi._fanout import AdaptiveLimit, fan_out
+from stonfi.offline import FakeStonfi
+
+
+def test_adaptive_limit_halves_on_errors_and_grows_back():
+    limit = AdaptiveLimit(8, minimum=2)
+    limit.on_error()
+    assert int(limit) == 4
+    for _ in range(5):
+        limit.on_error()
+    assert int(limit) == 2 and limit.value == 2
+
+    successes = 0
+    while int(limit) < 8:
+        limit.on_success(0.01)
+        successes += 1
+    assert 20 < successes < 40
+    for _ in range(100):
+        limit.on_success(0.01)
+    assert limit.value == 8
+
+
+def test_adaptive_limit_shrinks_when_latency_rises():
+    limit = AdaptiveLimit(8)
+    for _ in range(10):
+        limit.on_success(0.01)
+    for _ in range(10):
+        limit.on_success(0.1)
+    assert limit.value < 8
+    # The best latency is kept, so the limit only recovers once latency drops back.
+    for _ in range(100):
+        limit.on_success(0.1)
+    assert int(limit) == 1
+    for _ in range(100):
+        limit.on_success(0.01)
+    assert limit.value == 8
+
+
+def test_fan_out_reports_failures_on_their_keys():
+    async def fetch(key):
+        await asyncio.sleep(0.001 * (10 - key))
+        if key % 3 == 0:
+            raise LookupError(key)
+        return key * 10
+
+    async def main():
+        return [result async for result in fan_out(range(10), fetch, concurrency=4, adaptive=False)]
+
+    results = asyncio.run(main())
+    assert sorted(result.key for result in results) == list(range(10))
+    for result in results:
+        if result.key % 3 == 0:
+            assert not result.ok and result.value is None and result.error.args == (result.key,)
+        else:
+            assert result.ok and result.value == result.key * 10
+
+
+def test_fan_out_yields_in_completion_order():
+    # Each call is released only after the previous result was yielded, whatever order they start in.
+    async def fetch(key):
+        await released[key].wait()
+        return key
+
+    async def main():
+        released.extend(asyncio.Event() for _ in range(4))
+        released[0].set()
+        keys = []
+        async for result in fan_out([3, 1, 2, 0], fetch, concurrency=4):
+            keys.append(result.key)
+            if result.key + 1 < len(released):
+                released[result.key + 1].set()
+        return keys
+
+    released = []
+    assert asyncio.run(main()) == [0, 1, 2, 3]
+
+
+def test_fan_out_cancels_pending_calls_when_closed():
+    cancelled = []
+
+    async def fetch(key):
+        try:
+            await asyncio.sleep(0 if key == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(key)
+            raise
+        return key
+
+    async def main():
+        results = fan_out(range(4), fetch, concurrency=4)
+        first = await anext(results)
+        await results.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    assert asyncio.run(main()).key == 0
+    assert sorted(cancelled) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_pools_by_address_backs_off_and_recovers(status, monkeypatch):
+    # Only errors move the limit here; scheduling jitter must not look like a latency rise.
+    monkeypatch.setattr(_fanout, "AdaptiveLimit", partial(AdaptiveLimit, latency_tolerance=math.inf))
+    api = FakeStonfi(pools=100, assets=10)
+    inner = api.transport()
+    arrivals = []
+    in_flight = 0
+
+    async def handler(request):
+        nonlocal in_flight
+        in_flight += 1
+        arrivals.append(in_flight)
+        try:
+            await asyncio.sleep(0.002)
+            if len(arrivals) <= 8:
+                return httpx.Response(status, json={"error": "throttled"})
+            return await inner.handle_async_request(request)
+        finally:
+            in_flight -= 1
+
+    addresses = [pool["address"] for pool in api.pools]
+
+    async def main():
+        async with APIClient(transport=httpx.MockTransport(handler)) as client:
+            return [result async for result in client.get_pools_by_address(addresses, concurrency=8)]
+
+    results = asyncio.run(main())
+
+    # The first round fails as a whole, which drops the limit to a single call in flight.
+    assert arrivals[:8] == list(range(1, 9))
+    assert arrivals[8:10] == [1, 1]
+    # Successful calls raise it back to the full concurrency.
+    assert max(arrivals[8:]) == 8
+
+    assert sorted(result.key for result in results) == sorted(addresses)
+    failed = [result for result in results if not result.ok]
+    assert len(failed) == 8
+    assert all(isinstance(result.error, httpx.HTTPStatusError) for result in failed)
+    assert {result.error.response.status_code for result in failed} == {status}
+    assert all(result.value.address == result.key for result in results if result.ok)
@@ -0,0 +1,105 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from stonfi import PoolHistory
+from stonfi._history import DAY, HOUR, MINUTE, RAW
+from stonfi.offline import FakeStonfi
+from stonfi.types import Pool, decoder
+
+
+decode_pool = decoder(Pool)
+TEMPLATE = FakeStonfi(pools=1).pools[0]
+START = 1_700_000_000 - 1_700_000_000 % DAY
+
+
+def pool(address, reserve0, reserve1, supply=10**12):
+    return decode_pool({
+        **TEMPLATE,
+        "address": address,
+        "reserve0": str(reserve0),
+        "reserve1": str(reserve1),
+        "lp_total_supply": str(supply),
+    })
+
+
+def series(seed, count, step):
+    """`count` states of two pools, `step` seconds apart, as (ts, pools) pairs."""
+    rng = random.Random(seed)
+    reserves = {"A": [10**15, 10**12], "B": [5 * 10**9, 7 * 10**9]}
+    result = []
+    for i in range(count):
+        for values in reserves.values():
+            values[0] += rng.randrange(-10**6, 10**6)
+            values[1] += rng.randrange(-10**6, 10**6)
+        result.append((START + i * step, [pool(address, *values) for address, values in reserves.items()]))
+    return result
+
+
+def states(snapshots):
+    return [(snapshot.ts, snapshot.reserve0, snapshot.reserve1) for snapshot in snapshots]
+
+
+def expected(points, address, resolution=RAW):
+    buckets = {}
+    for ts, pools in points:
+        (p,) = [p for p in pools if p.address == address]
+        buckets[ts - ts % resolution if resolution else ts] = (p.reserve0_units, p.reserve1_units)
+    return [(ts, *values) for ts, values in sorted(buckets.items())]
+
+
+def test_round_trip_across_keyframes_and_reopening(tmp_path):
+    points = series(1, 50, 10)
+    history = PoolHistory(tmp_path / "history.db", keyframe_interval=4)
+    for ts, pools in points[:30]:
+        assert history.record(pools, ts) == 2
+    history.close()
+
+    history = PoolHistory(tmp_path / "history.db", keyframe_interval=4)
+    for ts, pools in points[30:]:
+        history.record(pools, ts)
+    for address in ("A", "B"):
+        assert states(history.history(address, START, START + DAY)) == expected(points, address)
+    assert states(history.history("A", START + 100, START + 200)) == expected(points[10:21], "A")
+    assert history.history("missing", START) == []
+
+
+def test_unchanged_pools_are_skipped_and_time_must_advance(tmp_path):
+    history = PoolHistory(tmp_path / "history.db")
+    history.record([pool("A", 1, 2), pool("B", 3, 4)], START)
+    assert history.record([pool("A", 1, 2), pool("B", 3, 5)], START + 1) == 1
+    with pytest.raises(ValueError):
+        history.record([pool("C", 1, 1), pool("B", 3, 6)], START + 1)
+    # The failed snapshot was rolled back as a whole, including the new pool.
+    assert len(history) == 2
+    assert history.record([pool("C", 1, 1), pool("B", 3, 6)], START + 2) == 2
+
+
+def test_compaction_rolls_up_and_keeps_recording(tmp_path):
+    points = series(2, 3 * 24 * 60, 60)  # three days, one state per minute
+    history = PoolHistory(
+        tmp_path / "history.db",
+        retention={RAW: timedelta(days=1), MINUTE: timedelta(days=2)},
+        keyframe_interval=16,
+    )
+    for ts, pools in points:
+        history.record(pools, ts)
+    now = START + 3 * DAY
+    deleted = history.compact(now)
+    assert deleted[RAW] > 0 and deleted[MINUTE] > 0
+    assert history.compact(now) == {RAW: 0, MINUTE: 0, HOUR: 0}
+
+    for address in ("A", "B"):
+        # Recent raw rows are intact; older ones are answered from the rollups.
+        recent = history.history(address, now - DAY, now)
+        assert states(recent) == expected([p for p in points if p[0] >= now - DAY], address)
+        hourly = history.history(address, START, now, resolution=HOUR)
+        assert states(hourly) == expected(points, address, HOUR)
+
+    # New rows are encoded against the rewritten keyframe.
+    later = series(3, 5, 60)
+    later = [(now + i * 60, pools) for i, (_, pools) in enumerate(later)]
+    for ts, pools in later:
+        history.record(pools, ts)
+    assert states(history.history("A", now, now + HOUR)) == expected(later, "A")
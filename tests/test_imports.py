@@ -0,0 +1,20 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_import_does_not_load_numpy():
+    code = "import sys, stonfi; assert 'numpy' not in sys.modules; from stonfi import APIClient"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+
+
+def test_pool_table_is_loaded_on_demand():
+    import stonfi
+
+    assert stonfi.PoolTable.__name__ == "PoolTable"
+    from stonfi import Quotes
+
+    assert Quotes.__name__ == "Quotes"
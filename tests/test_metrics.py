@@ -0,0 +1,53 @@
+import asyncio
+
+import httpx
+import pytest
+
+from stonfi import APIClient, Metrics, RequestEvent, ResponseCache
+from stonfi.offline import FakeStonfi
+
+
+def test_metrics_are_opt_in():
+    assert APIClient().metrics is None
+    assert isinstance(APIClient(metrics=True).metrics, Metrics)
+
+
+def test_histogram_and_quantiles():
+    metrics = Metrics(buckets=(0.01, 0.1, 1.0))
+    for latency in (0.005, 0.05, 0.05, 0.5):
+        metrics.record(RequestEvent("pool", "GET", "/v1/pools/x", 200, latency=latency, bytes=10))
+    metrics.record(RequestEvent("pool", "GET", "/v1/pools/x", None, error=httpx.ConnectError("down")))
+    snapshot = metrics.snapshot()["pool"]
+    assert snapshot["count"] == 5
+    assert snapshot["errors"] == 1
+    assert snapshot["status"] == {200: 4, None: 1}
+    assert list(snapshot["latency"]["buckets"].values()) == [1, 2, 1, 0]
+    assert snapshot["latency"]["p50"] == 0.1
+    assert snapshot["latency"]["max"] == 0.5
+    assert snapshot["bytes"] == 40
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_client_records_round_trips_but_not_cache_hits():
+    api = FakeStonfi(pools=20, seed=1)
+    events = []
+
+    async def main():
+        async with APIClient(transport=api.transport(), cache=ResponseCache(ttl={"pools": 60.0}), metrics=True) as client:
+            client.metrics.add_hook(events.append)
+            await client.get_pools()
+            await client.get_pools()
+            pool = await client.get_pool(api.pools[0]["address"])
+            assert pool.address == api.pools[0]["address"]
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_pool("EQmissing")
+            return client.metrics.snapshot()
+
+    snapshot = asyncio.run(main())
+    assert snapshot["pools"]["count"] == 1
+    assert snapshot["pools"]["bytes"] > 0
+    assert snapshot["pool"]["count"] == 2
+    assert snapshot["pool"]["errors"] == 1
+    assert snapshot["pool"]["status"] == {200: 1, 404: 1}
+    assert [event.endpoint for event in events] == ["pools", "pool", "pool"]
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+import pytest
+
+from stonfi import APIClient
+from stonfi.offline import FakeStonfi, RecordingTransport, ReplayTransport
+from stonfi.types import SwapSimulateData
+
+
+async def session(client, api):
+    pool = api.pools[3]
+    data = SwapSimulateData(
+        offer_address=pool["token0_address"],
+        ask_address=pool["token1_address"],
+        units="1000000",
+        slippage_tolerance="0.01",
+    )
+    return [
+        await client.get_pools(),
+        await client.get_assets(),
+        await client.get_farms(),
+        await client.get_pool(pool["address"]),
+        await client.get_asset(api.assets[2]["contract_address"]),
+        await client.swap_simulate(data),
+        await client.reverse_swap_simulate(data),
+    ]
+
+
+def test_replays_what_was_recorded(tmp_path):
+    api = FakeStonfi(pools=30, assets=10, farms=5, seed=5)
+
+    async def record():
+        async with APIClient(base_url="http://fake", transport=RecordingTransport(tmp_path, api.transport())) as client:
+            return await session(client, api)
+
+    async def replay():
+        # Recordings are not keyed on the host.
+        async with APIClient(base_url="http://elsewhere", transport=ReplayTransport(tmp_path)) as client:
+            return await session(client, api), await session(client, api)
+
+    recorded = asyncio.run(record())
+    requests = api.requests
+    api.tick(0.5)
+    first, second = asyncio.run(replay())
+    assert first == recorded and second == recorded
+    assert api.requests == requests
+    assert len(list(tmp_path.glob("*.json"))) == len(recorded)
+
+
+def test_unrecorded_requests_fail_with_a_clear_error(tmp_path):
+    api = FakeStonfi(pools=3, assets=3, seed=5)
+
+    async def record():
+        async with APIClient(base_url="http://fake", transport=RecordingTransport(tmp_path, api.transport())) as client:
+            await client.get_pool(api.pools[0]["address"])
+
+    async def replay(address):
+        async with APIClient(base_url="http://fake", transport=ReplayTransport(tmp_path)) as client:
+            return await client.get_pool(address)
+
+    asyncio.run(record())
+    assert asyncio.run(replay(api.pools[0]["address"])).address == api.pools[0]["address"]
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        asyncio.run(replay(api.pools[1]["address"]))
+    assert error.value.response.status_code == 404
+    assert error.value.response.json() == {"error": f"no recording for GET /v1/pools/{api.pools[1]['address']}"}
@@ -0,0 +1,49 @@
+import asyncio
+
+import httpx
+import pytest
+
+from stonfi import APIClient, RateLimiter
+from stonfi._ratelimit import parse_retry_after
+
+
+def test_rate_limiter_is_opt_in():
+    assert APIClient().rate_limiter is None
+    assert isinstance(APIClient(rate_limiter=True).rate_limiter, RateLimiter)
+
+
+def test_retries_throttled_responses():
+    statuses = iter([429, 503, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, headers={"Retry-After": "0"}, json={"pool_list": []})
+
+    async def main():
+        limiter = RateLimiter(backoff_base=0.001)
+        async with APIClient(transport=httpx.MockTransport(handler), rate_limiter=limiter) as client:
+            assert await client.get_pools() == []
+        return limiter
+
+    limiter = asyncio.run(main())
+    assert limiter.throttled == {"default": 2}
+
+
+def test_gives_up_after_max_retries():
+    def handler(request):
+        return httpx.Response(503, headers={"Retry-After": "0"}, json={})
+
+    async def main():
+        limiter = RateLimiter(max_retries=1, backoff_base=0.001)
+        async with APIClient(transport=httpx.MockTransport(handler), rate_limiter=limiter) as client:
+            await client.get_pools()
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        asyncio.run(main())
+    assert error.value.response.status_code == 503
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
@@ -0,0 +1,92 @@
+import random
+
+from stonfi import Router
+from stonfi._simulate import amount_out
+from stonfi.offline import FakeStonfi
+from stonfi.types import Pool, decoder
+
+
+decode_pool = decoder(Pool)
+TEMPLATE = FakeStonfi(pools=1).pools[0]
+
+
+def pool(address, token0, token1, reserve0, reserve1, **fields):
+    return decode_pool({
+        **TEMPLATE,
+        "address": address,
+        "token0_address": token0,
+        "token1_address": token1,
+        "reserve0": str(reserve0),
+        "reserve1": str(reserve1),
+        **fields,
+    })
+
+
+def random_pools(seed, count=40, tokens=8):
+    rng = random.Random(seed)
+    names = [f"T{i}" for i in range(tokens)]
+    return [
+        pool(f"P{i}", *rng.sample(names, 2), rng.randrange(10**6, 10**9), rng.randrange(10**6, 10**9))
+        for i in range(count)
+    ]
+
+
+def brute_force(pools, offer, ask, units, max_hops):
+    """The best output over every simple path of up to `max_hops` pools."""
+    best = 0
+
+    def walk(token, amount, visited, hops):
+        nonlocal best
+        if token == ask:
+            best = max(best, amount)
+            return
+        if hops == max_hops:
+            return
+        for p in pools:
+            if token not in (p.token0_address, p.token1_address):
+                continue
+            if p.token0_address == token:
+                other, reserve_in, reserve_out = p.token1_address, p.reserve0_units, p.reserve1_units
+            else:
+                other, reserve_in, reserve_out = p.token0_address, p.reserve1_units, p.reserve0_units
+            if other in visited:
+                continue
+            out = amount_out(amount, reserve_in, reserve_out, p.lp_fee_bps, p.protocol_fee_bps)[0]
+            walk(other, out, visited | {other}, hops + 1)
+
+    walk(offer, units, {offer}, 0)
+    return best
+
+
+def test_best_route_matches_exhaustive_search():
+    for seed in range(5):
+        pools = random_pools(seed)
+        router = Router(pools)
+        for offer, ask in (("T0", "T1"), ("T2", "T5"), ("T7", "T3")):
+            for max_hops in (1, 2, 3):
+                route = router.best_route(offer, ask, 10**6, max_hops=max_hops)
+                expected = brute_force(pools, offer, ask, 10**6, max_hops)
+                assert (route.ask_units if route else 0) == expected
+                if route:
+                    assert route.tokens[0] == offer and route.tokens[-1] == ask
+                    assert len(route.pools) <= max_hops
+
+
+def test_route_amounts_follow_the_pools():
+    pools = [pool("A", "X", "Y", 10**9, 2 * 10**9), pool("B", "Y", "Z", 10**9, 10**9)]
+    route = Router(pools).best_route("X", "Z", 10**6)
+    assert route.tokens == ("X", "Y", "Z")
+    assert [p.address for p in route.pools] == ["A", "B"]
+    middle = amount_out(10**6, 10**9, 2 * 10**9, pools[0].lp_fee_bps, pools[0].protocol_fee_bps)[0]
+    assert route.amounts[1] == middle
+
+
+def test_update_and_remove_keep_the_index_current():
+    router = Router([pool("A", "X", "Y", 10**9, 10**9), pool("B", "Y", "Z", 10**9, 10**9)])
+    assert router.best_route("X", "Z", 1000) is not None
+    router.remove(["B"])
+    assert "B" not in router and router.best_route("X", "Z", 1000) is None
+    router.update([pool("C", "X", "Z", 10**9, 10**9)])
+    assert [p.address for p in router.best_route("X", "Z", 1000).pools] == ["C"]
+    router.update([pool("C", "X", "Z", 10**9, 10**9, deprecated=True), pool("D", "X", "Z", 0, 10**9)])
+    assert len(router) == 1 and router.pools_of("Z") == []
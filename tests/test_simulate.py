@@ -0,0 +1,64 @@
+import asyncio
+import dataclasses
+import random
+
+import pytest
+
+from stonfi import APIClient, simulate_reverse_swap, simulate_swap
+from stonfi.offline import FakeStonfi
+from stonfi.types import SwapSimulateData
+
+
+def fetch_pools(api):
+    async def main():
+        async with APIClient(transport=api.transport()) as client:
+            return await client.get_pools()
+
+    return asyncio.run(main())
+
+
+def test_matches_the_fake_api():
+    # FakeStonfi quotes with its own implementation of the router math.
+    api = FakeStonfi(pools=50, seed=7)
+    pools = fetch_pools(api)
+    rng = random.Random(7)
+
+    async def main():
+        async with APIClient(transport=api.transport()) as client:
+            for _ in range(100):
+                pool = rng.choice(pools)
+                offer, ask = rng.sample((pool.token0_address, pool.token1_address), 2)
+                reserve = min(pool.reserve0_units, pool.reserve1_units)
+                data = SwapSimulateData(
+                    offer_address=offer,
+                    ask_address=ask,
+                    units=str(rng.randrange(1, max(2, reserve // 10))),
+                    slippage_tolerance=rng.choice(("0.001", "0.01", "0.05")),
+                )
+                assert simulate_swap(pool, data) == await client.swap_simulate(data)
+                assert simulate_reverse_swap(pool, data) == await client.reverse_swap_simulate(data)
+
+    asyncio.run(main())
+
+
+def test_min_ask_units_is_exact_for_large_amounts():
+    pool = fetch_pools(FakeStonfi(pools=1, seed=1))[0]
+    pool = dataclasses.replace(pool, reserve0="9" * 40, reserve1="7" * 40)
+    data = SwapSimulateData(
+        offer_address=pool.token0_address,
+        ask_address=pool.token1_address,
+        units="1" + "0" * 30,
+        slippage_tolerance="0.003",
+    )
+    response = simulate_swap(pool, data)
+    ask_units = int(response.ask_units)
+    assert len(response.ask_units) >= 29
+    assert response.min_ask_units.isdigit()
+    assert int(response.min_ask_units) == ask_units * 997 // 1000
+
+
+def test_rejects_pools_that_do_not_trade_the_pair():
+    pool = fetch_pools(FakeStonfi(pools=1, seed=1))[0]
+    data = SwapSimulateData(offer_address="EQother", ask_address=pool.token1_address, units="1", slippage_tolerance="0")
+    with pytest.raises(ValueError):
+        simulate_swap(pool, data)
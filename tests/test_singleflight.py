@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+import pytest
+
+from stonfi import APIClient
+from stonfi.offline import FakeStonfi
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    api = FakeStonfi(pools=5, assets=5, latency=0.02)
+    address = api.pools[0]["address"]
+
+    async def main():
+        async with APIClient(transport=api.transport()) as client:
+            pools = await asyncio.gather(*(client.get_pool(address) for _ in range(10)))
+            assert all(pool == pools[0] for pool in pools)
+            await client.get_pool(address)
+
+    asyncio.run(main())
+    assert api.requests == 2
+
+
+def test_coalesced_callers_share_errors_and_survive_cancellation():
+    async def main():
+        gate = asyncio.Event()
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return httpx.Response(404, json={})
+
+        async with APIClient(transport=httpx.MockTransport(handler)) as client:
+            first = asyncio.ensure_future(client.get_pool("EQpool"))
+            others = [asyncio.ensure_future(client.get_pool("EQpool")) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            first.cancel()
+            gate.set()
+            results = await asyncio.gather(*others, return_exceptions=True)
+            assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+            with pytest.raises(asyncio.CancelledError):
+                await first
+        return calls
+
+    assert asyncio.run(main()) == 1
@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from stonfi import APIClient, StatsCache
+from stonfi._time import format_time, utcnow
+from stonfi.offline import FakeStonfi
+
+
+def counting(fake):
+    paths = []
+    handle = fake.handle
+
+    def counted(method, target, headers):
+        paths.append(target.split("?")[0])
+        return handle(method, target, headers)
+
+    fake.handle = counted
+    return paths
+
+
+def test_split_aligns_to_window(tmp_path):
+    cache = StatsCache(tmp_path / "stats.db")
+    assert cache.split("2024-01-01T12:00:00", "2024-01-03T06:00:00+00:00") == [
+        ("2024-01-01T12:00:00", "2024-01-02T00:00:00"),
+        ("2024-01-02T00:00:00", "2024-01-03T00:00:00"),
+        ("2024-01-03T00:00:00", "2024-01-03T06:00:00"),
+    ]
+    assert cache.split("2024-01-02", "2024-01-02") == []
+    cache.close()
+
+
+def test_closed_accepts_aware_and_rejects_garbage(tmp_path):
+    cache = StatsCache(tmp_path / "stats.db")
+    assert cache.closed("2024-01-01T00:00:00+00:00")
+    assert not cache.closed(format_time(utcnow() + timedelta(hours=1)))
+    assert not cache.closed("not a time")
+    cache.close()
+
+
+def test_long_range_only_refetches_open_window(tmp_path):
+    fake = FakeStonfi(pools=20, assets=10, operations_per_day=24)
+    paths = counting(fake)
+    today = datetime.combine(utcnow().date(), datetime.min.time())
+    since = format_time(today - timedelta(days=30))
+
+    async def report(until):
+        async with APIClient(transport=fake.transport(), base_url="http://fake", stats_cache=str(tmp_path / "stats.db")) as client:
+            return await client.get_operations_stats(since, until)
+
+    first = asyncio.run(report(format_time(today)))
+    assert paths.count("/v1/stats/operations") == 30
+
+    paths.clear()
+    again = asyncio.run(report(format_time(today)))
+    assert paths == []
+    assert [op.operation.pool_tx_hash for op in again] == [op.operation.pool_tx_hash for op in first]
+
+    paths.clear()
+    asyncio.run(report(format_time(utcnow() + timedelta(minutes=1))))
+    assert paths == ["/v1/stats/operations"]
+
+
+def test_aggregate_stats_are_cached_per_exact_window(tmp_path):
+    fake = FakeStonfi(pools=20, assets=10)
+    paths = counting(fake)
+
+    async def report():
+        async with APIClient(transport=fake.transport(), base_url="http://fake", stats_cache=str(tmp_path / "stats.db")) as client:
+            return await client.get_dex_stats("2024-01-01T00:00:00", "2024-01-08T00:00:00")
+
+    assert asyncio.run(report()) == asyncio.run(report())
+    assert paths == ["/v1/stats/dex"]
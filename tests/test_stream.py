@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from stonfi import APIClient
+from stonfi._stream import iter_json_array
+from stonfi.offline import FakeStonfi
+
+
+async def pieces(text, size):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def decode(text, key, size):
+    async def main():
+        return [item async for item in iter_json_array(pieces(text, size), key)]
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"pairs":[12345,67890]}', [12345, 67890]),
+    ('{"pairs" : [ -1.5e3 , 0, true, null, "a]\\"b", {"pairs":[7]}, [8] ]}', [-1500.0, 0, True, None, 'a]"b', {"pairs": [7]}, [8]]),
+    ('{"other":{"pairs":[1]},"pairs":[2,3]}', [2, 3]),
+    ('{"x":[{"pairs":[1]}],"note":"\\"pairs\\":[9]","list":["pairs"],"pairs":[]}', []),
+])
+def test_items_survive_every_chunk_boundary(text, expected):
+    assert json.loads(text)["pairs"] == expected
+    for size in range(1, len(text) + 1):
+        assert decode(text, "pairs", size) == expected
+
+
+@pytest.mark.parametrize("text, error", [
+    ('{"other":{"pairs":[1]}}', "not found"),
+    ('{"pairs":[1,2', "truncated"),
+    ('{"pairs":[1,{"a":', "truncated"),
+])
+def test_missing_and_truncated_arrays(text, error):
+    for size in (1, 3, len(text)):
+        with pytest.raises(ValueError, match=error):
+            decode(text, "pairs", size)
+
+
+class Rechunked(httpx.AsyncBaseTransport):
+    """Serves FakeStonfi bodies in tiny chunks, behind a nested decoy of the list key."""
+
+    def __init__(self, api: FakeStonfi, size: int):
+        self.inner = api.transport()
+        self.size = size
+
+    async def handle_async_request(self, request):
+        response = await self.inner.handle_async_request(request)
+        body = (await response.aread()).decode()
+        key = next(iter(json.loads(body)))
+        body = '{"decoy":{"%s":[{"address":"EQdecoy"}]},%s' % (key, body[1:])
+
+        async def stream():
+            for i in range(0, len(body), self.size):
+                yield body[i:i + self.size].encode()
+
+        return httpx.Response(response.status_code, content=stream(), request=request)
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_client_lists_stream_in_small_chunks(size):
+    api = FakeStonfi(pools=30, assets=15, seed=2)
+
+    async def main():
+        async with APIClient(transport=Rechunked(api, size), conditional=False) as client:
+            return (
+                [pool async for pool in client.iter_pools()],
+                [asset async for asset in client.iter_assets()],
+                [farm async for farm in client.iter_farms()],
+            )
+
+    pools, assets, farms = asyncio.run(main())
+
+    async def reference():
+        async with APIClient(transport=api.transport(), conditional=False) as client:
+            return await client.get_pools(), await client.get_assets(), await client.get_farms()
+
+    assert (pools, assets, farms) == asyncio.run(reference())
+    assert [pool.reserve0 for pool in pools] == [pool["reserve0"] for pool in api.pools]
+    assert farms
@@ -0,0 +1,87 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from stonfi import PoolTable
+from stonfi._simulate import amount_in, amount_out
+from stonfi.offline import FakeStonfi
+from stonfi.types import Pool, decoder
+
+
+decode_pool = decoder(Pool)
+
+FRACTIONS = np.logspace(-6, -0.5, 12)
+
+
+@pytest.fixture
+def table():
+    return PoolTable([decode_pool(pool) for pool in FakeStonfi(pools=40, seed=11).pools])
+
+
+def reserves(pool, offer_token0):
+    if offer_token0:
+        return pool.reserve0_units, pool.reserve1_units
+    return pool.reserve1_units, pool.reserve0_units
+
+
+@pytest.mark.parametrize("referral", [False, True])
+def test_quote_matches_the_router_math(table, referral):
+    offer_token0 = np.arange(len(table)) % 2 == 0
+    reserve_in = np.where(offer_token0, table.reserve0, table.reserve1)
+    quotes = table.quote(np.floor(reserve_in[:, None] * FRACTIONS), offer_token0, referral=referral)
+    assert quotes.ask.shape == (len(table), len(FRACTIONS))
+
+    for row, pool in enumerate(table.pools):
+        ref_fee = (pool.ref_fee_bps or 0) if referral else 0
+        for column in range(len(FRACTIONS)):
+            offer = int(quotes.offer[row, column])
+            ask, protocol_fee, ref_fee_out = amount_out(
+                offer, *reserves(pool, offer_token0[row]), pool.lp_fee_bps, pool.protocol_fee_bps, ref_fee
+            )
+            # Float64 skips the floor of the output and the ceiling of each fee.
+            rounding = 2 + bool(ref_fee)
+            assert quotes.ask[row, column] == pytest.approx(ask, rel=1e-12, abs=rounding)
+            assert quotes.fee[row, column] == pytest.approx(protocol_fee + ref_fee_out, rel=1e-12, abs=rounding)
+            assert quotes.swap_rate[row, column] == pytest.approx(ask / offer, rel=1e-12, abs=rounding / offer)
+    assert np.all(np.diff(quotes.price_impact, axis=1) >= 0)
+
+
+def test_quote_broadcasts_a_ladder_over_all_pools(table):
+    ladder = [10**3, 10**6, 10**9]
+    quotes = table.quote(ladder, offer_token0=False)
+    assert quotes.ask.shape == (len(table), 3)
+    np.testing.assert_array_equal(quotes.offer, np.broadcast_to(ladder, (len(table), 3)))
+    single = table.where(np.array([5])).quote(ladder, offer_token0=False)
+    np.testing.assert_array_equal(single.ask[0], quotes.ask[5])
+
+
+def test_reverse_quote_offers_are_within_the_rounding_of_the_ask(table):
+    # As documented, reverse offers may differ from `amount_in` by the offer
+    # equivalent of a couple of base units of the asked token.
+    reserve_out = table.reserve1
+    quotes = table.quote(np.floor(reserve_out[:, None] * FRACTIONS), reverse=True)
+    for row, pool in enumerate(table.pools):
+        fees = (pool.reserve0_units, pool.reserve1_units, pool.lp_fee_bps, pool.protocol_fee_bps)
+        for column in range(len(FRACTIONS)):
+            wanted = int(reserve_out[row] * FRACTIONS[column])
+            offer = quotes.offer[row, column]
+            assert amount_in(max(wanted - 2, 1), *fees) - 1 <= offer <= amount_in(wanted + 2, *fees)
+            # The ask of a reverse quote is what its offer yields, i.e. the wanted amount.
+            assert quotes.ask[row, column] == pytest.approx(wanted, rel=1e-9, abs=1e-6)
+
+
+def test_reverse_quote_is_nan_beyond_the_liquidity(table):
+    pool = table.pools[0]
+    quotes = table.where(np.array([0])).quote([pool.reserve1_units // 2, pool.reserve1_units], reverse=True)
+    assert np.isfinite(quotes.offer[0, 0]) and np.isfinite(quotes.ask[0, 0])
+    assert np.isnan(quotes.offer[0, 1]) and np.isnan(quotes.ask[0, 1])
+    with pytest.raises(ValueError):
+        amount_in(pool.reserve1_units, pool.reserve0_units, pool.reserve1_units, pool.lp_fee_bps, pool.protocol_fee_bps)
+
+
+def test_empty_pools_quote_nothing_at_an_unknown_impact(table):
+    empty = PoolTable([dataclasses.replace(table.pools[0], reserve0="0", reserve1="0")])
+    quotes = empty.quote([1000.0])
+    assert quotes.ask[0, 0] == 0 and np.isnan(quotes.price_impact[0, 0])
+    assert np.isnan(empty.quote([1000.0], reverse=True).offer[0, 0])
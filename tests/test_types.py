@@ -0,0 +1,56 @@
+import sys
+from decimal import Decimal
+
+from stonfi.offline import FakeStonfi
+from stonfi.types import Asset, OperationStat, Pool, decoder
+from stonfi.types._numeric import Parsed, to_human
+
+
+decode_pool = decoder(Pool)
+decode_asset = decoder(Asset)
+API = FakeStonfi(pools=1, assets=1)
+
+
+def asset(**fields):
+    return decode_asset({**API.assets[0], **fields})
+
+
+def test_pool_accessors_parse_exactly():
+    big = "1" + "0" * 40
+    pool = decode_pool({**API.pools[0], "reserve0": big, "lp_fee": "20", "apy_1d": "0.1", "lp_balance": None})
+    assert pool.reserve0_units == 10**40
+    assert pool.lp_fee_bps == 20
+    assert pool.apy_1d_decimal == Decimal("0.1")
+    assert pool.lp_balance_units is None
+    assert isinstance(Pool.reserve0_units, Parsed)
+
+
+def test_accessors_follow_the_fields_and_add_no_state():
+    pool = decode_pool(API.pools[0])
+    size = sys.getsizeof(pool)
+    assert pool.reserve1_units == int(pool.reserve1)
+    assert sys.getsizeof(pool) == size
+    assert not hasattr(pool, "__dict__")
+    assert "reserve1_units" not in pool.to_dict()
+    assert pool == decode_pool(API.pools[0])
+
+
+def test_operation_deltas_keep_their_sign():
+    fields = {field: None for field in OperationStat.__dataclass_fields__}
+    operation = OperationStat(**{**fields, "asset0_delta": "-123456789012345678901234567890"})
+    assert operation.asset0_delta_units == -123456789012345678901234567890
+    assert operation.asset1_delta_units is None
+
+
+def test_to_human_is_exact():
+    assert to_human(1, 9) == Decimal("0.000000001")
+    assert to_human("123456789012345678901234567890", 18) == Decimal("123456789012.345678901234567890")
+    assert to_human(-1500, 3) == Decimal("-1.5")
+    assert to_human(7, 0) == 7
+    assert asset(decimals=6).to_human("2500000") == Decimal("2.5")
+
+
+def test_usd_value_uses_the_dex_price():
+    assert asset(decimals=9, dex_price_usd="5.2").usd_value(3 * 10**9) == Decimal("15.6")
+    assert asset(decimals=2, dex_price_usd="0.1").usd_value("1") == Decimal("0.001")
+    assert asset(dex_price_usd=None).usd_value(10**9) is None
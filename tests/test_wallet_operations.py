@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from stonfi import APIClient, parse_time
+from stonfi.get_wallet_operations_db import create_database, get_checkpoint, ingest_wallet_operations
+from stonfi.offline import FakeStonfi
+
+
+def windows(since, until, **kwargs):
+    async def main():
+        fake = FakeStonfi(pools=20, assets=10, operations_per_day=24)
+        async with APIClient(transport=fake.transport(), base_url="http://fake", **kwargs) as client:
+            return [
+                (window_since, window_until, len(operations))
+                async for window_since, window_until, operations in client.iter_wallet_operation_windows(
+                    "EQwallet", since, until, window=timedelta(hours=6)
+                )
+            ]
+
+    return sorted(asyncio.run(main()))
+
+
+def test_parse_time_normalizes_to_naive_utc():
+    assert parse_time("2024-01-01T03:00:00+03:00") == datetime(2024, 1, 1)
+    assert parse_time("2024-01-01T00:00:00Z") == datetime(2024, 1, 1)
+    assert parse_time(datetime(2024, 1, 1, tzinfo=timezone.utc)) == datetime(2024, 1, 1)
+    assert parse_time("2024-01-01") == datetime(2024, 1, 1)
+
+
+def test_parse_time_rejects_garbage():
+    with pytest.raises(ValueError, match="invalid time"):
+        parse_time("yesterday")
+    with pytest.raises(ValueError, match="invalid time"):
+        parse_time(1704067200)
+
+
+def test_mixed_naive_and_aware_bounds():
+    result = windows("2024-01-01", "2024-01-02T00:00:00+00:00")
+    assert [bounds[:2] for bounds in result] == [
+        ("2024-01-01T00:00:00", "2024-01-01T06:00:00"),
+        ("2024-01-01T06:00:00", "2024-01-01T12:00:00"),
+        ("2024-01-01T12:00:00", "2024-01-01T18:00:00"),
+        ("2024-01-01T18:00:00", "2024-01-02T00:00:00"),
+    ]
+    assert windows("2024-01-01T02:00:00+02:00", datetime(2024, 1, 2)) == result
+
+
+def test_truncated_windows_are_split():
+    result = windows("2024-01-01", "2024-01-02", max_window_operations=4)
+    assert all(count < 4 for _, _, count in result)
+    assert result[0][0] == "2024-01-01T00:00:00" and result[-1][1] == "2024-01-02T00:00:00"
+    assert all(a[1] == b[0] for a, b in zip(result, result[1:]))
+
+
+def ingest(engine, since, until, **kwargs):
+    async def main():
+        fake = FakeStonfi(pools=20, assets=10, operations_per_day=24)
+        async with APIClient(transport=fake.transport(), base_url="http://fake") as client:
+            return await ingest_wallet_operations(client, engine, "EQwallet", since, until, **kwargs)
+
+    return asyncio.run(main())
+
+
+def test_ingest_resumes_from_the_checkpoint(tmp_path):
+    engine = create_database(f"sqlite:///{tmp_path / 'operations.db'}")
+    first = ingest(engine, "2024-01-01T00:00:00Z", "2024-01-03T00:00:00+00:00", batch_size=10)
+    assert (first.fetched, first.inserted, first.checkpoint) == (48, 48, "2024-01-03T00:00:00")
+    assert get_checkpoint(engine, "EQwallet") == datetime(2024, 1, 3)
+
+    # The second run starts at the checkpoint (less the overlap), not at `since`.
+    second = ingest(engine, "2024-01-01T00:00:00Z", datetime(2024, 1, 4, 2, tzinfo=timezone(timedelta(hours=2))))
+    assert (second.fetched, second.inserted) == (24, 24)
+    assert second.checkpoint == "2024-01-04T00:00:00"
+
+    # A range that ends before the checkpoint does not move it back.
+    third = ingest(engine, "2024-01-01", "2024-01-02")
+    assert third.inserted == 0
+    assert third.checkpoint == "2024-01-04T00:00:00"
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT COUNT(*) FROM operations").scalar() == 72